@@ -1,3 +1,4 @@
+import atexit
 import redis, os
 from flask import Flask, render_template, request, jsonify, redirect, url_for, session
 
@@ -5,8 +6,15 @@ from flask_session import Session
 from collections import deque
 from dotenv import load_dotenv
 
+from chess_insights.engine.bitbases import Bitbases
 from chess_insights.engine.engine import Engine
+from chess_insights.engine.lazy_smp import LazySMP
+from chess_insights.engine.move_ordering import MoveOrdering
+from chess_insights.engine.opening_book import OpeningBook
+from chess_insights.engine.transposition_table import TranspositionTable
 from chess_insights.game.chess_board import ChessBoard
+from chess_insights.game.position import Position
+from chess_insights.util.enum_engine_level import EngineLevel
 from chess_insights.util.enum_game_status import GameStatus
 from chess_insights.util.enum_square import Square
 from chess_insights.util.fen import fen_from_board, board_from_fen
@@ -32,31 +40,63 @@ app.config["SESSION_REDIS"] = redis.Redis(
 Session(app)
 app.session_interface.serializer = FlaskSessionJSONSerializer()
 
+# Engine configuration. The search deadline leaves headroom for request handling inside a
+# 200 ms /engine_move latency target; the transposition table and the move ordering history
+# are shared across requests.
+# With ENGINE_WORKERS above 1 each search runs on that many processes sharing the table.
+# ENGINE_BOOK names an opening book file built with the opening-book command, ENGINE_BITBASES
+# a directory of endgame tables built with the bitbases command.
+ENGINE_LEVEL = EngineLevel(os.getenv("ENGINE_LEVEL", EngineLevel.SEARCH.value))
+ENGINE_MOVE_TIME_MS = float(os.getenv("ENGINE_MOVE_TIME_MS", 150))
+ENGINE_HASH_MB = float(os.getenv("ENGINE_HASH_MB", 16))
+ENGINE_WORKERS = int(os.getenv("ENGINE_WORKERS", 1))
+bitbases = Bitbases(os.getenv("ENGINE_BITBASES")) if os.getenv("ENGINE_BITBASES") else None
+lazy_smp = None
+transposition_table = None
+if ENGINE_WORKERS > 1:
+    lazy_smp = LazySMP(ENGINE_WORKERS, size_mb=ENGINE_HASH_MB, bitbases=bitbases)
+    atexit.register(lazy_smp.close)
+else:
+    transposition_table = TranspositionTable(size_mb=ENGINE_HASH_MB)
+move_ordering = MoveOrdering()
+opening_book = OpeningBook(os.getenv("ENGINE_BOOK")) if os.getenv("ENGINE_BOOK") else None
+
 
 def get_game():
     fen = session.get("fen")
     pgn = session.get("pgn", "")
     board = board_from_fen(fen) if fen else ChessBoard().board_state
-    return ChessBoard(board_state=board, pgn=pgn)
+    return ChessBoard(board_state=board, pgn=pgn, hash_history=session.get("hash_history"))
+
+
+def get_engine(chess_game):
+    return Engine(board_state=chess_game.board_state, level=ENGINE_LEVEL,
+                  move_time_ms=ENGINE_MOVE_TIME_MS, transposition_table=transposition_table,
+                  hash_history=chess_game.position.hash_history, lazy_smp=lazy_smp,
+                  opening_book=opening_book, bitbases=bitbases, move_ordering=move_ordering)
 
 
 def set_game(chess_game):
     session["fen"] = fen_from_board(chess_game.board_state)
     session["pgn"] = chess_game.pgn
+    # Only the keys since the last capture or pawn move, the ones that can still repeat
+    session["hash_history"] = chess_game.position.hash_history
 
 
 def execute_move(from_square,
-                 to_square
+                 to_square,
+                 promotion=None
                  ):
     """Helper function to execute a move and return the response JSON."""
     chess_game = get_game()
 
     try:
-        chess_game.move_piece(from_square, to_square)
+        chess_game.move_piece(from_square, to_square, promotion)
         fen = fen_from_board(chess_game.board_state)
 
         # Check game status after the move
-        game_status = chess_game.check_game_status(chess_game.board_state)
+        game_status = chess_game.check_game_status(chess_game.board_state,
+                                                   chess_game.position.hash_history)
         set_game(chess_game)
         history = session.get("history", [])
         history.append((fen_from_board(chess_game.board_state), chess_game.pgn))
@@ -109,9 +149,9 @@ def start_game():
 
     chess_game = ChessBoard()
     if side == 'black':
-        engine = Engine(board_state=chess_game.board_state)
-        from_square, to_square = engine.generate_move()
-        chess_game.move_piece(from_square, to_square)
+        engine = get_engine(chess_game)
+        from_square, to_square, promotion = engine.generate_move()
+        chess_game.move_piece(from_square, to_square, promotion)
 
     set_game(chess_game)
     session["history"] = [(fen_from_board(chess_game.board_state), "")]
@@ -156,7 +196,8 @@ def move():
 def end_game():
     """Display appropriate end-game message and reset the game."""
     chess_game = get_game()
-    game_status = chess_game.check_game_status(chess_game.board_state)
+    game_status = chess_game.check_game_status(chess_game.board_state,
+                                               chess_game.position.hash_history)
 
     if game_status == GameStatus.ONGOING:
         return jsonify({'message': 'Game is still ongoing.',
@@ -173,11 +214,11 @@ def engine_move():
     """Get engine move and execute it."""
     chess_game = get_game()
     try:
-        engine = Engine(board_state=chess_game.board_state)
+        engine = get_engine(chess_game)
         # Get the engine's move
-        from_square, to_square = engine.generate_move()
+        from_square, to_square, promotion = engine.generate_move()
         # Execute the move
-        response = execute_move(from_square, to_square)
+        response = execute_move(from_square, to_square, promotion)
         return jsonify(response)
 
     except Exception as e:
@@ -210,9 +251,19 @@ def undo():
     history = session.get("history", [])
     if len(history) <= 1:
         return jsonify({"error": "No moves to undo"}), 400
+    undone_reversible_plies = get_game().board_state.fifty_move_rule
     history = history[:-2]
     fen, pgn = history[-1]
-    chess_game = ChessBoard(fen)
+    hash_history = session.get("hash_history", [])
+    if undone_reversible_plies >= 2:
+        # Neither undone move was a capture or pawn move, so the window just loses their keys
+        hash_history = hash_history[:-2]
+    else:
+        # One of them started a new window; rebuild the restored position's from the FENs
+        fifty_move_rule = board_from_fen(fen).fifty_move_rule
+        hash_history = [Position.from_fen(earlier_fen).hash
+                        for earlier_fen, _ in history[-1 - fifty_move_rule:-1]]
+    chess_game = ChessBoard(fen, hash_history=hash_history)
     chess_game.pgn = pgn
     session["history"] = history
 
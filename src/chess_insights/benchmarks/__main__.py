@@ -0,0 +1,5 @@
+import sys
+
+from chess_insights.benchmarks.runner import main
+
+sys.exit(main())
@@ -0,0 +1,63 @@
+from typing import Callable
+
+from chess_insights.engine.bitboard import generate_mask, rotate_180, squares
+from chess_insights.engine.legal_moves import generate_legal_codes
+from chess_insights.engine.move_generators import generate_attacks, generate_attacks_by_color, \
+    generate_king_attacks, generate_knight_attacks, generate_pawn_attacks, get_sliding_attacks
+from chess_insights.game.board_state import BoardState
+from chess_insights.game.chess_board import ChessBoard
+from chess_insights.game.position import Position
+from chess_insights.game.position_cache import POSITION_CACHE
+from chess_insights.util.enum_chess_piece_type import Color, ColorChessPiece
+from chess_insights.util.enum_game_status import GameStatus
+from chess_insights.util.enum_ray_direction import Direction
+from chess_insights.util.enum_square import Square
+from chess_insights.util.fen import board_from_fen, fen_from_board
+
+# A busy middlegame, so every primitive has real work to do
+KIWIPETE_FEN = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+def check_game_status_uncached(board_state: BoardState) -> GameStatus:
+    """ChessBoard.check_game_status without the position cache: every call works the status
+    out again instead of timing a cache hit."""
+    POSITION_CACHE.clear()
+    return ChessBoard.check_game_status(board_state)
+
+
+def build_cases(fen: str = KIWIPETE_FEN) -> dict[str, Callable[[], object]]:
+    """
+    Zero-argument callables for the primitives hit on every request, keyed by benchmark name.
+    Boards and arguments are built here once so only the call itself is timed.
+    """
+    board_state = board_from_fen(fen)
+    boards = board_state.piece_locations
+    all_pieces = boards[ColorChessPiece.ALL_PIECES]
+    position = Position.from_board_state(board_state)
+    POSITION_CACHE.lookup(position)
+
+    return {
+        "bitboard.serialize_board": all_pieces.serialize_board,
+        "bitboard.mirror": all_pieces.mirror,
+        "bitboard.squares": lambda: squares(all_pieces.board),
+        "bitboard.rotate_180": lambda: rotate_180(all_pieces.board),
+        "bitboard.generate_mask[file]": lambda: generate_mask(Square.d4.value, Direction.N),
+        "bitboard.generate_mask[diagonal]": lambda: generate_mask(Square.d4.value, Direction.NE),
+        "move_generators.generate_pawn_attacks":
+            lambda: generate_pawn_attacks(boards[ColorChessPiece.WHITE_PAWN]),
+        "move_generators.generate_knight_attacks":
+            lambda: generate_knight_attacks(boards[ColorChessPiece.WHITE_KNIGHT]),
+        "move_generators.generate_king_attacks":
+            lambda: generate_king_attacks(boards[ColorChessPiece.WHITE_KING]),
+        "move_generators.get_sliding_attacks":
+            lambda: get_sliding_attacks(all_pieces, boards[ColorChessPiece.WHITE_BISHOP]),
+        "move_generators.generate_attacks":
+            lambda: generate_attacks(boards[ColorChessPiece.WHITE_QUEEN], all_pieces),
+        "move_generators.generate_attacks_by_color":
+            lambda: generate_attacks_by_color(board_state, Color.WHITE),
+        "legal_moves.generate_legal_codes": lambda: generate_legal_codes(position),
+        "chess_board.check_game_status": lambda: check_game_status_uncached(board_state),
+        "position_cache.lookup[hit]": lambda: POSITION_CACHE.lookup(position),
+        "fen.board_from_fen": lambda: board_from_fen(fen),
+        "fen.fen_from_board": lambda: fen_from_board(board_state),
+    }
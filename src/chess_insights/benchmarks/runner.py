@@ -0,0 +1,80 @@
+"""
+Micro-benchmarks for the board primitives every request goes through. Run with `benchmark`
+(or `python -m chess_insights.benchmarks`); `--save baseline.json` records the medians and a later
+`--compare baseline.json` flags any benchmark more than `--threshold` slower, exiting with 1.
+"""
+import argparse
+import json
+import sys
+
+from chess_insights.benchmarks.cases import build_cases
+from chess_insights.benchmarks.timing import BenchmarkResult, Comparison, compare, \
+    load_baseline, measure, save_baseline
+
+
+def run_benchmarks(patterns: list[str] = None,
+                   rounds: int = 15,
+                   min_round_ms: float = 20.0
+                   ) -> list[BenchmarkResult]:
+    """Run the benchmarks whose name contains any of patterns (all without patterns)."""
+    cases = build_cases()
+    names = [name for name in cases
+             if not patterns or any(pattern in name for pattern in patterns)]
+    if not names:
+        raise ValueError(f"No benchmark matches {', '.join(patterns)}. "
+                         f"Choose from {', '.join(cases)}.")
+    return [measure(name, cases[name], rounds, min_round_ms) for name in names]
+
+
+def format_result(result: BenchmarkResult, comparison: Comparison | None = None) -> str:
+    line = (f"{result.name:<44} {result.median_ns / 1000:>10.2f} us "
+            f"± {result.iqr_ns / 1000:>8.2f} {result.ops_per_second:>12,.0f} ops/s")
+    if comparison is not None:
+        line += f" {comparison.change:>+8.1%}"
+        if comparison.regressed:
+            line += " SLOWER"
+    return line
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the board primitives.")
+    parser.add_argument("--filter", action="append", dest="patterns",
+                        help="only run benchmarks whose name contains this; repeat for several")
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--min-round-ms", type=float, default=20.0,
+                        help="calls per round are raised until a round takes this long")
+    parser.add_argument("--save", dest="save_path", help="write the results as a baseline file")
+    parser.add_argument("--compare", dest="baseline_path", help="compare with this baseline file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown of the median that counts as a regression")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+    if args.rounds < 2:
+        parser.error("--rounds must be at least 2")
+
+    try:
+        results = run_benchmarks(args.patterns, args.rounds, args.min_round_ms)
+    except ValueError as error:
+        parser.error(str(error))
+    comparisons = {}
+    if args.baseline_path:
+        baseline = load_baseline(args.baseline_path)
+        comparisons = {comparison.name: comparison
+                       for comparison in compare(results, baseline, args.threshold)}
+
+    if args.json:
+        json.dump({"results": [result._asdict() for result in results],
+                   "comparisons": [comparison._asdict() for comparison in comparisons.values()]},
+                  sys.stdout, indent=2)
+        print()
+    else:
+        for result in results:
+            print(format_result(result, comparisons.get(result.name)))
+    if args.save_path:
+        save_baseline(results, args.save_path)
+
+    return 1 if any(comparison.regressed for comparison in comparisons.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import gc
+import json
+import platform
+import statistics
+import time
+from typing import Callable, NamedTuple
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    median_ns: float  # per call
+    iqr_ns: float  # spread of the per-call time between rounds
+    ops_per_second: float
+    rounds: int
+    calls_per_round: int
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline_ns: float
+    current_ns: float
+    change: float  # relative to the baseline, 0.25 is 25% slower
+    regressed: bool
+
+
+def calibrate(func: Callable[[], object], min_round_ns: int) -> int:
+    """Number of calls per round so that one round takes at least min_round_ns."""
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        if time.perf_counter_ns() - start >= min_round_ns or number >= 1 << 24:
+            return number
+        number *= 2
+
+
+def measure(name: str,
+            func: Callable[[], object],
+            rounds: int = 15,
+            min_round_ms: float = 20.0
+            ) -> BenchmarkResult:
+    """
+    Time func over several rounds of many calls each and summarize the per-call time by its
+    median and interquartile range, which unlike mean and standard deviation are not thrown off
+    by the odd round hit by a context switch. The garbage collector is paused while timing.
+    """
+    if rounds < 2:
+        raise ValueError("At least two rounds are needed to measure spread.")
+    number = calibrate(func, int(min_round_ms * 1_000_000))
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter_ns() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    lower, median, upper = statistics.quantiles(timings, n=4)
+    return BenchmarkResult(name, median, upper - lower,
+                           1e9 / median if median else float("inf"), rounds, number)
+
+
+def compare(results: list[BenchmarkResult],
+            baseline: dict[str, dict],
+            threshold: float = 0.10
+            ) -> list[Comparison]:
+    """Compare medians with a saved baseline; benchmarks missing from it are skipped."""
+    comparisons = []
+    for result in results:
+        if result.name not in baseline:
+            continue
+        baseline_ns = baseline[result.name]["median_ns"]
+        change = result.median_ns / baseline_ns - 1 if baseline_ns else 0.0
+        comparisons.append(Comparison(result.name, baseline_ns, result.median_ns, change,
+                                      change > threshold))
+    return comparisons
+
+
+def save_baseline(results: list[BenchmarkResult], path: str) -> None:
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": {result.name: result._asdict() for result in results},
+    }
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def load_baseline(path: str) -> dict[str, dict]:
+    with open(path) as file:
+        report = json.load(file)
+    if "benchmarks" not in report:
+        raise ValueError(f"{path} is not a benchmark baseline.")
+    return report["benchmarks"]
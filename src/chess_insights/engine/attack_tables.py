@@ -0,0 +1,93 @@
+from chess_insights.engine.bitboard import FULL_BOARD
+from chess_insights.util.enum_chess_piece_type import Color
+from chess_insights.util.enum_file_and_rank import File, Rank
+
+# Plain int masks so the set-wise generators never touch the File/Rank enums at runtime
+NOT_A_FILE = FULL_BOARD ^ File.A
+NOT_H_FILE = FULL_BOARD ^ File.H
+NOT_AB_FILE = FULL_BOARD ^ (File.A | File.B)
+NOT_GH_FILE = FULL_BOARD ^ (File.G | File.H)
+NOT_RANK_1 = FULL_BOARD ^ Rank.One
+NOT_RANK_8 = FULL_BOARD ^ Rank.Eight
+NOT_RANK_12 = FULL_BOARD ^ (Rank.One | Rank.Two)
+NOT_RANK_78 = FULL_BOARD ^ (Rank.Seven | Rank.Eight)
+
+
+def knight_attacks_set(knights: int) -> int:
+    """Return the union of squares attacked by every knight on the knights bitboard."""
+    return (((knights & NOT_RANK_78 & NOT_H_FILE) << 17) |
+            ((knights & NOT_RANK_8 & NOT_GH_FILE) << 10) |
+            ((knights & NOT_RANK_78 & NOT_A_FILE) << 15) |
+            ((knights & NOT_RANK_8 & NOT_AB_FILE) << 6) |
+            ((knights & NOT_RANK_12 & NOT_H_FILE) >> 15) |
+            ((knights & NOT_RANK_1 & NOT_GH_FILE) >> 6) |
+            ((knights & NOT_RANK_12 & NOT_A_FILE) >> 17) |
+            ((knights & NOT_RANK_1 & NOT_AB_FILE) >> 10))
+
+
+def king_attacks_set(kings: int) -> int:
+    """Return the union of squares attacked by every king on the kings bitboard."""
+    east = (kings & NOT_H_FILE) << 1
+    west = (kings & NOT_A_FILE) >> 1
+    row = kings | east | west
+    return (east | west | ((row & NOT_RANK_8) << 8) | ((row & NOT_RANK_1) >> 8)) & FULL_BOARD
+
+
+def pawn_attacks_set(pawns: int, color: Color) -> int:
+    """Return the union of squares attacked by every pawn of color on the pawns bitboard."""
+    if color == Color.WHITE:
+        return (((pawns & NOT_H_FILE) << 9) | ((pawns & NOT_A_FILE) << 7)) & FULL_BOARD
+    elif color == Color.BLACK:
+        return ((pawns & NOT_H_FILE) >> 7) | ((pawns & NOT_A_FILE) >> 9)
+    raise ValueError(f"No pawn attacks for color {color}")
+
+
+def bishop_attacks_set(bishops: int, occupancy: int) -> int:
+    """
+    Return the union of squares attacked diagonally by every piece on the bishops bitboard,
+    with rays stopped by occupancy. Kogge-Stone occluded fills handle the whole set at once, in
+    a fixed number of operations however many sliders there are.
+    """
+    empty = ~occupancy & FULL_BOARD
+    return (((_fill_up(bishops, empty & NOT_A_FILE, 9) << 9) & NOT_A_FILE) |
+            ((_fill_up(bishops, empty & NOT_H_FILE, 7) << 7) & NOT_H_FILE) |
+            ((_fill_down(bishops, empty & NOT_A_FILE, 7) >> 7) & NOT_A_FILE) |
+            ((_fill_down(bishops, empty & NOT_H_FILE, 9) >> 9) & NOT_H_FILE))
+
+
+def rook_attacks_set(rooks: int, occupancy: int) -> int:
+    """Return the union of squares attacked along ranks and files by every piece on the rooks
+    bitboard, with rays stopped by occupancy; see bishop_attacks_set."""
+    empty = ~occupancy & FULL_BOARD
+    return (((_fill_up(rooks, empty, 8) << 8) & FULL_BOARD) |
+            (_fill_down(rooks, empty, 8) >> 8) |
+            ((_fill_up(rooks, empty & NOT_A_FILE, 1) << 1) & NOT_A_FILE) |
+            ((_fill_down(rooks, empty & NOT_H_FILE, 1) >> 1) & NOT_H_FILE))
+
+
+def _fill_up(pieces: int, empty: int, shift: int) -> int:
+    """pieces plus every square reached by sliding towards higher squares by shift through
+    empty, in three doubling steps. empty must exclude the file a step would wrap onto."""
+    pieces |= empty & (pieces << shift)
+    empty &= empty << shift
+    pieces |= empty & (pieces << 2 * shift)
+    empty &= empty << 2 * shift
+    return pieces | (empty & (pieces << 4 * shift))
+
+
+def _fill_down(pieces: int, empty: int, shift: int) -> int:
+    """_fill_up towards lower squares."""
+    pieces |= empty & (pieces >> shift)
+    empty &= empty >> shift
+    pieces |= empty & (pieces >> 2 * shift)
+    empty &= empty >> 2 * shift
+    return pieces | (empty & (pieces >> 4 * shift))
+
+
+# One entry per square, built once at import so a single piece's attacks are a single index
+KNIGHT_ATTACKS: tuple[int, ...] = tuple(knight_attacks_set(1 << square) for square in range(64))
+KING_ATTACKS: tuple[int, ...] = tuple(king_attacks_set(1 << square) for square in range(64))
+PAWN_ATTACKS: dict[Color, tuple[int, ...]] = {
+    color: tuple(pawn_attacks_set(1 << square, color) for square in range(64))
+    for color in (Color.WHITE, Color.BLACK)
+}
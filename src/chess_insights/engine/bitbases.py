@@ -0,0 +1,543 @@
+"""
+Win/draw/loss bitbases for endings with few pieces, built by retrograde analysis: checkmates and
+positions with a winning capture or promotion are resolved first, then results are propagated
+backwards through un-moves until nothing changes; whatever is left is a draw. Generate a set
+with `bitbases KQK KRK KPK -d bitbases/` (or `python -m chess_insights.engine.bitbases`).
+
+A table is named by its material, stronger side first (KPK, KRKP) and stores two bits per
+position, side to move included, in a file that is memory-mapped when probed. Positions with the
+colors reversed are probed through the same table by mirroring the board vertically, which
+halves the number of tables. Tables ignore castling and en passant, and the probe declines
+positions where either matters. Three-piece tables take a few seconds each; the generator handles four
+pieces as well, at roughly a hundred times the cost.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from enum import IntEnum
+from itertools import product
+from typing import Callable, Iterator
+
+from chess_insights.engine.attack_tables import KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS
+from chess_insights.engine.bitboard import flip_vertical
+from chess_insights.engine.magic_bitboards import bishop_attacks, queen_attacks, rook_attacks
+from chess_insights.game.position import PIECES_BY_COLOR, Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType, Color, ColorChessPiece
+
+MAGIC = b"CIBB"
+VERSION = 1
+HEADER = struct.Struct("<4sBB10s")  # magic, version, piece count, signature
+FILE_SUFFIX = ".bb"
+
+# Piece letters in table order, strongest first
+LETTERS = "KQRBNP"
+LETTER_TYPES = {"K": ChessPieceType.KING, "Q": ChessPieceType.QUEEN, "R": ChessPieceType.ROOK,
+                "B": ChessPieceType.BISHOP, "N": ChessPieceType.KNIGHT, "P": ChessPieceType.PAWN}
+TYPE_LETTERS = {piece_type: letter for letter, piece_type in LETTER_TYPES.items()}
+_MATERIAL_ORDER = {letter: rank for rank, letter in enumerate(reversed(LETTERS))}
+_PROMOTION_LETTERS = "QRBN"
+
+_KING, _QUEEN, _ROOK, _BISHOP, _KNIGHT, _PAWN = range(6)
+_PAWN_SQUARES = 0x00FFFFFFFFFFFF00
+
+
+class Outcome(IntEnum):
+    """Result with best play, for the side to move."""
+    DRAW = 0
+    WIN = 1
+    LOSS = 2
+
+
+def parse_signature(signature: str) -> tuple[str, str]:
+    """Split a signature such as KRKP into the white and black letters, KR and KP."""
+    second_king = signature.find("K", 1)
+    white, black = signature[:second_king], signature[second_king:]
+    if (not signature.startswith("K") or second_king < 0 or
+            any(letter not in LETTERS[1:] for letter in white[1:] + black[1:])):
+        raise ValueError(f"{signature} is not a material signature like KQK or KRKP.")
+    return white, black
+
+
+def canonical_signature(white: str, black: str) -> tuple[str, bool]:
+    """The table name for this material, and whether the colors have to be swapped for it."""
+    white, black = _sorted_letters(white), _sorted_letters(black)
+    if _material_key(black) > _material_key(white):
+        return black + white, True
+    return white + black, False
+
+
+def is_trivial_draw(white: str, black: str) -> bool:
+    """Bare kings, or a single minor piece against a bare king: no table needed."""
+    extras = white[1:] + black[1:]
+    return extras in ("", "B", "N")
+
+
+class Bitbase:
+    """One table: two bits per position, starting offset bytes into data."""
+
+    def __init__(self, signature: str, data, offset: int = 0):
+        self.signature = signature
+        white, black = parse_signature(signature)
+        self.pieces = _pieces_for(white, black)
+        self.size = 2 * 64 ** len(self.pieces)
+        self.data = data
+        self.offset = offset
+
+    def __len__(self) -> int:
+        return self.size
+
+    def outcome(self, index: int) -> Outcome:
+        return Outcome((self.data[self.offset + (index >> 2)] >> ((index & 3) << 1)) & 3)
+
+    def index(self, piece_boards: dict[ColorChessPiece, int], is_whites_turn: bool) -> int:
+        """Index of a position with this table's material and orientation."""
+        index = 0 if is_whites_turn else 1
+        seen = {}
+        for piece in self.pieces:
+            board = piece_boards[piece]
+            # Several pieces of one kind take their squares in ascending order
+            for _ in range(seen.get(piece, 0)):
+                board &= board - 1
+            seen[piece] = seen.get(piece, 0) + 1
+            index = index * 64 + (board & -board).bit_length() - 1
+        return index
+
+
+class Bitbases:
+    """
+    The tables in a directory, opened on first use. probe answers positions whose material has
+    a table (either color may be the stronger side) and None otherwise.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._tables: dict[str, Bitbase | None] = {}
+        self.available = set()
+        if os.path.isdir(directory):
+            self.available = {name[:-len(FILE_SUFFIX)] for name in os.listdir(directory)
+                              if name.endswith(FILE_SUFFIX)}
+        self.max_pieces = max((len(signature) for signature in self.available), default=0)
+
+    def __enter__(self) -> "Bitbases":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for table in self._tables.values():
+            if table is not None and isinstance(table.data, mmap.mmap):
+                table.data.close()
+        self._tables.clear()
+
+    def table(self, signature: str) -> Bitbase | None:
+        if signature not in self._tables:
+            self._tables[signature] = (self._open(signature) if signature in self.available
+                                       else None)
+        return self._tables[signature]
+
+    def probe(self, position: Position) -> Outcome | None:
+        if position.castling_rights or self._can_capture_en_passant(position):
+            return None
+        if position.piece_boards[ColorChessPiece.ALL_PIECES].bit_count() > self.max_pieces:
+            return None
+        return self.probe_boards(position.piece_boards, position.is_whites_turn)
+
+    def probe_boards(self,
+                     piece_boards: dict[ColorChessPiece, int],
+                     is_whites_turn: bool
+                     ) -> Outcome | None:
+        white, black = (_letters(piece_boards, Color.WHITE), _letters(piece_boards, Color.BLACK))
+        if is_trivial_draw(white, black):
+            return Outcome.DRAW
+        signature, swapped = canonical_signature(white, black)
+        table = self.table(signature)
+        if table is None:
+            return None
+        if swapped:
+            piece_boards = swap_colors(piece_boards)
+            is_whites_turn = not is_whites_turn
+        return table.outcome(table.index(piece_boards, is_whites_turn))
+
+    def generate(self, signature: str) -> Bitbase:
+        """Build, save and open the table for signature, after any it depends on that is
+        missing: captures and promotions lead into smaller or different material."""
+        white, black = parse_signature(signature)
+        signature, _ = canonical_signature(white, black)
+        if signature in self.available:
+            return self.table(signature)
+        for dependency in _dependencies(signature):
+            if dependency not in self.available:
+                self.generate(dependency)
+
+        data = generate_bitbase(signature, self.probe_boards)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(signature), "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, len(signature), signature.encode()))
+            file.write(data)
+        self.available.add(signature)
+        self.max_pieces = max(self.max_pieces, len(signature))
+        self._tables.pop(signature, None)
+        return self.table(signature)
+
+    def _path(self, signature: str) -> str:
+        return os.path.join(self.directory, signature + FILE_SUFFIX)
+
+    def _open(self, signature: str) -> Bitbase:
+        with open(self._path(signature), "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        table = Bitbase(signature, data, HEADER.size)
+        magic, version, piece_count, name = HEADER.unpack_from(data)
+        if ((magic, version, piece_count, name.rstrip(b"\0").decode()) !=
+                (MAGIC, VERSION, len(signature), signature) or
+                len(data) != HEADER.size + table.size // 4):
+            data.close()
+            raise ValueError(f"{self._path(signature)} is not a {signature} bitbase.")
+        return table
+
+    @staticmethod
+    def _can_capture_en_passant(position: Position) -> bool:
+        if not position.en_passant_square:
+            return False
+        color = position.color_to_move
+        square = position.en_passant_square.bit_length() - 1
+        return bool(PAWN_ATTACKS[color.opposite()][square] &
+                    position.piece_boards[PIECES_BY_COLOR[color][ChessPieceType.PAWN]])
+
+
+def swap_colors(piece_boards: dict[ColorChessPiece, int]) -> dict[ColorChessPiece, int]:
+    """The same position with the colors exchanged and the board mirrored vertically."""
+    swapped = {}
+    for piece, board in piece_boards.items():
+        mirrored = flip_vertical(board)
+        if piece.piece_type == ChessPieceType.ANY:
+            partner = piece if piece.color == Color.ANY else piece.color.opposite().get_piece_group()
+        else:
+            partner = PIECES_BY_COLOR[piece.color.opposite()][piece.piece_type]
+        swapped[partner] = mirrored
+    return swapped
+
+
+def generate_bitbase(signature: str,
+                     probe: Callable[[dict[ColorChessPiece, int], bool], Outcome | None]
+                     ) -> bytearray:
+    """
+    Retrograde analysis of one table; probe must answer every position reached by a capture or
+    promotion. Returns the packed table, two bits per index.
+    """
+    white, black = parse_signature(signature)
+    table = _TableShape(_pieces_for(white, black))
+    size = 2 * table.side_weight
+
+    legal = bytearray(size)
+    values = bytearray(size)  # 0 while unresolved, else an Outcome
+    moves_left = array('B', bytes(size))  # moves not yet known to lose, per position
+    queue = []
+
+    index = -1
+    for side in (0, 1):
+        for squares in product(range(64), repeat=table.count):
+            index += 1
+            occupancy = 0
+            for square in squares:
+                occupancy |= 1 << square
+            if occupancy.bit_count() != table.count or not table.is_legal(side, squares,
+                                                                           occupancy):
+                continue
+            legal[index] = 1
+
+            quiet_moves, exits, in_check = table.moves(side, squares, occupancy)
+            moves_left[index] = quiet_moves
+            for captured, promotion, moved in exits:
+                outcome = probe(table.boards(moved, captured, promotion), side == 1)
+                if outcome == Outcome.LOSS:
+                    values[index] = Outcome.WIN
+                    break
+                if outcome != Outcome.WIN:
+                    moves_left[index] += 1  # a draw, or an unknown result treated as one
+            if values[index]:
+                queue.append(index)
+            elif not moves_left[index] and (exits or in_check):
+                # Checkmated, or every move loses; without moves and check it is stalemate
+                values[index] = Outcome.LOSS
+                queue.append(index)
+
+    # Walk back from every resolved position: a loss for the side to move makes each
+    # predecessor a win, and a predecessor all of whose moves reach wins is a loss.
+    while queue:
+        index = queue.pop()
+        is_loss = values[index] == Outcome.LOSS
+        for predecessor in table.unmoves(index):
+            if not legal[predecessor] or values[predecessor]:
+                continue
+            if is_loss:
+                values[predecessor] = Outcome.WIN
+                queue.append(predecessor)
+            else:
+                moves_left[predecessor] -= 1
+                if not moves_left[predecessor]:
+                    values[predecessor] = Outcome.LOSS
+                    queue.append(predecessor)
+
+    data = bytearray(size // 4)
+    for index, value in enumerate(values):
+        if value:
+            data[index >> 2] |= value << ((index & 3) << 1)
+    return data
+
+
+class _TableShape:
+    """Move generation over the raw squares of one table's pieces, slot by slot in index
+    order, built on the attack tables and magic lookups the move generators use."""
+
+    def __init__(self, pieces: tuple[ColorChessPiece, ...]):
+        self.pieces = pieces
+        self.count = len(pieces)
+        self.kinds = tuple(LETTERS.index(TYPE_LETTERS[piece.piece_type]) for piece in pieces)
+        self.colors = tuple(0 if piece.color == Color.WHITE else 1 for piece in pieces)
+        self.slots = tuple(tuple(slot for slot in range(self.count) if self.colors[slot] == side)
+                           for side in (0, 1))
+        self.kings = (self.slots[0][0], self.slots[1][0])
+        self.sliders = tuple(tuple(slot for slot in self.slots[side]
+                                   if self.kinds[slot] in (_QUEEN, _ROOK, _BISHOP))
+                             for side in (0, 1))
+        self.pawns = tuple(slot for slot in range(self.count) if self.kinds[slot] == _PAWN)
+        self.weights = tuple(64 ** (self.count - 1 - slot) for slot in range(self.count))
+        self.side_weight = 64 ** self.count
+
+    def attacks(self, slot: int, square: int, occupancy: int) -> int:
+        kind = self.kinds[slot]
+        if kind == _KING:
+            return KING_ATTACKS[square]
+        if kind == _KNIGHT:
+            return KNIGHT_ATTACKS[square]
+        if kind == _PAWN:
+            return _PAWN_ATTACKS[self.colors[slot]][square]
+        if kind == _BISHOP:
+            return bishop_attacks(square, occupancy)
+        if kind == _ROOK:
+            return rook_attacks(square, occupancy)
+        return queen_attacks(square, occupancy)
+
+    def is_legal(self, side: int, squares: tuple[int, ...], occupancy: int) -> bool:
+        """Pawns off the back ranks, and the side that just moved not left in check."""
+        for slot in self.pawns:
+            if not (1 << squares[slot]) & _PAWN_SQUARES:
+                return False
+        king_bit = 1 << squares[self.kings[1 - side]]
+        return not any(self.attacks(slot, squares[slot], occupancy) & king_bit
+                       for slot in self.slots[side])
+
+    def moves(self,
+              side: int,
+              squares: tuple[int, ...],
+              occupancy: int
+              ) -> tuple[int, list[tuple[int | None, str | None, list[int]]], bool]:
+        """
+        The number of legal quiet moves of side, its captures and promotions as (captured slot,
+        promotion letter, squares after the move), and whether side is in check.
+        """
+        own = enemy = 0
+        for slot in self.slots[side]:
+            own |= 1 << squares[slot]
+        enemy = occupancy ^ own
+        king_slot = self.kings[side]
+        king_square = squares[king_slot]
+        king_bit = 1 << king_square
+        enemy_slots = self.slots[1 - side]
+        enemy_sliders = self.sliders[1 - side]
+
+        # Squares the king may not step to: enemy attacks with sliders seeing through the king
+        danger = 0
+        leaper_checkers = 0
+        for slot in enemy_slots:
+            danger |= self.attacks(slot, squares[slot], occupancy ^ king_bit)
+            if slot not in enemy_sliders and self.attacks(slot, squares[slot],
+                                                          occupancy) & king_bit:
+                leaper_checkers |= 1 << squares[slot]
+        in_check = bool(danger & king_bit)
+
+        exits = []
+        targets = KING_ATTACKS[king_square] & ~own & ~danger
+        quiet_moves = (targets & ~enemy).bit_count()
+        captures = targets & enemy
+        while captures:
+            bit = captures & -captures
+            captures ^= bit
+            exits.append(self._move(squares, king_slot, bit, enemy_slots))
+
+        for slot in self.slots[side]:
+            if slot == king_slot:
+                continue
+            origin = squares[slot]
+            if self.kinds[slot] == _PAWN:
+                step = 8 if side == 0 else -8
+                targets = _PAWN_ATTACKS[side][origin] & enemy
+                if not (1 << (origin + step)) & occupancy:
+                    targets |= 1 << (origin + step)
+                    if ((1 << origin) & _PAWN_START_RANKS[side] and
+                            not (1 << (origin + 2 * step)) & occupancy):
+                        targets |= 1 << (origin + 2 * step)
+            else:
+                targets = self.attacks(slot, origin, occupancy) & ~own
+            if leaper_checkers:
+                targets &= leaper_checkers  # only taking the checker helps
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                moved_occupancy = occupancy ^ (1 << origin) | bit
+                if any(squares[enemy] != bit.bit_length() - 1 and
+                       self.attacks(enemy, squares[enemy], moved_occupancy) & king_bit
+                       for enemy in enemy_sliders):
+                    continue
+                is_promotion = self.kinds[slot] == _PAWN and not bit & _PAWN_SQUARES
+                if bit & enemy or is_promotion:
+                    captured, promotion, moved = self._move(squares, slot, bit, enemy_slots)
+                    if is_promotion:
+                        exits.extend((captured, letter, moved) for letter in _PROMOTION_LETTERS)
+                    else:
+                        exits.append((captured, None, moved))
+                else:
+                    quiet_moves += 1
+        return quiet_moves, exits, in_check
+
+    def unmoves(self, index: int) -> Iterator[int]:
+        """Indices of the positions from which a quiet move of the side not to move leads to
+        index."""
+        side, remainder = divmod(index, self.side_weight)
+        squares = []
+        for weight in self.weights:
+            square, remainder = divmod(remainder, weight)
+            squares.append(square)
+        occupancy = 0
+        for square in squares:
+            occupancy |= 1 << square
+        mover = 1 - side
+        base = index + (mover - side) * self.side_weight
+        for slot in self.slots[mover]:
+            target = squares[slot]
+            if self.kinds[slot] == _PAWN:
+                step = 8 if mover == 0 else -8
+                origins = 0
+                single = target - step
+                if (1 << single) & _PAWN_SQUARES & ~occupancy:
+                    origins |= 1 << single
+                    if ((1 << target) & _PAWN_DOUBLE_PUSH_RANKS[mover] and
+                            not (1 << (single - step)) & occupancy):
+                        origins |= 1 << (single - step)
+            else:
+                origins = self.attacks(slot, target, occupancy) & ~occupancy
+            weight = self.weights[slot]
+            while origins:
+                bit = origins & -origins
+                origins ^= bit
+                yield base + (bit.bit_length() - 1 - target) * weight
+
+    def boards(self,
+               squares: list[int],
+               captured: int | None,
+               promotion: str | None
+               ) -> dict[ColorChessPiece, int]:
+        """Piece boards of the position after a capture or promotion."""
+        boards = dict.fromkeys(ColorChessPiece, 0)
+        for slot, piece in enumerate(self.pieces):
+            if slot == captured:
+                continue
+            bit = 1 << squares[slot]
+            if promotion and self.kinds[slot] == _PAWN and not bit & _PAWN_SQUARES:
+                piece = PIECES_BY_COLOR[piece.color][LETTER_TYPES[promotion]]
+            boards[piece] |= bit
+            boards[piece.color.get_piece_group()] |= bit
+            boards[ColorChessPiece.ALL_PIECES] |= bit
+        return boards
+
+    def _move(self,
+              squares: tuple[int, ...],
+              slot: int,
+              bit: int,
+              enemy_slots: tuple[int, ...]
+              ) -> tuple[int | None, None, list[int]]:
+        target = bit.bit_length() - 1
+        captured = next((enemy for enemy in enemy_slots if squares[enemy] == target), None)
+        moved = list(squares)
+        moved[slot] = target
+        return captured, None, moved
+
+
+def _pieces_for(white: str, black: str) -> tuple[ColorChessPiece, ...]:
+    return tuple(PIECES_BY_COLOR[color][LETTER_TYPES[letter]]
+                 for color, letters in ((Color.WHITE, white), (Color.BLACK, black))
+                 for letter in letters)
+
+
+def _letters(piece_boards: dict[ColorChessPiece, int], color: Color) -> str:
+    return "".join(letter * piece_boards[PIECES_BY_COLOR[color][LETTER_TYPES[letter]]].bit_count()
+                   for letter in LETTERS)
+
+
+def _sorted_letters(letters: str) -> str:
+    return "".join(sorted(letters, key=LETTERS.index))
+
+
+def _material_key(letters: str) -> tuple[int, ...]:
+    return tuple(sorted((_MATERIAL_ORDER[letter] for letter in letters), reverse=True))
+
+
+def _dependencies(signature: str) -> set[str]:
+    """Tables reached from signature by one capture or promotion, trivial draws excluded."""
+    white, black = parse_signature(signature)
+    sides = [white, black]
+    results = set()
+    for side in (0, 1):
+        other = sides[1 - side]
+        for position, letter in enumerate(sides[side]):
+            if letter == "K":
+                continue
+            reduced = sides[side][:position] + sides[side][position + 1:]
+            results.add((reduced, other) if side == 0 else (other, reduced))
+            if letter == "P":
+                for promotion in _PROMOTION_LETTERS:
+                    promoted = reduced + promotion
+                    results.add((promoted, other) if side == 0 else (other, promoted))
+                    # Promoting with a capture
+                    for captured_position, captured in enumerate(other):
+                        if captured != "K":
+                            smaller = other[:captured_position] + other[captured_position + 1:]
+                            results.add((promoted, smaller) if side == 0 else (smaller, promoted))
+    return {canonical_signature(white, black)[0] for white, black in results
+            if not is_trivial_draw(white, black)}
+
+
+_PAWN_ATTACKS = (PAWN_ATTACKS[Color.WHITE], PAWN_ATTACKS[Color.BLACK])
+_PAWN_START_RANKS = (0x000000000000FF00, 0x00FF000000000000)
+_PAWN_DOUBLE_PUSH_RANKS = (0x00000000FF000000, 0x000000FF00000000)  # where a double push lands
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate endgame bitbases.")
+    parser.add_argument("signatures", nargs="+", metavar="SIGNATURE",
+                        help="material such as KQK, KRK, KPK or KRKP")
+    parser.add_argument("-d", "--directory", default="bitbases")
+    args = parser.parse_args(argv)
+    try:
+        signatures = [canonical_signature(*parse_signature(signature))[0]
+                      for signature in args.signatures]
+    except ValueError as error:
+        parser.error(str(error))
+
+    with Bitbases(args.directory) as bitbases:
+        for signature in signatures:
+            table = bitbases.generate(signature)
+            counts = [0, 0, 0]
+            for index in range(table.size):
+                counts[table.outcome(index)] += 1
+            print(f"{signature}: {counts[Outcome.WIN]} wins, {counts[Outcome.DRAW]} draws or "
+                  f"illegal, {counts[Outcome.LOSS]} losses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
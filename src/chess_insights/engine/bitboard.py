@@ -1,18 +1,77 @@
-import math
-import numpy as np
-
+"""
+Bitboard kernel. Boards are plain ints with bit n set for square n (a1 = 0, h8 = 63), and the
+functions here take and return ints so move generation never allocates an object per
+operation. BitBoard is a thin wrapper over them for code that wants a board tagged with its
+piece.
+"""
+from typing import Iterator
+
+from chess_insights.engine.geometry import RAYS
 from chess_insights.util.enum_chess_piece_type import ColorChessPiece
-from chess_insights.util.enum_file_and_rank import Rank, File
 from chess_insights.util.enum_ray_direction import Direction
-from chess_insights.util.enum_square import chebyshev_distance
+
+FULL_BOARD = 0xFFFFFFFFFFFFFFFF
+
+
+def pop_count(board: int) -> int:
+    return board.bit_count()
+
+
+def lowest_square(board: int) -> int:
+    """Index of the least significant set bit, -1 for an empty board."""
+    return (board & -board).bit_length() - 1
+
+
+def highest_square(board: int) -> int:
+    """Index of the most significant set bit, -1 for an empty board."""
+    return board.bit_length() - 1
+
+
+def iter_squares(board: int) -> Iterator[int]:
+    """Yield the set squares from a1 upwards."""
+    while board:
+        bit = board & -board
+        board ^= bit
+        yield bit.bit_length() - 1
+
+
+def squares(board: int) -> list[int]:
+    """The set squares from a1 upwards."""
+    result = []
+    while board:
+        bit = board & -board
+        board ^= bit
+        result.append(bit.bit_length() - 1)
+    return result
+
+
+def flip_vertical(board: int) -> int:
+    """Byte swap by delta swaps: rank 1 trades places with rank 8, 2 with 7 and so on."""
+    board = board >> 8 & 0x00FF00FF00FF00FF | (board & 0x00FF00FF00FF00FF) << 8
+    board = board >> 16 & 0x0000FFFF0000FFFF | (board & 0x0000FFFF0000FFFF) << 16
+    return board >> 32 | (board & 0xFFFFFFFF) << 32
+
+
+def flip_horizontal(board: int) -> int:
+    """Reverse the bits of every byte: the a-file trades places with the h-file and so on."""
+    board = board >> 1 & 0x5555555555555555 | (board & 0x5555555555555555) << 1
+    board = board >> 2 & 0x3333333333333333 | (board & 0x3333333333333333) << 2
+    return board >> 4 & 0x0F0F0F0F0F0F0F0F | (board & 0x0F0F0F0F0F0F0F0F) << 4
+
+
+def rotate_180(board: int) -> int:
+    """Full 64-bit reversal: square n goes to 63 - n."""
+    return flip_vertical(flip_horizontal(board))
 
 
 class BitBoard:
+    __slots__ = ("board", "board_type")
+
     def __init__(self, board: int = 0, board_type: ColorChessPiece = None):
         if not (-(1 << 64) <= board < (1 << 64)):
             raise ValueError(f"Bitboard must be a 64-bit integer. {board} is not")
 
-        self.board = board & 0xFFFFFFFFFFFFFFFF
+        self.board = board & FULL_BOARD
         self.board_type = board_type
 
     def set_board(self, board: int):
@@ -33,90 +92,21 @@ class BitBoard:
         self.board &= ~(1 << square)
 
     def serialize_board(self) -> list[int]:
-        board = self.board
-        squares = []
-        while board != 0:
-            square = board & -board
-            squares.append(int(math.log2(square)))
-            board = board ^ square
-        return squares
+        return squares(self.board)
 
     def mirror(self) -> 'BitBoard':
-        return self.mirror_vertical().mirror_horizontal()
+        return BitBoard(rotate_180(self.board), self.board_type)
 
     def mirror_vertical(self) -> 'BitBoard':
-        bitboard_array = np.array([self.board], dtype=np.uint64)
-        return BitBoard(bitboard_array.byteswap().item(), self.board_type)
+        return BitBoard(flip_vertical(self.board), self.board_type)
 
     def mirror_horizontal(self) -> 'BitBoard':
-        # Convert the 64-bit integer to an array of 8 bytes
-        bytes_array = np.array([self.board], dtype=np.uint64).view(np.uint8)
-        # Reverse the bits in each byte using bitwise operations
-        reversed_bytes = np.array([reverse_bits(byte) for byte in bytes_array],
-                                  dtype=np.uint8)
-        # Combine the reversed bytes back into a 64-bit integer
-        mirrored_bitboard = reversed_bytes.view(np.uint64)[0]
-        return BitBoard(int(mirrored_bitboard.item()), self.board_type)
-
-
-def serialize_bit(bit: int) -> int:
-    if bit == 0:
-        raise ValueError("Cannot serialize bit: no bits are set.")
-    if bit & (bit - 1) != 0:
-        raise ValueError("Input must have only one bit set.")
-    square = bit & -bit
-    square = int(math.log2(square))
-    return square
-
-
-def reverse_bits(byte):
-    byte = (byte & 0xF0) >> 4 | (byte & 0x0F) << 4
-    byte = (byte & 0xCC) >> 2 | (byte & 0x33) << 2
-    byte = (byte & 0xAA) >> 1 | (byte & 0x55) << 1
-    return byte
+        return BitBoard(flip_horizontal(self.board), self.board_type)
 
 
 def generate_mask(square: int, direction: Direction) -> int:
-    if direction == Direction.N or direction == Direction.S:
-        return 0x0101010101010101 << get_file(square)
-    elif direction == Direction.E or direction == Direction.W:
-        return 0xFF << (8 * get_rank(square))
-    else:
-        return get_diagonal_mask(square, direction)
-
-
-def get_diagonal_mask(origin_square: int, direction: Direction) -> int:
-    return (generate_diagonal_path_to_edge_of_board(origin_square, direction.value[1]) |
-            generate_diagonal_path_to_edge_of_board(origin_square, -direction.value[1]))
-
-
-def generate_diagonal_path_to_edge_of_board(origin_square: int, offset: int) -> int:
-    abs_offset = abs(offset)
-    start_square = 2 ** origin_square
-    edges = Rank.One | Rank.Eight | File.A | File.H
-    current_square, path = start_square, start_square
-
-    is_first_iteration = True
-    while current_square & edges == 0 or is_first_iteration:
-        prev_square = current_square
-        if offset > 0:
-            current_square = current_square << abs_offset
-        else:
-            current_square = current_square >> abs_offset
-        if (not current_square == 0 and
-                not prev_square == 0 and
-                chebyshev_distance(serialize_bit(prev_square), serialize_bit(current_square)) > 1):
-            break
-        if current_square > 2 ** 63 or current_square == 0:
-            break
-        path |= current_square
-        is_first_iteration = False
-    return path
-
-
-def get_file(square: int) -> int:
-    return square % 8
-
-
-def get_rank(square: int) -> int:
-    return square // 8
+    """The whole file, rank or diagonal through square along direction, square included."""
+    if direction == Direction.C:
+        raise ValueError("Direction C has no line.")
+    step = direction.value[1]
+    return RAYS[step][square] | RAYS[-step][square] | 1 << square
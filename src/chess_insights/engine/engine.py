@@ -1,15 +1,60 @@
-from chess_insights.engine.move_generators import generate_all_moves
+from chess_insights.engine.bitbases import Bitbases
+from chess_insights.engine.lazy_smp import LazySMP
+from chess_insights.engine.move_ordering import MoveOrdering
+from chess_insights.engine.moves import Move, decode_move
+from chess_insights.engine.opening_book import OpeningBook
+from chess_insights.engine.search import SearchLimits, SearchResult, Searcher
+from chess_insights.engine.transposition_table import TranspositionTable
 from chess_insights.game.chess_board import ChessBoard
+from chess_insights.game.position_cache import POSITION_CACHE
+from chess_insights.util.enum_engine_level import EngineLevel
 
 import random
 
 
 class Engine(ChessBoard):
-    def __init__(self, board_state=None):
-        super().__init__(board_state=board_state)
-
-    def generate_move(self):
-        candidate_moves = generate_all_moves(self.board_state)
-        valid_moves = [(origin, target) for targets, _, origin in candidate_moves for target in
-                       self._validate_moves(targets, _, origin)]
-        return random.choice(valid_moves)
+    def __init__(self,
+                 board_state=None,
+                 level: EngineLevel = EngineLevel.SEARCH,
+                 move_time_ms: float | None = 200,
+                 max_nodes: int = None,
+                 transposition_table: TranspositionTable = None,
+                 hash_history: list[int] = None,
+                 lazy_smp: LazySMP = None,
+                 opening_book: OpeningBook = None,
+                 bitbases: Bitbases = None,
+                 move_ordering: MoveOrdering = None
+                 ):
+        super().__init__(board_state=board_state, hash_history=hash_history)
+        self.level = level
+        self.limits = SearchLimits(time_limit_ms=move_time_ms, max_nodes=max_nodes)
+        self.transposition_table = transposition_table
+        self.lazy_smp = lazy_smp
+        self.opening_book = opening_book
+        self.bitbases = bitbases
+        # Killers and history are aged, not cleared, between searches; pass one instance to
+        # every Engine of a game for them to carry over
+        self.move_ordering = move_ordering or MoveOrdering()
+        self.last_search: SearchResult | None = None
+
+    def generate_move(self) -> Move:
+        """The chosen (origin, target, promotion) move; promotion is None unless a pawn promotes."""
+        legal_moves = POSITION_CACHE.legal_moves(self.position)
+        if not legal_moves:
+            raise ValueError("No legal moves in this position.")
+        if self.level == EngineLevel.RANDOM:
+            return decode_move(self.position, random.choice(legal_moves))
+
+        if self.opening_book is not None:
+            book_move = self.opening_book.choose_move(self.position, random)
+            if book_move is not None:
+                self.last_search = None
+                return book_move
+
+        if self.lazy_smp is not None:
+            self.last_search = self.lazy_smp.search(self.position, self.limits)
+        else:
+            searcher = Searcher(self.position, self.transposition_table, self.move_ordering,
+                                bitbases=self.bitbases)
+            self.last_search = searcher.search(self.limits)
+        return self.last_search.move
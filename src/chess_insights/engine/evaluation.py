@@ -0,0 +1,17 @@
+from chess_insights.engine.piece_square_tables import MAX_PHASE, MG_VALUES
+from chess_insights.game.position import Position
+
+# Middlegame material, used where a single value per piece is needed (SEE, delta pruning)
+PIECE_VALUES = MG_VALUES
+
+
+def evaluate(position: Position) -> int:
+    """
+    Static score in centipawns from the point of view of the side to move: the middlegame and
+    endgame piece-square totals blended by game phase. Position keeps the totals incrementally,
+    so this does not look at the board.
+    """
+    phase = min(position.phase, MAX_PHASE)
+    # Truncating toward zero keeps the score of a color-flipped position exactly negated
+    score = int((position.mg_score * phase + position.eg_score * (MAX_PHASE - phase)) / MAX_PHASE)
+    return score if position.is_whites_turn else -score
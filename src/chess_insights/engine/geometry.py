@@ -0,0 +1,66 @@
+"""
+Square geometry, precomputed once at import. Squares are 0-63 with a1 = 0, and every 64x64
+table is indexed [origin][target].
+
+Directions are the signed square steps of the eight rays, N = 8, NE = 9 and so on, the same
+numbers as the second value of util.enum_ray_direction.Direction. 0 stands for "no direction":
+the squares are equal or do not share a rank, file or diagonal.
+"""
+N, S, E, W, NE, NW, SE, SW = 8, -8, 1, -1, 9, 7, -7, -9
+DIRECTIONS: tuple[int, ...] = (N, S, E, W, NE, NW, SE, SW)
+# (file step, rank step) of each direction
+_STEPS = {N: (0, 1), S: (0, -1), E: (1, 0), W: (-1, 0),
+          NE: (1, 1), NW: (-1, 1), SE: (1, -1), SW: (-1, -1)}
+
+
+def _build_rays() -> dict[int, tuple[int, ...]]:
+    rays = {}
+    for direction, (file_step, rank_step) in _STEPS.items():
+        masks = []
+        for square in range(64):
+            mask = 0
+            file, rank = square % 8 + file_step, square // 8 + rank_step
+            while 0 <= file < 8 and 0 <= rank < 8:
+                mask |= 1 << (rank * 8 + file)
+                file, rank = file + file_step, rank + rank_step
+            masks.append(mask)
+        rays[direction] = tuple(masks)
+    return rays
+
+
+# RAYS[direction][square]: the squares from square to the edge of the board, square excluded
+RAYS = _build_rays()
+
+
+def _build_line_tables() -> tuple[list[list[int]], list[list[int]], list[list[int]]]:
+    direction = [[0] * 64 for _ in range(64)]
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for origin in range(64):
+        for step in DIRECTIONS:
+            ray = RAYS[step][origin]
+            full_line = ray | RAYS[-step][origin] | 1 << origin
+            target_ray = ray
+            while target_ray:
+                target_bit = target_ray & -target_ray
+                target = target_bit.bit_length() - 1
+                target_ray ^= target_bit
+                direction[origin][target] = step
+                between[origin][target] = ray & RAYS[-step][target]
+                line[origin][target] = full_line
+    return direction, between, line
+
+
+# DIRECTION[origin][target]: the direction from origin towards target, 0 when not aligned.
+# SQUARES_BETWEEN: the squares strictly between two aligned squares. LINE_THROUGH: the whole
+# rank, file or diagonal through two aligned squares. Both are 0 for squares that are not.
+DIRECTION, SQUARES_BETWEEN, LINE_THROUGH = _build_line_tables()
+
+CHEBYSHEV_DISTANCE: list[list[int]] = [
+    [max(abs(origin % 8 - target % 8), abs(origin // 8 - target // 8)) for target in range(64)]
+    for origin in range(64)
+]
+MANHATTAN_DISTANCE: list[list[int]] = [
+    [abs(origin % 8 - target % 8) + abs(origin // 8 - target // 8) for target in range(64)]
+    for origin in range(64)
+]
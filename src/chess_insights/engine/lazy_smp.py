@@ -0,0 +1,99 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from chess_insights.engine.bitbases import Bitbases
+from chess_insights.engine.move_ordering import MoveOrdering
+from chess_insights.engine.moves import decode_move, encode_move
+from chess_insights.engine.search import SearchLimits, SearchResult, Searcher
+from chess_insights.engine.transposition_table import SharedTranspositionTable
+from chess_insights.game.position import Position
+from chess_insights.util.fen import fen_from_board
+
+# Helper i starts its iterative deepening this many plies past depth 1, cycling, so that the
+# helpers spread over several depths instead of repeating the main search in lockstep
+DEPTH_OFFSETS = (1, 0, 2, 1, 3)
+
+_helper_table: SharedTranspositionTable | None = None
+_helper_bitbases: Bitbases | None = None
+
+
+class LazySMP:
+    """
+    Lazy SMP: the main search and workers - 1 helper processes search the same root
+    independently and meet only through a shared transposition table, where each finds the
+    cutoffs and move hints the others left. The result of the deepest completed iteration wins,
+    the main search's on ties.
+
+    The pool and the table outlive single searches; call close() (or use a with block) to stop
+    the helpers and free the shared memory.
+    """
+
+    def __init__(self, workers: int, size_mb: float = 16, bitbases: Bitbases = None):
+        if workers < 1:
+            raise ValueError("Lazy SMP needs at least one worker.")
+        self.workers = workers
+        self.transposition_table = SharedTranspositionTable(size_mb)
+        self.bitbases = bitbases
+        # The main thread's killers and history, aged from one search to the next
+        self.move_ordering = MoveOrdering()
+        self.executor = None
+        if workers > 1:
+            # Helpers map the bitbase files themselves; only the directory crosses over
+            self.executor = ProcessPoolExecutor(
+                max_workers=workers - 1, initializer=_attach_helper,
+                initargs=(self.transposition_table.name, bitbases.directory if bitbases else None))
+
+    def __enter__(self) -> "LazySMP":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.transposition_table is not None:
+            self.transposition_table.close()
+            self.transposition_table = None
+
+    def search(self, position: Position, limits: SearchLimits = SearchLimits()) -> SearchResult:
+        start = time.perf_counter()
+        # Helpers get the position as FEN plus the hashes of earlier positions, for repetitions
+        fen = fen_from_board(position.to_board_state())
+        history = list(position.hash_history)
+        futures = []
+        if self.executor is not None:
+            futures = [self.executor.submit(_helper_search, fen, history, limits,
+                                            1 + DEPTH_OFFSETS[index % len(DEPTH_OFFSETS)])
+                       for index in range(self.workers - 1)]
+
+        best = Searcher(position, self.transposition_table, self.move_ordering,
+                        bitbases=self.bitbases).search(limits)
+        nodes = best.nodes
+        for future in futures:
+            code, score, depth, helper_nodes = future.result()
+            nodes += helper_nodes
+            if depth > best.depth and code:
+                best = best._replace(move=decode_move(position, code), score=score, depth=depth)
+        return best._replace(nodes=nodes, elapsed_ms=(time.perf_counter() - start) * 1000)
+
+
+def _attach_helper(name: str, bitbases_directory: str | None) -> None:
+    global _helper_table, _helper_bitbases
+    _helper_table = SharedTranspositionTable(name=name)
+    if bitbases_directory is not None:
+        _helper_bitbases = Bitbases(bitbases_directory)
+
+
+def _helper_search(fen: str,
+                   hash_history: list[int],
+                   limits: SearchLimits,
+                   start_depth: int
+                   ) -> tuple[int, int, int, int]:
+    position = Position.from_fen(fen)
+    position.hash_history = hash_history
+    result = Searcher(position, _helper_table, bitbases=_helper_bitbases).search(limits,
+                                                                                 start_depth)
+    return (encode_move(result.move) if result.move else 0, result.score, result.depth,
+            result.nodes)
@@ -0,0 +1,287 @@
+from array import array
+from typing import Iterator
+
+from chess_insights.engine.attack_tables import KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, \
+    bishop_attacks_set, knight_attacks_set, pawn_attacks_set, rook_attacks_set
+from chess_insights.engine.bitboard import FULL_BOARD
+from chess_insights.engine.geometry import LINE_THROUGH, SQUARES_BETWEEN
+from chess_insights.engine.magic_bitboards import bishop_attacks, rook_attacks
+from chess_insights.engine.moves import KIND_SHIFT, TARGET_SHIFT, new_move_buffer
+from chess_insights.game.position import BISHOP, BLACK_OFFSET, BLACK_PIECES, COLOR_OFFSETS, KING, \
+    KNIGHT, PAWN, PIECES, PIECES_BY_COLOR, PROMOTION_RANKS, QUEEN, ROOK, WHITE_OFFSET, \
+    WHITE_PIECES, Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType, Color, ColorChessPiece
+
+PAWN_START_RANKS = {Color.WHITE: 0x000000000000FF00, Color.BLACK: 0x00FF000000000000}
+PROMOTION_TYPES = (ChessPieceType.QUEEN, ChessPieceType.ROOK, ChessPieceType.BISHOP,
+                   ChessPieceType.KNIGHT)
+
+# Fewest sliders of one line type for which the Kogge-Stone fills of bishop_attacks_set and
+# rook_attacks_set beat looking up each piece: measured on CPython, where a fill costs about as
+# much as six magic lookups
+SETWISE_MIN_SLIDERS = 6
+
+KING_START_SQUARES = {Color.WHITE: 4, Color.BLACK: 60}
+# (rights bit, squares that must be empty, squares the king crosses, rook origin, king target)
+CASTLING_PATHS = {
+    Color.WHITE: ((0b0001, 0x60, 0x60, 7, 6),
+                  (0b0010, 0x0E, 0x0C, 0, 2)),
+    Color.BLACK: ((0b0100, 0x60 << 56, 0x60 << 56, 63, 62),
+                  (0b1000, 0x0E << 56, 0x0C << 56, 56, 58)),
+}
+
+
+def generate_attack_map(boards: list[int],
+                        color: Color,
+                        occupancy: int
+                        ) -> int:
+    """
+    Return every square attacked by color, with sliders blocked by occupancy. boards is indexed
+    by slot, like Position.boards. This is the danger map behind king moves and castling.
+    Leapers and pawns are always attacked set-wise. Sliders are too once a line type has
+    SETWISE_MIN_SLIDERS pieces; below that, one magic lookup per piece is cheaper.
+    """
+    offset = COLOR_OFFSETS[color]
+    king = boards[offset + KING]
+    attacks = (pawn_attacks_set(boards[offset + PAWN], color) |
+               knight_attacks_set(boards[offset + KNIGHT]) |
+               (KING_ATTACKS[king.bit_length() - 1] if king else 0))
+    queens = boards[offset + QUEEN]
+    diagonal = boards[offset + BISHOP] | queens
+    if diagonal.bit_count() >= SETWISE_MIN_SLIDERS:
+        attacks |= bishop_attacks_set(diagonal, occupancy)
+    else:
+        while diagonal:
+            attacks |= bishop_attacks((diagonal & -diagonal).bit_length() - 1, occupancy)
+            diagonal &= diagonal - 1
+    orthogonal = boards[offset + ROOK] | queens
+    if orthogonal.bit_count() >= SETWISE_MIN_SLIDERS:
+        attacks |= rook_attacks_set(orthogonal, occupancy)
+    else:
+        while orthogonal:
+            attacks |= rook_attacks((orthogonal & -orthogonal).bit_length() - 1, occupancy)
+            orthogonal &= orthogonal - 1
+    return attacks
+
+
+def generate_legal_targets(position: Position,
+                           color: Color = None
+                           ) -> list[tuple[int, int, ColorChessPiece]]:
+    """
+    Return (origin square, legal targets bitboard, piece) for every piece of color (default: the
+    side to move) that has a legal move. Checkers, pins and the check evasion mask are computed
+    once, so no move has to be played to find out whether it leaves the king in check.
+    """
+    return list(iter_legal_targets(position, color or position.color_to_move))
+
+
+def has_legal_move(position: Position, color: Color = None) -> bool:
+    """Whether color (default: the side to move) can move at all; stops at the first piece that
+    can, before the remaining pieces are looked at."""
+    return next(iter_legal_targets(position, color or position.color_to_move), None) is not None
+
+
+def iter_legal_targets(position: Position,
+                       color: Color
+                       ) -> Iterator[tuple[int, int, ColorChessPiece]]:
+    """generate_legal_targets one piece at a time, king first."""
+    enemy_color = color.opposite()
+    boards = position.boards
+    if color == Color.WHITE:
+        ours, theirs = WHITE_OFFSET, BLACK_OFFSET
+        own, enemy = boards[WHITE_PIECES], boards[BLACK_PIECES]
+    else:
+        ours, theirs = BLACK_OFFSET, WHITE_OFFSET
+        own, enemy = boards[BLACK_PIECES], boards[WHITE_PIECES]
+    occupancy = own | enemy
+    enemy_queens = boards[theirs + QUEEN]
+    enemy_diagonal = boards[theirs + BISHOP] | enemy_queens
+    enemy_orthogonal = boards[theirs + ROOK] | enemy_queens
+
+    check_mask = FULL_BOARD
+    pinned = 0
+    pin_rays = {}
+    king_piece = PIECES[ours + KING]
+    king = boards[ours + KING]
+    king_square = king.bit_length() - 1
+
+    if king:
+        checkers = ((PAWN_ATTACKS[color][king_square] & boards[theirs + PAWN]) |
+                    (KNIGHT_ATTACKS[king_square] & boards[theirs + KNIGHT]) |
+                    (bishop_attacks(king_square, occupancy) & enemy_diagonal) |
+                    (rook_attacks(king_square, occupancy) & enemy_orthogonal))
+
+        # King moves are tested against an attack map with the king lifted off the board so it
+        # cannot step back along the line of a slider that checks it
+        danger = generate_attack_map(boards, enemy_color, occupancy ^ king)
+        king_targets = KING_ATTACKS[king_square] & ~own & ~danger
+        if not checkers and position.castling_rights:
+            king_targets |= _castling_targets(position, color, king_square, occupancy, danger)
+        if king_targets:
+            yield king_square, king_targets, king_piece
+
+        if checkers & (checkers - 1):
+            # Double check: only the king may move
+            return
+        if checkers:
+            check_mask = SQUARES_BETWEEN[king_square][checkers.bit_length() - 1] | checkers
+
+        snipers = ((bishop_attacks(king_square, enemy) & enemy_diagonal) |
+                   (rook_attacks(king_square, enemy) & enemy_orthogonal))
+        while snipers:
+            sniper_square = (snipers & -snipers).bit_length() - 1
+            snipers &= snipers - 1
+            blockers = SQUARES_BETWEEN[king_square][sniper_square] & occupancy
+            if blockers & own and not blockers & (blockers - 1):
+                pinned |= blockers
+                pin_rays[blockers.bit_length() - 1] = LINE_THROUGH[king_square][sniper_square]
+
+    not_own = ~own
+    for piece_type, lookup in ((KNIGHT, None),
+                               (BISHOP, bishop_attacks),
+                               (ROOK, rook_attacks),
+                               (QUEEN, None)):
+        piece = PIECES[ours + piece_type]
+        pieces = boards[ours + piece_type]
+        while pieces:
+            bit = pieces & -pieces
+            pieces ^= bit
+            square = bit.bit_length() - 1
+            if piece_type == KNIGHT:
+                if bit & pinned:
+                    continue
+                targets = KNIGHT_ATTACKS[square]
+            elif lookup is None:
+                targets = bishop_attacks(square, occupancy) | rook_attacks(square, occupancy)
+            else:
+                targets = lookup(square, occupancy)
+            targets &= not_own & check_mask
+            if bit & pinned:
+                targets &= pin_rays[square]
+            if targets:
+                yield square, targets, piece
+
+    pawn_piece = PIECES[ours + PAWN]
+    pawns = boards[ours + PAWN]
+    forward = 8 if ours == WHITE_OFFSET else -8
+    start_rank = PAWN_START_RANKS[color]
+    pawn_attacks = PAWN_ATTACKS[color]
+    en_passant = position.en_passant_square if color == position.color_to_move else 0
+    while pawns:
+        bit = pawns & -pawns
+        pawns ^= bit
+        square = bit.bit_length() - 1
+
+        push = 1 << (square + forward)
+        targets = 0
+        if not push & occupancy:
+            targets = push
+            if bit & start_rank:
+                double_push = 1 << (square + 2 * forward)
+                if not double_push & occupancy:
+                    targets |= double_push
+        targets = (targets | (pawn_attacks[square] & enemy)) & check_mask
+        if bit & pinned:
+            targets &= pin_rays[square]
+
+        if en_passant & pawn_attacks[square]:
+            captured = en_passant >> 8 if ours == WHITE_OFFSET else en_passant << 8
+            if (en_passant & check_mask or captured & check_mask) and not (
+                    king and _is_en_passant_discovered_check(king_square, occupancy, bit,
+                                                             captured, en_passant,
+                                                             enemy_diagonal, enemy_orthogonal)):
+                targets |= en_passant
+
+        if targets:
+            yield square, targets, pawn_piece
+
+
+def generate_legal_moves(position: Position
+                         ) -> list[tuple[int, int, ColorChessPiece | None]]:
+    """Return every legal (origin, target, promotion) for the side to move."""
+    color = position.color_to_move
+    promotion_rank = PROMOTION_RANKS[color]
+    promotions = tuple(PIECES_BY_COLOR[color][piece_type] for piece_type in PROMOTION_TYPES)
+    moves = []
+    for origin, targets, piece in iter_legal_targets(position, color):
+        is_pawn = piece.piece_type == ChessPieceType.PAWN
+        while targets:
+            target_bit = targets & -targets
+            targets ^= target_bit
+            target = target_bit.bit_length() - 1
+            if is_pawn and target_bit & promotion_rank:
+                moves.extend((origin, target, promotion) for promotion in promotions)
+            else:
+                moves.append((origin, target, None))
+    return moves
+
+
+def fill_legal_moves(position: Position, buffer: array) -> int:
+    """
+    Write the packed legal moves of the side to move into buffer (from moves.new_move_buffer)
+    and return how many there are; whatever follows them in buffer is stale.
+    """
+    promotion_rank = PROMOTION_RANKS[position.color_to_move]
+    count = 0
+    for origin, targets, piece in iter_legal_targets(position, position.color_to_move):
+        promotions = piece.piece_type == ChessPieceType.PAWN and targets & promotion_rank
+        while targets:
+            target_bit = targets & -targets
+            targets ^= target_bit
+            code = origin | (target_bit.bit_length() - 1) << TARGET_SHIFT
+            if promotions and target_bit & promotion_rank:
+                for kind in range(1, 5):
+                    buffer[count] = code | kind << KIND_SHIFT
+                    count += 1
+            else:
+                buffer[count] = code
+                count += 1
+    return count
+
+
+def generate_legal_codes(position: Position) -> array:
+    """The packed legal moves of the side to move, in a fresh array('H')."""
+    buffer = new_move_buffer()
+    return buffer[:fill_legal_moves(position, buffer)]
+
+
+def get_legal_targets(position: Position, square: int) -> int:
+    """Return the legal targets bitboard for the piece on square, for either color."""
+    piece = position.piece_on(square)
+    if piece is None:
+        return 0
+    for origin, targets, _ in iter_legal_targets(position, piece.color):
+        if origin == square:
+            return targets
+    return 0
+
+
+def _castling_targets(position: Position,
+                      color: Color,
+                      king_square: int,
+                      occupancy: int,
+                      danger: int
+                      ) -> int:
+    if king_square != KING_START_SQUARES[color]:
+        return 0
+    targets = 0
+    rook = position.boards[COLOR_OFFSETS[color] + ROOK]
+    for right, empty_path, king_path, rook_square, king_target in CASTLING_PATHS[color]:
+        if (position.castling_rights & right and rook & (1 << rook_square) and
+                not occupancy & empty_path and not danger & king_path):
+            targets |= 1 << king_target
+    return targets
+
+
+def _is_en_passant_discovered_check(king_square: int,
+                                    occupancy: int,
+                                    pawn: int,
+                                    captured: int,
+                                    en_passant: int,
+                                    enemy_diagonal: int,
+                                    enemy_orthogonal: int
+                                    ) -> bool:
+    """En passant removes two pawns from the board at once, which can expose the king."""
+    occupancy = (occupancy ^ pawn ^ captured) | en_passant
+    return bool((rook_attacks(king_square, occupancy) & enemy_orthogonal) or
+                (bishop_attacks(king_square, occupancy) & enemy_diagonal))
@@ -0,0 +1,189 @@
+import os
+from array import array
+
+from chess_insights.engine.bitboard import FULL_BOARD
+
+# Fixed-shift magic multipliers, one per square, found offline with a seeded sparse random search.
+# Changing any of them invalidates tables persisted with save_tables.
+
+ROOK_MAGICS: tuple[int, ...] = (
+    0x2080001440022581, 0x1080200040001080, 0x4080100008200080, 0x0280080080100254,
+    0x4D8004000A180080, 0x0100080400020100, 0x1080010040800200, 0x0200004402002081,
+    0x0068800024884004, 0x1000804000802002, 0x000200208A001040, 0x3008801000800800,
+    0x2006001060440A00, 0x1000800200800400, 0x0004000441024810, 0xA001000082004100,
+    0x0040808000204014, 0x0000424002201000, 0x0010110041002000, 0x0000090021041000,
+    0x0204008004800800, 0x0000808004000200, 0x6006040021485042, 0x0000020002409924,
+    0x2000401980028020, 0x4000400100308100, 0x0000820200201041, 0xB100100080800800,
+    0x3004080080040080, 0x0802000200041009, 0x01A0580400021110, 0x00020042000408A1,
+    0x4218884000800023, 0x0480201000400045, 0x0010200080801000, 0x1200200901001000,
+    0x0000100801000500, 0x0080020080800400, 0x004A000100404080, 0x0480005402001081,
+    0x258000402000C000, 0xA010004820084002, 0x0480200010008080, 0x244100100021000C,
+    0x2040080005010010, 0x0012000810020004, 0x0011000200B9000C, 0x1121000080410002,
+    0x00082080410A0600, 0x4002008100402600, 0x0A0300E008544100, 0x7B00080010008080,
+    0x0300080100100500, 0x0002020080040080, 0x0042521810214400, 0x8A00004089140200,
+    0x00001280010A2041, 0x0400401102042086, 0x41902000100C4101, 0x0043020420900009,
+    0x00E2000410082002, 0x4402000108041002, 0x2100101A00814804, 0x0400010400218246,
+)
+
+BISHOP_MAGICS: tuple[int, ...] = (
+    0x0102040418220020, 0x0108024802002028, 0x8010044040400001, 0x0022209200044800,
+    0x4004504005040114, 0x0022010420A80800, 0x0008441008090002, 0x0000420801480200,
+    0x1100220244011C00, 0x00883004081AB020, 0x4400100152002000, 0x4019080841004000,
+    0x2861021210000000, 0x400EA10108400020, 0x4800208208A24000, 0x0020A500A0842085,
+    0x3410000802504400, 0x0010E0200C010060, 0x0014182042408200, 0x4094006840112109,
+    0x2014200202010000, 0x000100020080C400, 0x800400420D2C0200, 0x0002200182251000,
+    0x0010F10304C41000, 0x001024A008281084, 0x0088110002040100, 0x0820080001004008,
+    0x0104040020410050, 0x0110002027040500, 0x418C008009182100, 0x2C00A9040C80480B,
+    0x008110C8005020A4, 0x4004210802041000, 0x0004020108208100, 0x0000080800120A00,
+    0x430C008400820102, 0x1400808100020108, 0x005006020010A8A0, 0x000801868004A220,
+    0x00420105C00C2000, 0x1010921032019040, 0x0300222028103000, 0x0008004208001080,
+    0x5410202248811400, 0x0008010800800808, 0x3C02C20404000900, 0x0408022282040032,
+    0x0000941002100000, 0x0112209A10100804, 0x080C020111210000, 0x442002A442022008,
+    0x00084A181B040000, 0x00115021021C2080, 0x4010051000A20000, 0x0404688085060000,
+    0x0000220110011000, 0x140000220734200C, 0x0440010424020800, 0x2204828883460800,
+    0x0020000004050410, 0x4060004A20082080, 0x00489034B002C201, 0x0444049010410300,
+)
+
+# (rank step, file step) pairs walked when building the tables
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+TABLE_FILE_TAG = b"CIMAGIC1"
+
+
+def generate_relevant_mask(square: int, directions: tuple[tuple[int, int], ...]) -> int:
+    """Return the occupancy bits that can block a slider on square, excluding board edges."""
+    rank, file = divmod(square, 8)
+    mask = 0
+    for rank_step, file_step in directions:
+        current_rank, current_file = rank + rank_step, file + file_step
+        while 0 <= current_rank + rank_step <= 7 and 0 <= current_file + file_step <= 7:
+            mask |= 1 << (current_rank * 8 + current_file)
+            current_rank += rank_step
+            current_file += file_step
+    return mask
+
+
+def generate_ray_attacks(square: int,
+                         occupancy: int,
+                         directions: tuple[tuple[int, int], ...]
+                         ) -> int:
+    """Walk each ray from square until it leaves the board or hits a blocker (inclusive)."""
+    rank, file = divmod(square, 8)
+    attacks = 0
+    for rank_step, file_step in directions:
+        current_rank, current_file = rank + rank_step, file + file_step
+        while 0 <= current_rank <= 7 and 0 <= current_file <= 7:
+            bit = 1 << (current_rank * 8 + current_file)
+            attacks |= bit
+            if occupancy & bit:
+                break
+            current_rank += rank_step
+            current_file += file_step
+    return attacks
+
+
+ROOK_MASKS: tuple[int, ...] = tuple(
+    generate_relevant_mask(square, ROOK_DIRECTIONS) for square in range(64))
+BISHOP_MASKS: tuple[int, ...] = tuple(
+    generate_relevant_mask(square, BISHOP_DIRECTIONS) for square in range(64))
+ROOK_SHIFTS: tuple[int, ...] = tuple(64 - mask.bit_count() for mask in ROOK_MASKS)
+BISHOP_SHIFTS: tuple[int, ...] = tuple(64 - mask.bit_count() for mask in BISHOP_MASKS)
+
+
+def build_square_table(square: int,
+                       mask: int,
+                       magic: int,
+                       shift: int,
+                       directions: tuple[tuple[int, int], ...]
+                       ) -> list[int]:
+    """Fill one square's attack table by enumerating every subset of its relevant mask."""
+    table = [0] * (1 << (64 - shift))
+    occupancy = 0
+    while True:
+        table[((occupancy * magic) & FULL_BOARD) >> shift] = generate_ray_attacks(
+            square, occupancy, directions)
+        occupancy = (occupancy - mask) & mask
+        if occupancy == 0:
+            return table
+
+
+def build_tables() -> tuple[list[list[int]], list[list[int]]]:
+    """Generate the rook and bishop attack tables from the magic constants."""
+    rook_table = [build_square_table(square, ROOK_MASKS[square], ROOK_MAGICS[square],
+                                     ROOK_SHIFTS[square], ROOK_DIRECTIONS)
+                  for square in range(64)]
+    bishop_table = [build_square_table(square, BISHOP_MASKS[square], BISHOP_MAGICS[square],
+                                       BISHOP_SHIFTS[square], BISHOP_DIRECTIONS)
+                    for square in range(64)]
+    return rook_table, bishop_table
+
+
+def save_tables(path: str,
+                rook_table: list[list[int]],
+                bishop_table: list[list[int]]
+                ) -> None:
+    """Persist the tables, prefixed with the magics they were built from."""
+    data = array('Q', ROOK_MAGICS + BISHOP_MAGICS)
+    for square_table in rook_table + bishop_table:
+        data.extend(square_table)
+    with open(path, 'wb') as file:
+        file.write(TABLE_FILE_TAG)
+        data.tofile(file)
+
+
+def load_tables(path: str) -> tuple[list[list[int]], list[list[int]]]:
+    """Load tables written by save_tables, rejecting files built from different magics."""
+    with open(path, 'rb') as file:
+        if file.read(len(TABLE_FILE_TAG)) != TABLE_FILE_TAG:
+            raise ValueError(f"{path} is not a magic bitboard table file.")
+        data = array('Q')
+        data.frombytes(file.read())
+
+    if tuple(data[:128]) != ROOK_MAGICS + BISHOP_MAGICS:
+        raise ValueError(f"{path} was built from different magic numbers.")
+
+    offset = 128
+    tables = []
+    for shifts in (ROOK_SHIFTS, BISHOP_SHIFTS):
+        table = []
+        for shift in shifts:
+            size = 1 << (64 - shift)
+            table.append(data[offset:offset + size].tolist())
+            offset += size
+        tables.append(table)
+    if offset != len(data):
+        raise ValueError(f"{path} has an unexpected size.")
+    return tables[0], tables[1]
+
+
+def load_or_build_tables(path: str = None) -> tuple[list[list[int]], list[list[int]]]:
+    """Load persisted tables from path if possible, otherwise build them and persist to path."""
+    if path and os.path.exists(path):
+        try:
+            return load_tables(path)
+        except ValueError:
+            pass
+
+    rook_table, bishop_table = build_tables()
+    if path:
+        save_tables(path, rook_table, bishop_table)
+    return rook_table, bishop_table
+
+
+ROOK_TABLE, BISHOP_TABLE = load_or_build_tables(os.getenv("MAGIC_TABLE_PATH"))
+
+
+def rook_attacks(square: int, occupancy: int) -> int:
+    return ROOK_TABLE[square][
+        ((occupancy & ROOK_MASKS[square]) * ROOK_MAGICS[square] & FULL_BOARD) >> ROOK_SHIFTS[square]]
+
+
+def bishop_attacks(square: int, occupancy: int) -> int:
+    return BISHOP_TABLE[square][
+        ((occupancy & BISHOP_MASKS[square]) * BISHOP_MAGICS[square] & FULL_BOARD)
+        >> BISHOP_SHIFTS[square]]
+
+
+def queen_attacks(square: int, occupancy: int) -> int:
+    return rook_attacks(square, occupancy) | bishop_attacks(square, occupancy)
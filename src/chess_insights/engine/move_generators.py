@@ -1,26 +1,22 @@
-from chess_insights.util.enum_chess_piece_type import ColorChessPiece, ChessPieceType, Color, \
-    get_pieces_by_color
-from chess_insights.util.enum_file_and_rank import Rank, File
-from chess_insights.util.enum_ray_direction import Direction
-from .bitboard import BitBoard, generate_mask
+from chess_insights.util.enum_chess_piece_type import PIECE_ORDER, ColorChessPiece, \
+    ChessPieceType, Color
+from .attack_tables import KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, king_attacks_set, \
+    knight_attacks_set, pawn_attacks_set
+from .bitboard import BitBoard, squares
+from .magic_bitboards import bishop_attacks, queen_attacks, rook_attacks
 from chess_insights.game.castling import get_castling_moves
 from chess_insights.game.pawn import is_pawn_starting_rank, pawn_movement
+from chess_insights.game.position import Position
+from .legal_moves import generate_attack_map, generate_legal_targets
 from ..game.board_state import BoardState
 
 
 def generate_all_moves(board_state: BoardState) -> list[tuple[list[int], ColorChessPiece, int]]:
-    """Generate all moves for a given BoardState based on turn."""
-
-    # Determine which color is playing
-    color = Color.WHITE if board_state.is_whites_turn else Color.BLACK
-
-    # Generate all moves
+    """Generate all legal moves for a given BoardState based on turn."""
+    position = Position.from_board_state(board_state)
     return [
-        (BitBoard.serialize_board(generate_moves(BitBoard(1 << square, board.board_type), board_state)),
-         board.board_type, square)
-        for piece in get_pieces_by_color(color)
-        for board in [board_state.piece_locations[piece]]
-        for square in BitBoard.serialize_board(board)
+        (squares(targets), piece, origin)
+        for origin, targets, piece in generate_legal_targets(position)
     ]
 
 
@@ -55,14 +51,10 @@ def generate_attacks(piece_board: BitBoard, collisions: BitBoard) -> BitBoard:
 
 
 def generate_attacks_by_color(board_state: BoardState, color: Color) -> BitBoard:
-    collisions = board_state.piece_locations[ColorChessPiece.ALL_PIECES]
-    attacks = 0
-    pieces = get_pieces_by_color(color)
-    for piece in pieces:
-        board = board_state.piece_locations[piece]
-        attacks |= generate_attacks(board, collisions).board
-
-    return BitBoard(attacks)
+    piece_locations = board_state.piece_locations
+    boards = [piece_locations[piece].board for piece in PIECE_ORDER]
+    return BitBoard(generate_attack_map(boards, color,
+                                        piece_locations[ColorChessPiece.ALL_PIECES].board))
 
 
 def generate_sliding_and_knight_moves(piece_board: BitBoard, board_state: BoardState, ) -> BitBoard:
@@ -116,91 +108,52 @@ def generate_king_moves(piece_board: BitBoard, board_state: BoardState) -> BitBo
 
 
 def get_sliding_attacks(collisions: BitBoard, piece_board: BitBoard) -> BitBoard:
-    squares = BitBoard.serialize_board(piece_board)
-    directions = Direction.get_directions(piece_board.board_type)
-
-    attacks = generate_sliding_attacks(collisions, squares, directions)
-    return attacks
-
+    match piece_board.board_type.piece_type:
+        case ChessPieceType.BISHOP:
+            lookup = bishop_attacks
+        case ChessPieceType.ROOK:
+            lookup = rook_attacks
+        case ChessPieceType.QUEEN:
+            lookup = queen_attacks
+        case _:
+            raise ValueError(f"Invalid piece type: {piece_board.board_type}")
 
-def generate_sliding_attacks(
-        collisions: BitBoard,
-        squares: list[int],
-        directions: list[Direction]
-) -> BitBoard:
-    mirrored_collisions = collisions.mirror()
+    occupancy = collisions.board
+    pieces = piece_board.board
     attacks = 0
-    for square in squares:
-        bit_square = 1 << square
-        mirrored_square = BitBoard(bit_square, None).mirror()
-        for direction in directions:
-            mask = generate_mask(square, direction)
-            mirrored_mask = BitBoard(mask, None).mirror()
-            positive_path = (collisions.board & mask) - 2 * bit_square
-            negative_path = (BitBoard((
-                    (mirrored_collisions.board & mirrored_mask.board) - 2 * mirrored_square.board),
-                None)
-                             .mirror())
-            path = positive_path ^ negative_path.board
-            attacks |= path & mask
+    while pieces:
+        attacks |= lookup((pieces & -pieces).bit_length() - 1, occupancy)
+        pieces &= pieces - 1
 
     return BitBoard(attacks, None)
 
 
 def generate_pawn_attacks(pawn_board: BitBoard) -> BitBoard:
     pawns = pawn_board.board
-    a_file = File.A.value
-    h_file = File.H.value
+    color = pawn_board.board_type.color
+    if pawns & (pawns - 1) == 0:
+        attacks = PAWN_ATTACKS[color][pawns.bit_length() - 1] if pawns else 0
+    else:
+        attacks = pawn_attacks_set(pawns, color)
 
-    if pawn_board.board_type.color == Color.WHITE:
-        east_attacks = (pawns & ~h_file) << 9
-        west_attacks = (pawns & ~a_file) << 7
-    elif pawn_board.board_type.color == Color.BLACK:
-        east_attacks = (pawns & ~h_file) >> 7
-        west_attacks = (pawns & ~a_file) >> 9
-
-    return BitBoard(east_attacks | west_attacks, None)
+    return BitBoard(attacks, None)
 
 
 def generate_knight_attacks(knight_board: BitBoard) -> BitBoard:
     knights = knight_board.board
-    a_file = File.A.value
-    b_file = File.B.value
-    g_file = File.G.value
-    h_file = File.H.value
-    rank_1 = Rank.One.value
-    rank_2 = Rank.Two.value
-    rank_7 = Rank.Seven.value
-    rank_8 = Rank.Eight.value
-
-    nne = (knights & ~(rank_7 | rank_8 | h_file)) << 17
-    nee = (knights & ~(rank_8 | h_file | g_file)) << 10
-    nnw = (knights & ~(rank_7 | rank_8 | a_file)) << 15
-    nww = (knights & ~(rank_8 | a_file | b_file)) << 6
-    sse = (knights & ~(rank_1 | rank_2 | h_file)) >> 15
-    see = (knights & ~(rank_1 | g_file | h_file)) >> 6
-    ssw = (knights & ~(rank_1 | rank_2 | a_file)) >> 17
-    sww = (knights & ~(rank_1 | a_file | b_file)) >> 10
-    attacks = nne | nee | nnw | nww | sse | see | ssw | sww
+    if knights & (knights - 1) == 0:
+        attacks = KNIGHT_ATTACKS[knights.bit_length() - 1] if knights else 0
+    else:
+        attacks = knight_attacks_set(knights)
 
     return BitBoard(attacks, None)
 
 
 def generate_king_attacks(king_board: BitBoard) -> BitBoard:
-    king_square = king_board.board
-    a_file = File.A.value
-    h_file = File.H.value
-    rank_1 = Rank.One.value
-    rank_8 = Rank.Eight.value
-
-    east = (king_square & ~h_file) << 1
-    west = (king_square & ~a_file) >> 1
-    north = (king_square & ~rank_8) << 8
-    south = (king_square & ~rank_1) >> 8
-    ne = (north & ~h_file) << 1
-    nw = (north & ~a_file) >> 1
-    se = (south & ~h_file) << 1
-    sw = (south & ~a_file) >> 1
-    attacks = east | west | north | south | ne | nw | se | sw
+    kings = king_board.board
+    if kings & (kings - 1) == 0:
+        attacks = KING_ATTACKS[kings.bit_length() - 1] if kings else 0
+    else:
+        attacks = king_attacks_set(kings)
 
     return BitBoard(attacks, None)
@@ -0,0 +1,134 @@
+from array import array
+from typing import Iterator
+
+from chess_insights.engine.moves import KIND_SHIFT, QUEEN_PROMOTION, SQUARE_MASK, TARGET_SHIFT
+from chess_insights.game.position import BLACK_PIECES, WHITE_PIECES, Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType
+
+MAX_PLY = 128
+KILLERS_PER_PLY = 2
+HISTORY_LIMIT = 1 << 20  # all scores are halved once any entry reaches this
+
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORES = (1 << 27, (1 << 27) - 1)
+UNDERPROMOTION_SCORE = -1  # below every history score
+
+# Victims are ranked above attackers, so any capture of a queen outranks any capture of a rook
+PIECE_RANKS = {
+    ChessPieceType.PAWN: 1,
+    ChessPieceType.KNIGHT: 2,
+    ChessPieceType.BISHOP: 3,
+    ChessPieceType.ROOK: 4,
+    ChessPieceType.QUEEN: 5,
+    ChessPieceType.KING: 6,
+}
+
+
+def mvv_lva(attacker: ChessPieceType, victim: ChessPieceType) -> int:
+    """Most valuable victim first, least valuable attacker as tie break."""
+    return PIECE_RANKS[victim] * 8 - PIECE_RANKS[attacker]
+
+
+class MoveOrdering:
+    """
+    Move ordering state kept across the nodes of a search: two killer moves per ply and a
+    butterfly history table indexed by side, origin and target. Both live in preallocated arrays.
+    Between searches history is aged by halving and the killers are cleared.
+    """
+
+    def __init__(self):
+        self.killers = array('H', [0]) * (MAX_PLY * KILLERS_PER_PLY)
+        self.history = array('l', [0]) * (2 * 64 * 64)
+
+    def age(self) -> None:
+        self.age_history()
+        self.killers[:] = array('H', [0]) * len(self.killers)
+
+    def clear(self) -> None:
+        self.history[:] = array('l', [0]) * len(self.history)
+        self.killers[:] = array('H', [0]) * len(self.killers)
+
+    def is_killer(self, code: int, ply: int) -> bool:
+        start = ply * KILLERS_PER_PLY
+        return code in self.killers[start:start + KILLERS_PER_PLY]
+
+    def history_score(self, is_whites_turn: bool, origin: int, target: int) -> int:
+        return self.history[(not is_whites_turn) << 12 | target << TARGET_SHIFT | origin]
+
+    def score_moves(self,
+                    position: Position,
+                    moves: list[int],
+                    tt_move: int,
+                    ply: int
+                    ) -> list[int]:
+        """Hash move, then captures and queen promotions by MVV-LVA, killers, history, and
+        underpromotions last. moves are packed moves, in a list or array('H')."""
+        enemy = position.boards[BLACK_PIECES if position.is_whites_turn else WHITE_PIECES]
+        history = self.history
+        side = (not position.is_whites_turn) << 12
+        killer_start = ply * KILLERS_PER_PLY
+        killers = self.killers[killer_start:killer_start + KILLERS_PER_PLY]
+        scores = []
+        for code in moves:
+            origin, target = code & SQUARE_MASK, code >> TARGET_SHIFT & SQUARE_MASK
+            if code == tt_move:
+                scores.append(HASH_MOVE_SCORE)
+            elif code >> KIND_SHIFT > QUEEN_PROMOTION:
+                scores.append(UNDERPROMOTION_SCORE)
+            elif enemy & (1 << target) or code >> KIND_SHIFT == QUEEN_PROMOTION:
+                attacker = position.piece_on(origin).piece_type
+                victim = position.piece_on(target)
+                scores.append(CAPTURE_SCORE + mvv_lva(
+                    attacker, victim.piece_type if victim else ChessPieceType.PAWN))
+            elif code in killers:
+                scores.append(KILLER_SCORES[killers.index(code)])
+            else:
+                scores.append(history[side | code & 0xFFF])
+        return scores
+
+    def ordered_moves(self,
+                      position: Position,
+                      moves: list[int],
+                      tt_move: int,
+                      ply: int
+                      ) -> Iterator[int]:
+        """
+        Yield moves best-first by selection: each step only scans for the highest remaining
+        score, so a node that cuts off after a few moves never sorts the rest.
+        """
+        scores = self.score_moves(position, moves, tt_move, ply)
+        count = len(moves)
+        for index in range(count):
+            best = index
+            best_score = scores[index]
+            for candidate in range(index + 1, count):
+                if scores[candidate] > best_score:
+                    best, best_score = candidate, scores[candidate]
+            if best != index:
+                moves[index], moves[best] = moves[best], moves[index]
+                scores[index], scores[best] = scores[best], scores[index]
+            yield moves[index]
+
+    def update_quiet_cutoff(self,
+                            code: int,
+                            is_whites_turn: bool,
+                            depth: int,
+                            ply: int
+                            ) -> None:
+        """Reward a quiet move that caused a beta cutoff."""
+        start = ply * KILLERS_PER_PLY
+        killers = self.killers
+        if killers[start] != code:
+            killers[start + 1] = killers[start]
+            killers[start] = code
+
+        index = (not is_whites_turn) << 12 | code & 0xFFF
+        self.history[index] += depth * depth
+        if self.history[index] >= HISTORY_LIMIT:
+            self.age_history()
+
+    def age_history(self) -> None:
+        history = self.history
+        for index in range(len(history)):
+            history[index] >>= 1
@@ -0,0 +1,184 @@
+from enum import IntEnum
+from typing import Iterator
+
+from chess_insights.engine.bitboard import iter_squares
+from chess_insights.engine.legal_moves import generate_legal_targets
+from chess_insights.engine.move_ordering import KILLERS_PER_PLY, PIECE_RANKS, MoveOrdering, \
+    mvv_lva
+from chess_insights.engine.moves import KIND_SHIFT, NO_MOVE, QUEEN_PROMOTION, SQUARE_MASK, \
+    TARGET_SHIFT
+from chess_insights.engine.see import static_exchange_evaluation
+from chess_insights.game.position import ALL_PIECES, BLACK_PIECES, PROMOTION_RANKS, WHITE_PIECES, \
+    Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType
+
+QUEEN_KIND = QUEEN_PROMOTION << KIND_SHIFT
+UNDERPROMOTION_KINDS = tuple(kind << KIND_SHIFT for kind in range(QUEEN_PROMOTION + 1, 5))
+
+
+class Stage(IntEnum):
+    HASH_MOVE = 0
+    GOOD_CAPTURES = 1
+    KILLERS = 2
+    QUIETS = 3
+    BAD_CAPTURES = 4
+
+
+class MovePicker:
+    """
+    Yield the packed legal moves of a node stage by stage: hash move, good captures, killers, quiet
+    moves, bad captures. Legal targets are computed once as bitboards; a stage only expands and
+    scores its own moves when the previous stage is exhausted, so a node that cuts off on the
+    hash move or a capture never builds its quiet moves.
+
+    With tactical_only only captures and queen promotions are yielded, as quiescence needs.
+    """
+
+    def __init__(self,
+                 position: Position,
+                 move_ordering: MoveOrdering,
+                 tt_move: int = 0,
+                 ply: int = 0,
+                 tactical_only: bool = False
+                 ):
+        self.position = position
+        self.move_ordering = move_ordering
+        self.tt_move = tt_move
+        self.ply = ply
+        self.tactical_only = tactical_only
+        self.stage = Stage.HASH_MOVE
+        self.targets = {origin: (targets, piece)
+                        for origin, targets, piece in generate_legal_targets(position)}
+
+    def has_moves(self) -> bool:
+        return bool(self.targets)
+
+    def __iter__(self) -> Iterator[int]:
+        position = self.position
+        color = position.color_to_move
+        enemy = position.boards[BLACK_PIECES if position.is_whites_turn else WHITE_PIECES]
+        captures_mask = enemy | position.en_passant_square
+        promotion_rank = PROMOTION_RANKS[color]
+
+        self.stage = Stage.HASH_MOVE
+        hash_move = self._validate(self.tt_move)
+        if hash_move and self.tactical_only and (
+                self.is_quiet(hash_move) or hash_move >> KIND_SHIFT not in (0, QUEEN_PROMOTION)):
+            hash_move = NO_MOVE
+        if hash_move:
+            yield hash_move
+
+        self.stage = Stage.GOOD_CAPTURES
+        good, bad = [], []
+        for origin, (targets, piece) in self.targets.items():
+            is_pawn = piece.piece_type == ChessPieceType.PAWN
+            tactical = targets & captures_mask if is_pawn else targets & enemy
+            if is_pawn:
+                tactical |= targets & promotion_rank
+            while tactical:
+                bit = tactical & -tactical
+                tactical ^= bit
+                target = bit.bit_length() - 1
+                victim = position.piece_on(target)
+                victim_type = victim.piece_type if victim else ChessPieceType.PAWN
+                move = origin | target << TARGET_SHIFT
+                score = mvv_lva(piece.piece_type, victim_type)
+                if is_pawn and bit & promotion_rank:
+                    move |= QUEEN_KIND
+                    score += PIECE_RANKS[ChessPieceType.QUEEN] * 8
+                if move == hash_move:
+                    continue
+                if self._is_good_capture(move, piece.piece_type, victim_type):
+                    good.append((score, move))
+                else:
+                    bad.append((score, move))
+        yield from _best_first(good)
+
+        if self.tactical_only:
+            self.stage = Stage.BAD_CAPTURES
+            yield from _best_first(bad)
+            return
+
+        self.stage = Stage.KILLERS
+        start = self.ply * KILLERS_PER_PLY
+        killers = []
+        for code in self.move_ordering.killers[start:start + KILLERS_PER_PLY]:
+            killer = self._validate(code)
+            if killer and killer != hash_move and self.is_quiet(killer):
+                killers.append(killer)
+                yield killer
+
+        self.stage = Stage.QUIETS
+        history = self.move_ordering.history
+        side = (not position.is_whites_turn) << 12
+        quiets = []
+        for origin, (targets, piece) in self.targets.items():
+            is_pawn = piece.piece_type == ChessPieceType.PAWN
+            if is_pawn:
+                # Queen promotions were tactical; the under-promotions of every promoting move
+                # come last among the quiet moves
+                for target in iter_squares(targets & promotion_rank):
+                    move = origin | target << TARGET_SHIFT
+                    quiets.extend((-1, move | kind) for kind in UNDERPROMOTION_KINDS
+                                  if move | kind != hash_move)
+                quiet_targets = targets & ~captures_mask & ~promotion_rank
+            else:
+                quiet_targets = targets & ~enemy
+            for target in iter_squares(quiet_targets):
+                move = origin | target << TARGET_SHIFT
+                if move != hash_move and move not in killers:
+                    quiets.append((history[side | move], move))
+        yield from _best_first(quiets)
+
+        self.stage = Stage.BAD_CAPTURES
+        yield from _best_first(bad)
+
+    def is_quiet(self, move: int) -> bool:
+        """True for moves that neither capture nor promote."""
+        if move >> KIND_SHIFT:
+            return False
+        position = self.position
+        bit = 1 << (move >> TARGET_SHIFT & SQUARE_MASK)
+        if position.boards[ALL_PIECES] & bit:
+            return False
+        return not (bit == position.en_passant_square and
+                    self.targets[move & SQUARE_MASK][1].piece_type == ChessPieceType.PAWN)
+
+    def _validate(self, code: int) -> int:
+        """code if it is a legal move here, else NO_MOVE: hash and killer moves come from other
+        positions."""
+        if not code:
+            return NO_MOVE
+        entry = self.targets.get(code & SQUARE_MASK)
+        target_bit = 1 << (code >> TARGET_SHIFT & SQUARE_MASK)
+        if entry is None or not entry[0] & target_bit:
+            return NO_MOVE
+        piece = entry[1]
+        is_promotion = (piece.piece_type == ChessPieceType.PAWN and
+                        target_bit & PROMOTION_RANKS[piece.color])
+        if bool(code >> KIND_SHIFT) != bool(is_promotion):
+            return NO_MOVE
+        return code
+
+    def _is_good_capture(self,
+                         move: int,
+                         attacker: ChessPieceType,
+                         victim: ChessPieceType
+                         ) -> bool:
+        """Taking an equal or bigger piece never loses material; anything else is left to SEE."""
+        if PIECE_RANKS[victim] >= PIECE_RANKS[attacker] or attacker == ChessPieceType.KING:
+            return True
+        return static_exchange_evaluation(self.position, move) >= 0
+
+
+def _best_first(scored_moves: list[tuple[int, int]]) -> Iterator[int]:
+    """Selection order: find the best remaining move only when the caller asks for another."""
+    count = len(scored_moves)
+    for index in range(count):
+        best = index
+        for candidate in range(index + 1, count):
+            if scored_moves[candidate][0] > scored_moves[best][0]:
+                best = candidate
+        if best != index:
+            scored_moves[index], scored_moves[best] = scored_moves[best], scored_moves[index]
+        yield scored_moves[index][1]
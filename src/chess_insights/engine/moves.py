@@ -0,0 +1,72 @@
+"""
+The packed move type shared by move generation, search, the opening book and the process pool
+helpers. A move is a 16-bit int:
+
+    bits 0-5    origin square
+    bits 6-11   target square
+    bits 12-15  kind: 0 for an ordinary move, else the promotion piece (PROMOTION_CODES)
+
+Captures, castling and en passant are not flagged: Position.make_move infers them from the
+board, so a code needs no more than the kind field to be played, and codes stay comparable
+across the transposition table, killer slots and book files. 0 (a1 to a1) is never a legal
+move and stands for "no move".
+
+Lists of moves live in array('H') buffers. new_move_buffer() makes one large enough for any
+position, to be filled in place by legal_moves.fill_legal_moves and reused from node to node.
+"""
+from array import array
+
+from chess_insights.game.position import PIECES_BY_COLOR, Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType, Color, ColorChessPiece
+from chess_insights.util.enum_square import Square
+
+Move = tuple[int, int, ColorChessPiece | None]
+
+NO_MOVE = 0
+MAX_MOVES = 256  # more than any legal position has (the record is 218)
+SQUARE_MASK = 0x3F
+TARGET_SHIFT = 6
+KIND_SHIFT = 12
+
+PROMOTION_CODES = {ChessPieceType.QUEEN: 1, ChessPieceType.ROOK: 2, ChessPieceType.BISHOP: 3,
+                   ChessPieceType.KNIGHT: 4}
+PROMOTIONS_BY_CODE = {code: piece_type for piece_type, code in PROMOTION_CODES.items()}
+QUEEN_PROMOTION = PROMOTION_CODES[ChessPieceType.QUEEN]
+# Promotion piece by kind, per color; index 0 is the ordinary move
+PROMOTION_PIECES = {
+    color: (None,) + tuple(PIECES_BY_COLOR[color][PROMOTIONS_BY_CODE[code]] for code in range(1, 5))
+    for color in (Color.WHITE, Color.BLACK)
+}
+
+
+def pack_move(origin: int, target: int, kind: int = 0) -> int:
+    return origin | target << TARGET_SHIFT | kind << KIND_SHIFT
+
+
+def encode_move(move: Move) -> int:
+    """Pack an (origin, target, promotion) tuple."""
+    origin, target, promotion = move
+    return pack_move(origin, target, PROMOTION_CODES[promotion.piece_type] if promotion else 0)
+
+
+def decode_move(position: Position, code: int) -> Move:
+    """Inverse of encode_move; a promotion piece takes the color of the side to move."""
+    return (code & SQUARE_MASK, code >> TARGET_SHIFT & SQUARE_MASK,
+            PROMOTION_PIECES[position.color_to_move][code >> KIND_SHIFT])
+
+
+def make_move(position: Position, code: int) -> None:
+    """Play a packed move on position."""
+    position.make_move(code & SQUARE_MASK, code >> TARGET_SHIFT & SQUARE_MASK,
+                       PROMOTION_PIECES[position.color_to_move][code >> KIND_SHIFT])
+
+
+def new_move_buffer() -> array:
+    return array('H', bytes(2 * MAX_MOVES))
+
+
+def move_to_string(code: int) -> str:
+    """Coordinate notation: e2e4, a7a8q."""
+    kind = code >> KIND_SHIFT
+    return (Square(code & SQUARE_MASK).name + Square(code >> TARGET_SHIFT & SQUARE_MASK).name +
+            ("qrbn"[kind - 1] if kind else ""))
@@ -0,0 +1,183 @@
+"""
+Opening book: PGN collections compiled into a sorted binary file that is memory-mapped and
+binary-searched, so looking up a position costs a few page reads and no parsing at load time.
+Build one with `opening-book games.pgn -o book.bin` (or
+`python -m chess_insights.engine.opening_book`).
+
+The layout follows Polyglot: 16-byte big-endian entries of Zobrist key (8 bytes), move (2),
+weight (2) and a reserved learn field (4), sorted by key and then by falling weight. Keys are
+this engine's Zobrist hashes and moves its 16-bit codes, so the files are not interchangeable
+with Polyglot books.
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+from collections import defaultdict
+from typing import Iterable, NamedTuple
+
+from chess_insights.engine.legal_moves import get_legal_targets
+from chess_insights.engine.moves import Move, decode_move, make_move
+from chess_insights.game.position import PROMOTION_RANKS, Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType
+from chess_insights.util.pgn import parse_san, read_pgn_games
+
+ENTRY = struct.Struct(">QHHI")
+KEY = struct.Struct(">Q")
+MAX_WEIGHT = 0xFFFF
+# Points per game for the side that played the move, by result from its point of view
+RESULT_POINTS = {"win": 2, "draw": 1, "loss": 0, "unknown": 1}
+
+
+class BookEntry(NamedTuple):
+    key: int
+    move: int
+    weight: int
+
+
+def build_book(pgn_texts: Iterable[str], max_plies: int = 20) -> list[BookEntry]:
+    """
+    Collect the moves of the first max_plies of every game, weighted by how well they scored:
+    two points for a win, one for a draw or an unknown result. Moves that only ever lost are
+    left out. A game stops contributing at its first illegal or ambiguous move.
+    """
+    weights = defaultdict(int)
+    for text in pgn_texts:
+        for game in read_pgn_games(text):
+            position = Position.from_fen(game.tags["FEN"]) if "FEN" in game.tags else \
+                Position.from_fen()
+            for san in game.moves[:max_plies]:
+                try:
+                    code = parse_san(position, san)
+                except ValueError:
+                    break
+                points = RESULT_POINTS[_result_for(game.result, position.is_whites_turn)]
+                weights[position.hash, code] += points
+                make_move(position, code)
+
+    entries = [BookEntry(key, move, min(weight, MAX_WEIGHT))
+               for (key, move), weight in weights.items() if weight]
+    entries.sort(key=lambda entry: (entry.key, -entry.weight, entry.move))
+    return entries
+
+
+def write_book(entries: list[BookEntry], path: str) -> None:
+    with open(path, "wb") as file:
+        for entry in entries:
+            file.write(ENTRY.pack(entry.key, entry.move, entry.weight, 0))
+
+
+class OpeningBook:
+    """
+    Read-only view of a book file. The file is memory-mapped, never read in whole; lookups
+    binary-search the sorted keys. Use as a context manager or call close().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size % ENTRY.size:
+            self._file.close()
+            raise ValueError(f"{path} is not an opening book: size is not a multiple of "
+                             f"{ENTRY.size} bytes.")
+        self.entry_count = size // ENTRY.size
+        # An empty file cannot be mapped, and has nothing to find anyway
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.entry_count
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def entries(self, key: int) -> list[BookEntry]:
+        """All entries for key, heaviest first."""
+        book = self._map
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(book, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        entries = []
+        for index in range(low, self.entry_count):
+            entry_key, move, weight, _ = ENTRY.unpack_from(book, index * ENTRY.size)
+            if entry_key != key:
+                break
+            entries.append(BookEntry(entry_key, move, weight))
+        return entries
+
+    def choose_move(self, position: Position, rng: random.Random = None) -> Move | None:
+        """
+        A legal book move for position, or None when it is out of book. Without rng the
+        heaviest move is taken; with one, moves are drawn in proportion to their weights.
+        """
+        candidates = [entry for entry in self.entries(position.hash)
+                      if _is_legal(position, entry.move)]
+        if not candidates:
+            return None
+        if rng is None:
+            entry = candidates[0]
+        else:
+            entry = rng.choices(candidates, weights=[entry.weight for entry in candidates])[0]
+        return decode_move(position, entry.move)
+
+
+def _is_legal(position: Position, code: int) -> bool:
+    """Guard against stale books and key collisions before a book move is played."""
+    origin, target, promotion = decode_move(position, code)
+    piece = position.piece_on(origin)
+    if piece is None or piece.color != position.color_to_move:
+        return False
+    if not get_legal_targets(position, origin) & (1 << target):
+        return False
+    is_promotion = (piece.piece_type == ChessPieceType.PAWN and
+                    (1 << target) & PROMOTION_RANKS[piece.color])
+    return bool(promotion) == bool(is_promotion)
+
+
+def _result_for(result: str, is_whites_turn: bool) -> str:
+    if result == "1/2-1/2":
+        return "draw"
+    if result not in ("1-0", "0-1"):
+        return "unknown"
+    return "win" if (result == "1-0") == is_whites_turn else "loss"
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile PGN files into an opening book.")
+    parser.add_argument("pgn_paths", nargs="+", metavar="PGN")
+    parser.add_argument("-o", "--output", required=True, help="book file to write")
+    parser.add_argument("--max-plies", type=int, default=20,
+                        help="moves past this ply of each game are left out")
+    args = parser.parse_args(argv)
+    if args.max_plies < 1:
+        parser.error("--max-plies must be at least 1")
+
+    def read_texts():
+        for path in args.pgn_paths:
+            with open(path, encoding="utf-8", errors="replace") as file:
+                yield file.read()
+
+    entries = build_book(read_texts(), args.max_plies)
+    write_book(entries, args.output)
+    print(f"{len(entries)} entries for {len({entry.key for entry in entries})} positions "
+          f"written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Process pool helpers for work that is independent per position. Positions travel to the workers
+as FEN strings and moves come back as 16-bit codes in array('H') buffers, so only short strings
+and raw bytes are pickled between processes, never BoardState or Position objects.
+"""
+import os
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from chess_insights.engine.legal_moves import generate_legal_codes
+from chess_insights.game.position import Position
+
+TASKS_PER_WORKER = 4  # finer splits even out tasks of very different sizes
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def legal_moves_batch(fens: list[str],
+                      workers: int = None,
+                      executor: Executor = None
+                      ) -> list[array]:
+    """
+    Encoded legal moves of every position in fens, in order; decode them with
+    moves.decode_move. Positions are handed out in chunks, and with one worker and no
+    executor everything runs in this process. Pass an executor to reuse one pool across batches.
+    """
+    workers = workers or default_workers()
+    if workers == 1 and executor is None:
+        return _legal_moves_task(fens)
+    chunk_size = max(1, -(-len(fens) // (workers * TASKS_PER_WORKER)))
+    chunks = [fens[start:start + chunk_size] for start in range(0, len(fens), chunk_size)]
+    if executor is not None:
+        return [moves for chunk in executor.map(_legal_moves_task, chunks) for moves in chunk]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [moves for chunk in pool.map(_legal_moves_task, chunks) for moves in chunk]
+
+
+def _legal_moves_task(fens: list[str]) -> list[array]:
+    return [generate_legal_codes(Position.from_fen(fen)) for fen in fens]
@@ -0,0 +1,246 @@
+"""
+Perft: count the leaf nodes of the legal move tree to a fixed depth and compare them with the
+published reference counts. Run with `perft --depth 4` (or `python -m chess_insights.engine.perft`);
+`--json results.json` records node counts and speed so move generation can be tracked across
+releases, and `--workers N` counts the subtrees in N processes.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from chess_insights.engine.legal_moves import fill_legal_moves, generate_legal_codes, \
+    generate_legal_targets
+from chess_insights.engine.moves import KIND_SHIFT, PROMOTION_PIECES, SQUARE_MASK, \
+    TARGET_SHIFT, make_move, move_to_string, new_move_buffer
+from chess_insights.engine.parallel import TASKS_PER_WORKER, default_workers
+from chess_insights.game.position import PROMOTION_RANKS, Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType
+
+
+class PerftPosition(NamedTuple):
+    name: str
+    fen: str
+    node_counts: tuple[int, ...]  # expected leaf nodes at depth 1, 2, ...
+
+
+REFERENCE_POSITIONS = (
+    PerftPosition("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+                  (20, 400, 8902, 197281, 4865609, 119060324)),
+    PerftPosition("kiwipete",
+                  "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                  (48, 2039, 97862, 4085603, 193690690)),
+    PerftPosition("position_3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+                  (14, 191, 2812, 43238, 674624, 11030083)),
+    PerftPosition("position_4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+                  (6, 264, 9467, 422333, 15833292)),
+    PerftPosition("position_5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+                  (44, 1486, 62379, 2103487, 89941194)),
+    PerftPosition("position_6",
+                  "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+                  (46, 2079, 89890, 3894594, 164075551)),
+)
+POSITIONS_BY_NAME = {position.name: position for position in REFERENCE_POSITIONS}
+
+
+def perft(position: Position, depth: int) -> int:
+    """Leaf nodes of the legal move tree below position. The last ply is counted from the
+    target bitboards without playing the moves."""
+    return _perft(position, depth, [new_move_buffer() for _ in range(depth)])
+
+
+def _perft(position: Position, depth: int, buffers: list) -> int:
+    """perft with one move buffer per remaining depth, reused by every node at that depth."""
+    if depth <= 0:
+        return 1
+    if depth == 1:
+        promotion_rank = PROMOTION_RANKS[position.color_to_move]
+        nodes = 0
+        for _, targets, piece in generate_legal_targets(position):
+            nodes += targets.bit_count()
+            if piece.piece_type == ChessPieceType.PAWN:
+                # Three more for the under-promotions of every promoting move
+                nodes += 3 * (targets & promotion_rank).bit_count()
+        return nodes
+    buffer = buffers[depth - 1]
+    promotions = PROMOTION_PIECES[position.color_to_move]
+    nodes = 0
+    for index in range(fill_legal_moves(position, buffer)):
+        code = buffer[index]
+        position.make_move(code & SQUARE_MASK, code >> TARGET_SHIFT & SQUARE_MASK,
+                           promotions[code >> KIND_SHIFT])
+        nodes += _perft(position, depth - 1, buffers)
+        position.unmake_move()
+    return nodes
+
+
+def divide(position: Position, depth: int) -> dict[str, int]:
+    """Perft split by root move, keyed in coordinate notation (e2e4, a7a8q)."""
+    counts = {}
+    for code in generate_legal_codes(position):
+        make_move(position, code)
+        counts[move_to_string(code)] = perft(position, depth - 1)
+        position.unmake_move()
+    return counts
+
+
+def parallel_divide(fen: str, depth: int, workers: int = None) -> dict[str, int]:
+    """
+    divide with the subtrees counted in a process pool. Root moves are extended a ply at a time
+    until there are enough move prefixes to keep every worker busy; each worker rebuilds the
+    position from fen and plays its prefix.
+    """
+    if depth < 1:
+        raise ValueError("Depth must be at least 1.")
+    workers = workers or default_workers()
+    position = Position.from_fen(fen)
+    root_names = {code: move_to_string(code) for code in generate_legal_codes(position)}
+    counts = dict.fromkeys(root_names.values(), 0)
+    tasks = _split_tasks(position, depth, workers * TASKS_PER_WORKER if workers > 1 else 1)
+    if not tasks:
+        return counts
+
+    prefixes, depths = zip(*tasks)
+    if workers == 1:
+        leaves = list(map(_perft_task, [fen] * len(tasks), prefixes, depths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            leaves = list(executor.map(_perft_task, [fen] * len(tasks), prefixes, depths))
+    for prefix, nodes in zip(prefixes, leaves):
+        counts[root_names[prefix[0]]] += nodes
+    return counts
+
+
+def _split_tasks(position: Position,
+                 depth: int,
+                 min_tasks: int
+                 ) -> list[tuple[tuple[int, ...], int]]:
+    """Encoded move prefixes, each with the depth left below it, lengthened ply by ply until
+    there are at least min_tasks of them or only the last ply is left."""
+    tasks = [((code,), depth - 1) for code in generate_legal_codes(position)]
+    while tasks and len(tasks) < min_tasks and tasks[0][1] > 1:
+        expanded = []
+        for prefix, remaining in tasks:
+            for code in prefix:
+                make_move(position, code)
+            expanded.extend((prefix + (code,), remaining - 1)
+                            for code in generate_legal_codes(position))
+            for _ in prefix:
+                position.unmake_move()
+        tasks = expanded
+    return tasks
+
+
+def _perft_task(fen: str, prefix: tuple[int, ...], depth: int) -> int:
+    position = Position.from_fen(fen)
+    for code in prefix:
+        make_move(position, code)
+    return perft(position, depth)
+
+
+def run_position(name: str,
+                 fen: str,
+                 depth: int,
+                 expected: int | None = None,
+                 with_divide: bool = False,
+                 workers: int = 1
+                 ) -> dict:
+    position = Position.from_fen(fen)
+    start = time.perf_counter()
+    if workers != 1:
+        split = parallel_divide(fen, depth, workers)
+        nodes = sum(split.values())
+    elif with_divide:
+        split = divide(position, depth)
+        nodes = sum(split.values())
+    else:
+        split = None
+        nodes = perft(position, depth)
+    if not with_divide:
+        split = None
+    seconds = time.perf_counter() - start
+    result = {
+        "name": name,
+        "fen": fen,
+        "depth": depth,
+        "workers": workers,
+        "nodes": nodes,
+        "expected": expected,
+        "passed": None if expected is None else nodes == expected,
+        "seconds": round(seconds, 6),
+        "nodes_per_second": round(nodes / seconds) if seconds else None,
+    }
+    if split is not None:
+        result["divide"] = split
+    return result
+
+
+def run_suite(depth: int,
+              names: list[str] = None,
+              with_divide: bool = False,
+              workers: int = 1
+              ) -> list[dict]:
+    """Run the reference positions (all, or those named) to depth, capped at the deepest
+    published count for each."""
+    results = []
+    for name in names or POSITIONS_BY_NAME:
+        if name not in POSITIONS_BY_NAME:
+            raise ValueError(f"Unknown perft position {name}. "
+                             f"Choose from {', '.join(POSITIONS_BY_NAME)}.")
+        reference = POSITIONS_BY_NAME[name]
+        position_depth = min(depth, len(reference.node_counts))
+        results.append(run_position(name, reference.fen, position_depth,
+                                    reference.node_counts[position_depth - 1], with_divide,
+                                    workers))
+    return results
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Count legal move tree leaves (perft).")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--position", action="append", dest="positions",
+                        choices=list(POSITIONS_BY_NAME),
+                        help="reference position to run; repeat for several (default: all)")
+    parser.add_argument("--fen", help="run this position instead of the reference positions")
+    parser.add_argument("--divide", action="store_true", help="report node counts per root move")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to count subtrees in; 0 for one per CPU")
+    parser.add_argument("--json", dest="json_path",
+                        help="write the results as JSON to this file, or - for stdout")
+    args = parser.parse_args(argv)
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+    if args.workers < 0:
+        parser.error("--workers must not be negative")
+    workers = args.workers or default_workers()
+
+    if args.fen:
+        results = [run_position("fen", args.fen, args.depth, with_divide=args.divide,
+                                workers=workers)]
+    else:
+        results = run_suite(args.depth, args.positions, args.divide, workers)
+
+    report = {"depth": args.depth, "results": results,
+              "total_nodes": sum(result["nodes"] for result in results),
+              "total_seconds": round(sum(result["seconds"] for result in results), 6)}
+    if args.json_path == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        for result in results:
+            status = {True: "ok", False: "MISMATCH", None: ""}[result["passed"]]
+            print(f"{result['name']:<12} depth {result['depth']} {result['nodes']:>12} nodes "
+                  f"{result['seconds']:>9.3f}s {result['nodes_per_second'] or 0:>10} nps {status}")
+            for move, count in (result.get("divide") or {}).items():
+                print(f"    {move}: {count}")
+        if args.json_path:
+            with open(args.json_path, "w") as file:
+                json.dump(report, file, indent=2)
+
+    return 0 if all(result["passed"] is not False for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+from chess_insights.util.enum_chess_piece_type import ChessPieceType, Color, ColorChessPiece
+
+# Material in centipawns for the middlegame and the endgame
+MG_VALUES = {
+    ChessPieceType.PAWN: 100,
+    ChessPieceType.KNIGHT: 320,
+    ChessPieceType.BISHOP: 330,
+    ChessPieceType.ROOK: 500,
+    ChessPieceType.QUEEN: 900,
+    ChessPieceType.KING: 0,
+}
+EG_VALUES = {
+    ChessPieceType.PAWN: 120,
+    ChessPieceType.KNIGHT: 300,
+    ChessPieceType.BISHOP: 320,
+    ChessPieceType.ROOK: 530,
+    ChessPieceType.QUEEN: 940,
+    ChessPieceType.KING: 0,
+}
+
+# Game phase: the sum of these over the board, 24 with all minor and major pieces present
+PHASE_WEIGHTS = {
+    ChessPieceType.PAWN: 0,
+    ChessPieceType.KNIGHT: 1,
+    ChessPieceType.BISHOP: 1,
+    ChessPieceType.ROOK: 2,
+    ChessPieceType.QUEEN: 4,
+    ChessPieceType.KING: 0,
+}
+MAX_PHASE = 24
+
+# Positional bonuses from white's point of view, laid out as seen from white: the first row is
+# rank 8, the last row rank 1. Black uses the same tables flipped vertically.
+_PAWN = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+_PAWN_ENDGAME = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    80, 80, 80, 80, 80, 80, 80, 80,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    30, 30, 30, 30, 30, 30, 30, 30,
+    20, 20, 20, 20, 20, 20, 20, 20,
+    10, 10, 10, 10, 10, 10, 10, 10,
+    5, 5, 5, 5, 5, 5, 5, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+_KNIGHT = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+_BISHOP = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+_ROOK = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+)
+_QUEEN = (
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+)
+_KING = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+)
+_KING_ENDGAME = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+
+_MG_BONUSES = {
+    ChessPieceType.PAWN: _PAWN,
+    ChessPieceType.KNIGHT: _KNIGHT,
+    ChessPieceType.BISHOP: _BISHOP,
+    ChessPieceType.ROOK: _ROOK,
+    ChessPieceType.QUEEN: _QUEEN,
+    ChessPieceType.KING: _KING,
+}
+_EG_BONUSES = {**_MG_BONUSES, ChessPieceType.PAWN: _PAWN_ENDGAME,
+               ChessPieceType.KING: _KING_ENDGAME}
+
+
+def _build_tables(values: dict[ChessPieceType, int],
+                  bonuses: dict[ChessPieceType, tuple[int, ...]]
+                  ) -> dict[ColorChessPiece, tuple[int, ...]]:
+    """Material plus bonus per square, indexed a1 = 0, and negated for black."""
+    tables = {}
+    for piece in ColorChessPiece:
+        if piece.piece_type == ChessPieceType.ANY:
+            continue
+        value, bonus = values[piece.piece_type], bonuses[piece.piece_type]
+        if piece.color == Color.WHITE:
+            tables[piece] = tuple(value + bonus[square ^ 56] for square in range(64))
+        else:
+            tables[piece] = tuple(-(value + bonus[square]) for square in range(64))
+    return tables
+
+
+# Signed so that a position's totals are simply white minus black
+MG_TABLES = _build_tables(MG_VALUES, _MG_BONUSES)
+EG_TABLES = _build_tables(EG_VALUES, _EG_BONUSES)
+PIECE_PHASES = {piece: PHASE_WEIGHTS[piece.piece_type] for piece in MG_TABLES}
+
+
+def compute_scores(piece_boards: dict[ColorChessPiece, int]) -> tuple[int, int, int]:
+    """Compute (middlegame score, endgame score, phase) from scratch; positions keep theirs
+    up to date incrementally."""
+    mg_score = eg_score = phase = 0
+    for piece, mg_table in MG_TABLES.items():
+        eg_table = EG_TABLES[piece]
+        board = piece_boards[piece]
+        while board:
+            square = (board & -board).bit_length() - 1
+            board &= board - 1
+            mg_score += mg_table[square]
+            eg_score += eg_table[square]
+            phase += PIECE_PHASES[piece]
+    return mg_score, eg_score, phase
@@ -0,0 +1,312 @@
+import time
+from typing import NamedTuple
+
+from chess_insights.engine.bitbases import Bitbases, Outcome
+from chess_insights.engine.evaluation import PIECE_VALUES, evaluate
+from chess_insights.engine.legal_moves import generate_legal_codes
+from chess_insights.engine.move_ordering import MoveOrdering
+from chess_insights.engine.move_picker import MovePicker, Stage
+from chess_insights.engine.moves import KIND_SHIFT, SQUARE_MASK, TARGET_SHIFT, Move, \
+    decode_move, make_move
+from chess_insights.engine.transposition_table import Bound, TranspositionTable
+from chess_insights.game.position import ALL_PIECES, BLACK_OFFSET, PAWN, WHITE_OFFSET, Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType
+
+INFINITY = 32000
+MATE_SCORE = 30000
+MAX_PLY = 128
+# Mate scores within MAX_PLY of MATE_SCORE are stored relative to the node, not the root
+MATE_BOUND = MATE_SCORE - MAX_PLY
+# Bitbase wins score this much plus the evaluation, which keeps the search making progress
+# toward the win; well below MATE_BOUND so found mates still outrank them
+KNOWN_WIN_SCORE = 10000
+FIFTY_MOVE_PLIES = 50  # fifty_move_rule is counted like ChessBoard.check_game_status does
+LIMIT_CHECK_INTERVAL = 64  # nodes between deadline checks
+# Largest swing a capture can bring beyond the captured piece's value, for delta pruning
+DELTA_MARGIN = 200
+
+
+class SearchTimeout(Exception):
+    """Raised inside the tree when the deadline or node budget is exhausted."""
+
+
+class SearchLimits(NamedTuple):
+    time_limit_ms: float | None = 200
+    max_nodes: int | None = None
+    max_depth: int = 64
+
+
+class SearchResult(NamedTuple):
+    move: Move | None  # decoded, promotion included, as Engine.generate_move hands it on
+    score: int
+    depth: int
+    nodes: int
+    elapsed_ms: float
+
+
+def score_to_tt(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def _material(position: Position) -> tuple[int, int]:
+    """Counts of all pieces and of pawns; a capture lowers the first, a promotion the second."""
+    boards = position.boards
+    return (boards[ALL_PIECES].bit_count(),
+            (boards[WHITE_OFFSET + PAWN] | boards[BLACK_OFFSET + PAWN]).bit_count())
+
+
+class Searcher:
+    """
+    Negamax alpha-beta with principal variation search and iterative deepening. Each iteration
+    starts from the best move of the previous one; when the deadline or node budget runs out
+    mid-iteration the tree is unwound and the best move found so far is returned. With bitbases,
+    positions below the root that they cover are scored from the tables instead of searched,
+    once a capture or promotion has changed the material; until then the search itself has to
+    find the mate the tables only promise.
+    """
+
+    def __init__(self,
+                 position: Position,
+                 transposition_table: TranspositionTable = None,
+                 move_ordering: MoveOrdering = None,
+                 bitbases: Bitbases = None
+                 ):
+        self.position = position
+        self.transposition_table = transposition_table or TranspositionTable(size_mb=1)
+        self.move_ordering = move_ordering or MoveOrdering()
+        self.bitbases = bitbases
+        self.nodes = 0
+        self._deadline = None
+        self._max_nodes = None
+        self._root_material = (0, 0)
+
+    def search(self, limits: SearchLimits = SearchLimits(), start_depth: int = 1) -> SearchResult:
+        """Search to successively deeper depths, from start_depth on, until a limit is hit."""
+        position = self.position
+        start = time.perf_counter()
+        self._deadline = (start + limits.time_limit_ms / 1000
+                          if limits.time_limit_ms is not None else None)
+        self._max_nodes = limits.max_nodes
+        self._root_material = _material(position)
+        self.nodes = 0
+        self.transposition_table.new_search()
+        self.move_ordering.age()
+
+        # Underpromotions are kept: move ordering tries them last, but a knight promotion can
+        # be the only mate or the only way out of stalemate
+        root_moves = list(generate_legal_codes(position))
+        if not root_moves:
+            return SearchResult(None, 0, 0, 0, (time.perf_counter() - start) * 1000)
+        entry = self.transposition_table.probe(position.hash)
+        root_moves = list(self.move_ordering.ordered_moves(position, root_moves,
+                                                           entry.move if entry else 0, 0))
+
+        best_move, best_score, completed_depth = root_moves[0], -INFINITY, 0
+        root_ply = position.ply
+        max_depth = min(limits.max_depth, MAX_PLY)
+        for depth in range(min(start_depth, max_depth), max_depth + 1):
+            try:
+                best_move, best_score = self._search_root(root_moves, depth)
+                completed_depth = depth
+            except SearchTimeout as timeout:
+                while position.ply > root_ply:
+                    position.unmake_move()
+                # The previous best is searched first, so any move that beat it is at least as good
+                if timeout.args:
+                    best_move, best_score = timeout.args
+                break
+            root_moves.remove(best_move)
+            root_moves.insert(0, best_move)
+            if abs(best_score) >= MATE_BOUND or self._past_soft_limit(start):
+                break
+
+        return SearchResult(decode_move(position, best_move), best_score, completed_depth,
+                            self.nodes, (time.perf_counter() - start) * 1000)
+
+    def _past_soft_limit(self, start: float) -> bool:
+        """Don't begin an iteration that can't finish: the next one usually costs several times
+        more than all earlier ones together."""
+        if self._deadline is None:
+            return False
+        now = time.perf_counter()
+        return now - start > (self._deadline - start) / 2
+
+    def _check_limits(self) -> None:
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchTimeout()
+        if self._max_nodes is not None and self.nodes >= self._max_nodes:
+            raise SearchTimeout()
+
+    def _search_root(self, moves: list[int], depth: int) -> tuple[int, int]:
+        position = self.position
+        alpha, beta = -INFINITY, INFINITY
+        best_move, best_score = moves[0], -INFINITY
+        for index, move in enumerate(moves):
+            try:
+                make_move(position, move)
+                if index == 0:
+                    score = -self._negamax(depth - 1, -beta, -alpha, 1)
+                else:
+                    score = -self._negamax(depth - 1, -alpha - 1, -alpha, 1)
+                    if alpha < score < beta:
+                        score = -self._negamax(depth - 1, -beta, -alpha, 1)
+                position.unmake_move()
+            except SearchTimeout:
+                if best_score > -INFINITY:
+                    raise SearchTimeout(best_move, best_score)
+                raise
+            if score > best_score:
+                best_move, best_score = move, score
+                alpha = max(alpha, score)
+        self.transposition_table.store(position.hash, best_move,
+                                       score_to_tt(best_score, 0), depth, Bound.EXACT)
+        return best_move, best_score
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if not self.nodes % LIMIT_CHECK_INTERVAL:
+            self._check_limits()
+
+        position = self.position
+        if position.fifty_move_rule >= FIFTY_MOVE_PLIES or position.repetition_count() > 1:
+            return 0
+        if ply >= MAX_PLY:
+            return evaluate(position)
+        if self.bitbases is not None:
+            score = self._probe_bitbases()
+            if score is not None:
+                return score
+
+        table = self.transposition_table
+        entry = table.probe(position.hash)
+        tt_move = 0
+        if entry:
+            tt_move = entry.move
+            if entry.depth >= depth:
+                score = score_from_tt(entry.score, ply)
+                if (entry.bound == Bound.EXACT or
+                        entry.bound == Bound.LOWER and score >= beta or
+                        entry.bound == Bound.UPPER and score <= alpha):
+                    return score
+
+        if depth <= 0:
+            return self._quiescence(alpha, beta, ply)
+        picker = MovePicker(position, self.move_ordering, tt_move, ply)
+        if not picker.has_moves():
+            return -MATE_SCORE + ply if position.is_in_check() else 0
+
+        original_alpha = alpha
+        best_score, best_move = -INFINITY, 0
+        for index, move in enumerate(picker):
+            make_move(position, move)
+            if index == 0:
+                score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            else:
+                score = -self._negamax(depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            position.unmake_move()
+
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if picker.is_quiet(move):
+                            self.move_ordering.update_quiet_cutoff(
+                                move, position.is_whites_turn, depth, ply)
+                        break
+
+        if best_score >= beta:
+            bound = Bound.LOWER
+        elif best_score > original_alpha:
+            bound = Bound.EXACT
+        else:
+            bound = Bound.UPPER
+        table.store(position.hash, best_move, score_to_tt(best_score, ply), depth, bound)
+        return best_score
+
+    def _probe_bitbases(self) -> int | None:
+        """
+        A known-win, loss or draw score for positions the bitbases cover. Positions with the
+        root's material are left to the search: a table win scores every move alike, so probing
+        them would never let the winning side deliver mate.
+        """
+        position = self.position
+        pieces, pawns = _material(position)
+        if pieces > self.bitbases.max_pieces:
+            return None
+        root_pieces, root_pawns = self._root_material
+        if pieces == root_pieces and pawns == root_pawns:
+            return None
+        outcome = self.bitbases.probe(position)
+        if outcome is None:
+            return None
+        if outcome == Outcome.DRAW:
+            return 0
+        known = KNOWN_WIN_SCORE if outcome == Outcome.WIN else -KNOWN_WIN_SCORE
+        return known + evaluate(position)
+
+    def _quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        """
+        Resolve captures and queen promotions past the horizon so the static evaluation is only
+        taken in quiet positions. The side to move may stand pat on the evaluation unless it is
+        in check, in which case every evasion is searched. Captures that cannot lift the score
+        to alpha even with a margin (delta pruning) or that lose material by SEE are skipped.
+        """
+        self.nodes += 1
+        if not self.nodes % LIMIT_CHECK_INTERVAL:
+            self._check_limits()
+
+        position = self.position
+        if ply >= MAX_PLY:
+            return evaluate(position)
+
+        in_check = position.is_in_check()
+        if in_check:
+            best_score = stand_pat = -INFINITY
+        else:
+            best_score = stand_pat = evaluate(position)
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+
+        picker = MovePicker(position, self.move_ordering, ply=ply, tactical_only=not in_check)
+        if in_check and not picker.has_moves():
+            return -MATE_SCORE + ply
+
+        for move in picker:
+            if not in_check:
+                if picker.stage == Stage.BAD_CAPTURES:
+                    break
+                victim = position.piece_on(move >> TARGET_SHIFT & SQUARE_MASK)
+                gain = PIECE_VALUES[victim.piece_type] if victim else PIECE_VALUES[
+                    ChessPieceType.PAWN]
+                if move >> KIND_SHIFT:
+                    gain += PIECE_VALUES[ChessPieceType.QUEEN] - PIECE_VALUES[ChessPieceType.PAWN]
+                if stand_pat + gain + DELTA_MARGIN <= alpha:
+                    continue
+
+            make_move(position, move)
+            score = -self._quiescence(-beta, -alpha, ply + 1)
+            position.unmake_move()
+
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
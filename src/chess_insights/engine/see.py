@@ -0,0 +1,99 @@
+from chess_insights.engine.attack_tables import KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS
+from chess_insights.engine.evaluation import PIECE_VALUES
+from chess_insights.engine.magic_bitboards import bishop_attacks, rook_attacks
+from chess_insights.engine.moves import KIND_SHIFT, PROMOTIONS_BY_CODE, SQUARE_MASK, TARGET_SHIFT
+from chess_insights.game.position import ALL_PIECES, BISHOP, BLACK_OFFSET, BLACK_PIECES, \
+    COLOR_OFFSETS, KING, KNIGHT, PAWN, QUEEN, ROOK, WHITE_PIECES, Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType, Color
+
+# The king can only take last, so its value just has to dwarf everything it could win
+SEE_VALUES = {**PIECE_VALUES, ChessPieceType.KING: 20000}
+# (slot offset, value) from the least valuable attacker up
+SEE_ORDER = tuple((offset, SEE_VALUES[piece_type]) for offset, piece_type in (
+    (PAWN, ChessPieceType.PAWN), (KNIGHT, ChessPieceType.KNIGHT), (BISHOP, ChessPieceType.BISHOP),
+    (ROOK, ChessPieceType.ROOK), (QUEEN, ChessPieceType.QUEEN), (KING, ChessPieceType.KING)))
+
+
+def attackers_to(boards: list[int],
+                 square: int,
+                 occupancy: int
+                 ) -> int:
+    """
+    Return the pieces of both colors attacking square, with sliders blocked by occupancy. boards
+    is indexed by slot, like Position.boards. Pieces lifted from occupancy but still on their
+    boards are included; mask with occupancy to drop them.
+    """
+    queens = boards[QUEEN] | boards[BLACK_OFFSET + QUEEN]
+    diagonal = boards[BISHOP] | boards[BLACK_OFFSET + BISHOP] | queens
+    orthogonal = boards[ROOK] | boards[BLACK_OFFSET + ROOK] | queens
+    knights = boards[KNIGHT] | boards[BLACK_OFFSET + KNIGHT]
+    kings = boards[KING] | boards[BLACK_OFFSET + KING]
+    return ((PAWN_ATTACKS[Color.BLACK][square] & boards[PAWN]) |
+            (PAWN_ATTACKS[Color.WHITE][square] & boards[BLACK_OFFSET + PAWN]) |
+            (KNIGHT_ATTACKS[square] & knights) |
+            (KING_ATTACKS[square] & kings) |
+            (bishop_attacks(square, occupancy) & diagonal) |
+            (rook_attacks(square, occupancy) & orthogonal))
+
+
+def static_exchange_evaluation(position: Position, move: int) -> int:
+    """
+    Material balance in centipawns, for the side making the packed move, of the capture
+    sequence on the target square when both sides always recapture with their least valuable
+    attacker and may stop whenever continuing would lose. Sliders behind a piece that captured join in (x-ray).
+    Pins and promotions by recapturing pawns are not considered.
+    """
+    origin, target = move & SQUARE_MASK, move >> TARGET_SHIFT & SQUARE_MASK
+    promotion = PROMOTIONS_BY_CODE.get(move >> KIND_SHIFT)
+    boards = position.boards
+    attacker = position.piece_on(origin)
+    victim = position.piece_on(target)
+    occupancy = boards[ALL_PIECES]
+    color = attacker.color
+
+    gains = [SEE_VALUES[victim.piece_type] if victim else 0]
+    if (victim is None and attacker.piece_type == ChessPieceType.PAWN and
+            1 << target == position.en_passant_square):
+        gains[0] = SEE_VALUES[ChessPieceType.PAWN]
+        occupancy ^= 1 << (target - 8 if color == Color.WHITE else target + 8)
+    attacker_value = SEE_VALUES[attacker.piece_type]
+    if promotion:
+        gains[0] += SEE_VALUES[promotion] - SEE_VALUES[ChessPieceType.PAWN]
+        attacker_value = SEE_VALUES[promotion]
+
+    queens = boards[QUEEN] | boards[BLACK_OFFSET + QUEEN]
+    diagonal = boards[BISHOP] | boards[BLACK_OFFSET + BISHOP] | queens
+    orthogonal = boards[ROOK] | boards[BLACK_OFFSET + ROOK] | queens
+    attackers = attackers_to(boards, target, occupancy)
+    from_bit = 1 << origin
+    side = color
+
+    while from_bit:
+        gains.append(attacker_value - gains[-1])
+        occupancy ^= from_bit
+        attackers = (attackers | (bishop_attacks(target, occupancy) & diagonal) |
+                     (rook_attacks(target, occupancy) & orthogonal)) & occupancy
+        side = side.opposite()
+        from_bit, attacker_value = _least_valuable_attacker(boards, attackers, side)
+
+    depth = len(gains) - 1
+    while depth > 1:
+        depth -= 1
+        gains[depth - 1] = -max(-gains[depth - 1], gains[depth])
+    return gains[0]
+
+
+def _least_valuable_attacker(boards: list[int],
+                             attackers: int,
+                             color: Color
+                             ) -> tuple[int, int]:
+    color_offset = COLOR_OFFSETS[color]
+    for offset, value in SEE_ORDER:
+        candidates = attackers & boards[color_offset + offset]
+        if candidates:
+            if (offset == KING and attackers &
+                    boards[BLACK_PIECES if color_offset == 0 else WHITE_PIECES]):
+                # The king cannot capture onto a square the other side still attacks
+                return 0, 0
+            return candidates & -candidates, value
+    return 0, 0
@@ -0,0 +1,250 @@
+from array import array
+from enum import Enum, IntEnum
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+ENTRY_WORDS = 2  # key word, data word
+BUCKET_SIZE = 2  # entries per bucket
+BUCKET_BYTES = BUCKET_SIZE * ENTRY_WORDS * 8
+GENERATION_CYCLE = 64
+
+MAX_SCORE = 32767
+MAX_DEPTH = 255
+
+# Data word layout, low to high: move (16 bits), score + 32768 (16), depth (8), bound (2),
+# generation (6). The score offset keeps every stored data word non-zero, so 0 marks an empty slot.
+_SCORE_SHIFT = 16
+_DEPTH_SHIFT = 32
+_BOUND_SHIFT = 40
+_GENERATION_SHIFT = 42
+
+_SHARED_HEADER_BYTES = 16  # generation, bucket count
+
+
+class Bound(IntEnum):
+    EXACT = 0
+    LOWER = 1  # failed high: score is at least this
+    UPPER = 2  # failed low: score is at most this
+
+
+class ReplacementPolicy(Enum):
+    # Evict the shallowest entry of the bucket, entries from earlier searches first
+    DEPTH_PREFERRED = "depth_preferred"
+    # The newest entry always goes in the first slot and the previous one moves to the second
+    ALWAYS_REPLACE = "always_replace"
+
+
+class TTEntry(NamedTuple):
+    move: int
+    score: int
+    depth: int
+    bound: Bound
+    generation: int
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by Zobrist hash. Entries live in one
+    preallocated array('Q') of two words each, so memory use is set by size_mb and never grows.
+
+    The key word is stored XORed with the data word. A torn write, where another writer changed
+    one of the two words in between, then fails the key check instead of returning mixed data.
+    """
+
+    def __init__(self,
+                 size_mb: float = 16,
+                 policy: ReplacementPolicy = ReplacementPolicy.DEPTH_PREFERRED,
+                 table: array = None
+                 ):
+        if table is None:
+            bucket_count = int(size_mb * 1024 * 1024) // BUCKET_BYTES
+            if bucket_count < 1:
+                raise ValueError(f"Transposition table of {size_mb} MB holds no entries.")
+            table = array('Q', bytes(bucket_count * BUCKET_BYTES))
+        elif len(table) % (BUCKET_SIZE * ENTRY_WORDS) or not len(table):
+            raise ValueError("Table length must be a positive multiple of the bucket size.")
+        self.table = table
+        self.bucket_count = len(table) // (BUCKET_SIZE * ENTRY_WORDS)
+        self.policy = policy
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.collisions = 0
+        self.filled = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.bucket_count * BUCKET_SIZE
+
+    @property
+    def size_bytes(self) -> int:
+        return self.bucket_count * BUCKET_BYTES
+
+    def new_search(self) -> None:
+        """Advance the generation so entries from earlier searches are replaced first."""
+        self.generation = (self.generation + 1) % GENERATION_CYCLE
+
+    def clear(self) -> None:
+        self.table[:] = array('Q', bytes(len(self.table) * 8))
+        self.generation = 0
+        self.filled = 0
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        """Zero the per-search counters; the fill count describes the table and is kept."""
+        self.probes = self.hits = self.stores = self.collisions = 0
+
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def fill_rate(self) -> float:
+        """Fraction of slots holding an entry, from any generation."""
+        return self.filled / self.capacity
+
+    def probe(self, key: int) -> TTEntry | None:
+        self.probes += 1
+        table = self.table
+        start = (key % self.bucket_count) * BUCKET_SIZE * ENTRY_WORDS
+        for index in range(start, start + BUCKET_SIZE * ENTRY_WORDS, ENTRY_WORDS):
+            data = table[index + 1]
+            if data and table[index] ^ data == key:
+                self.hits += 1
+                return _unpack(data)
+        return None
+
+    def store(self,
+              key: int,
+              move: int,
+              score: int,
+              depth: int,
+              bound: Bound
+              ) -> None:
+        """
+        Record a search result. When the position is already in the table and the new result
+        has no move, the stored move is kept, since it is still the best ordering hint.
+        """
+        table = self.table
+        start = (key % self.bucket_count) * BUCKET_SIZE * ENTRY_WORDS
+        self.stores += 1
+
+        for index in range(start, start + BUCKET_SIZE * ENTRY_WORDS, ENTRY_WORDS):
+            old_data = table[index + 1]
+            if old_data and table[index] ^ old_data == key:
+                if not move:
+                    move = old_data & 0xFFFF
+                self._write(index, key, move, score, depth, bound)
+                return
+
+        if self.policy == ReplacementPolicy.ALWAYS_REPLACE:
+            last = start + (BUCKET_SIZE - 1) * ENTRY_WORDS
+            if table[last + 1]:
+                if (table[last + 1] >> _GENERATION_SHIFT) == self.generation:
+                    self.collisions += 1
+            else:
+                self.filled += 1
+            table[start + ENTRY_WORDS:last + ENTRY_WORDS] = table[start:last]
+            self._write(start, key, move, score, depth, bound)
+            return
+
+        victim = start
+        lowest_value = None
+        for index in range(start, start + BUCKET_SIZE * ENTRY_WORDS, ENTRY_WORDS):
+            old_data = table[index + 1]
+            if not old_data:
+                victim = index
+                break
+            age = (self.generation - (old_data >> _GENERATION_SHIFT)) % GENERATION_CYCLE
+            value = ((old_data >> _DEPTH_SHIFT) & 0xFF) - 8 * age
+            if lowest_value is None or value < lowest_value:
+                lowest_value = value
+                victim = index
+
+        old_data = table[victim + 1]
+        if not old_data:
+            self.filled += 1
+        elif (old_data >> _GENERATION_SHIFT) == self.generation:
+            self.collisions += 1
+        self._write(victim, key, move, score, depth, bound)
+
+    def _write(self,
+               index: int,
+               key: int,
+               move: int,
+               score: int,
+               depth: int,
+               bound: Bound
+               ) -> None:
+        score = max(-MAX_SCORE, min(MAX_SCORE, score))
+        data = (move & 0xFFFF |
+                (score + 32768) << _SCORE_SHIFT |
+                min(max(depth, 0), MAX_DEPTH) << _DEPTH_SHIFT |
+                bound << _BOUND_SHIFT |
+                self.generation << _GENERATION_SHIFT)
+        self.table[index] = key ^ data
+        self.table[index + 1] = data
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Transposition table in a multiprocessing.shared_memory block, so that several search
+    processes read and write the same entries without locks; the XORed key words reject any
+    entry torn by concurrent writers. A header ahead of the entries holds the generation and
+    the bucket count.
+
+    The creating process owns the block: only its new_search advances the generation, and it
+    must unlink the block when done. Other processes attach by name and follow the owner's
+    generation. Counters are kept per process.
+    """
+
+    def __init__(self,
+                 size_mb: float = 16,
+                 policy: ReplacementPolicy = ReplacementPolicy.DEPTH_PREFERRED,
+                 name: str = None
+                 ):
+        if name is None:
+            bucket_count = int(size_mb * 1024 * 1024) // BUCKET_BYTES
+            if bucket_count < 1:
+                raise ValueError(f"Transposition table of {size_mb} MB holds no entries.")
+            self.memory = shared_memory.SharedMemory(
+                create=True, size=_SHARED_HEADER_BYTES + bucket_count * BUCKET_BYTES)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.is_owner = name is None
+        self._header = self.memory.buf[:_SHARED_HEADER_BYTES].cast('Q')
+        if self.is_owner:
+            self._header[1] = bucket_count
+        # Some platforms round the block up to whole pages, so the owner records the table size
+        end = _SHARED_HEADER_BYTES + self._header[1] * BUCKET_BYTES
+        super().__init__(policy=policy, table=self.memory.buf[_SHARED_HEADER_BYTES:end].cast('Q'))
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    @property
+    def generation(self) -> int:
+        return self._header[0]
+
+    @generation.setter
+    def generation(self, generation: int) -> None:
+        if self.is_owner:
+            self._header[0] = generation
+
+    def close(self) -> None:
+        """Detach from the block, and free it if this process created it."""
+        self.table.release()
+        self._header.release()
+        self.memory.close()
+        if self.is_owner:
+            self.memory.unlink()
+
+
+def _unpack(data: int) -> TTEntry:
+    return TTEntry(
+        move=data & 0xFFFF,
+        score=((data >> _SCORE_SHIFT) & 0xFFFF) - 32768,
+        depth=(data >> _DEPTH_SHIFT) & 0xFF,
+        bound=Bound((data >> _BOUND_SHIFT) & 0b11),
+        generation=data >> _GENERATION_SHIFT,
+    )
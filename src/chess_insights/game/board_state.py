@@ -13,6 +13,8 @@ class BoardState:
     fifty_move_rule: int
     move_number: int
     castling_rights: int
+    # What stands on each square, a1 = 0; None leaves it to be worked out from piece_locations
+    mailbox: tuple[ColorChessPiece | None, ...] | None = None
 
     def copy(self) -> "BoardState":
         """Manually create a copy of BoardState since MappingProxyType is immutable."""
@@ -1,40 +1,20 @@
-from chess_insights.engine.bitboard import BitBoard
-from chess_insights.util.enum_chess_piece_type import Color, ColorChessPiece, ChessPieceType
-from chess_insights.util.enum_square import Square, chebyshev_distance
-
-
-def update_castling_rights(castling_rights: int,
-                           piece_type: ColorChessPiece,
-                           square: int
-                           ) -> int:
-    """Update castling rights when the king or rook moves."""
-
-    if piece_type.piece_type == ChessPieceType.KING:
-        return castling_rights & (0b1100 if piece_type.color == Color.WHITE else 0b0011)
-
-    if piece_type.piece_type == ChessPieceType.ROOK:
-        rook_castling_map = {
-            Square['a1'].value: 0b1101,  # White queenside
-            Square['h1'].value: 0b1110,  # White kingside
-            Square['a8'].value: 0b0111,  # Black queenside
-            Square['h8'].value: 0b1011  # Black kingside
-        }
-        return castling_rights & rook_castling_map.get(square, castling_rights)
-
-    return castling_rights
-
-
-def handle_castling(piece_type: ColorChessPiece,
-                    origin_square: int,
-                    target_square: int,
-                    new_piece_locations: dict
-                    ) -> None:
-    """Move the rook when castling."""
-    if piece_type.piece_type == ChessPieceType.KING and chebyshev_distance(origin_square,
-                                                                           target_square) > 1:
-        rook, rook_target, rook_origin = get_castling_rook_squares(target_square)
-        new_piece_locations[rook].set_bit(rook_target)
-        new_piece_locations[rook].clear_bit(rook_origin)
+from chess_insights.engine.bitboard import BitBoard, flip_vertical
+from chess_insights.util.enum_chess_piece_type import Color, ColorChessPiece
+from chess_insights.util.enum_square import Square
+
+# Castling rights kept when a move starts or ends on a square.
+# Bits: 0b0001 white kingside, 0b0010 white queenside, 0b0100 black kingside, 0b1000 black queenside.
+CASTLING_RIGHTS_MASKS: tuple[int, ...] = tuple(
+    {
+        Square.a1.value: 0b1101,
+        Square.e1.value: 0b1100,
+        Square.h1.value: 0b1110,
+        Square.a8.value: 0b0111,
+        Square.e8.value: 0b0011,
+        Square.h8.value: 0b1011,
+    }.get(square, 0b1111)
+    for square in range(64)
+)
 
 
 def get_castling_rook_squares(target_square: int
@@ -66,19 +46,20 @@ def get_castling_moves(color: Color,
         castling_rights &= 0b0011
         enemy_attacks = enemy_attacks_board.board
         collisions = collisions_board.board
-        return __get_castle_moves(castling_rights, enemy_attacks, collisions)
+        return BitBoard(__get_castle_moves(castling_rights, enemy_attacks, collisions))
 
     elif color == Color.BLACK:
         castling_rights = castling_rights >> 2
-        enemy_attacks = enemy_attacks_board.mirror_vertical().board
-        collisions = collisions_board.mirror_vertical().board
-        return __get_castle_moves(castling_rights, enemy_attacks, collisions).mirror_vertical()
+        enemy_attacks = flip_vertical(enemy_attacks_board.board)
+        collisions = flip_vertical(collisions_board.board)
+        return BitBoard(flip_vertical(__get_castle_moves(castling_rights, enemy_attacks,
+                                                         collisions)))
 
 
 def __get_castle_moves(castling_rights: int,
                        enemy_attacks: int,
                        collisions: int
-                       ) -> BitBoard:
+                       ) -> int:
     """Determine if castling is legal based on attack squares and piece positions."""
 
     moves = 0
@@ -90,11 +71,11 @@ def __get_castle_moves(castling_rights: int,
 
     castle_short = (enemy_attacks & king_path_short == 0 and castling_rights & 0b01 == 0b01
                     and collisions & rook_path_short == 0)
-    castle_long = (enemy_attacks & king_path_long == 0 and castling_rights & 0b1 == 0b1
+    castle_long = (enemy_attacks & king_path_long == 0 and castling_rights & 0b10 == 0b10
                    and collisions & rook_path_long == 0)
     if castle_short:
         moves |= 64
     if castle_long:
         moves |= 4
 
-    return BitBoard(moves)
+    return moves
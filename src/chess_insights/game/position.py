@@ -0,0 +1,357 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Iterator, NamedTuple
+
+from chess_insights.engine.attack_tables import KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS
+from chess_insights.engine.bitboard import BitBoard, iter_squares
+from chess_insights.engine.magic_bitboards import bishop_attacks, rook_attacks
+from chess_insights.engine.piece_square_tables import EG_TABLES, MG_TABLES, PIECE_PHASES, \
+    compute_scores
+from chess_insights.game.board_state import BoardState
+from chess_insights.game.castling import CASTLING_RIGHTS_MASKS, get_castling_rook_squares
+from chess_insights.game.zobrist import BLACK_TO_MOVE_KEY, CASTLING_KEYS, PIECE_KEYS, \
+    compute_hash, get_en_passant_key
+from chess_insights.util.enum_chess_piece_type import PIECE_ORDER, ChessPieceType, Color, \
+    ColorChessPiece
+from chess_insights.util.fen import board_from_fen
+
+PIECES = PIECE_ORDER[:12]
+PIECES_BY_COLOR = {
+    color: {piece.piece_type: piece for piece in PIECES if piece.color == color}
+    for color in (Color.WHITE, Color.BLACK)
+}
+PIECE_GROUPS = {piece: piece.color.get_piece_group() for piece in PIECES}
+PROMOTION_RANKS = {Color.WHITE: 0xFF00000000000000, Color.BLACK: 0x00000000000000FF}
+# b1, d1, f1, h1, a2, c2 and so on: with a1 (a dark square) as bit 0 the first rank is 0xAA
+LIGHT_SQUARES = 0x55AA55AA55AA55AA
+
+# Slots of Position.boards, matching ColorChessPiece.index: a color's pieces by type from the
+# color's offset, then the occupancy of each color and of the whole board
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+WHITE_OFFSET, BLACK_OFFSET = 0, 6
+WHITE_PIECES, BLACK_PIECES, ALL_PIECES = 12, 13, 14
+COLOR_OFFSETS = {Color.WHITE: WHITE_OFFSET, Color.BLACK: BLACK_OFFSET}
+# Per-piece tables by slot, for the incremental updates of make_move
+_GROUP_SLOTS = tuple(PIECE_GROUPS[piece].index for piece in PIECES)
+_PIECE_KEYS = tuple(PIECE_KEYS[piece] for piece in PIECES)
+_MG_TABLES = tuple(MG_TABLES[piece] for piece in PIECES)
+_EG_TABLES = tuple(EG_TABLES[piece] for piece in PIECES)
+_PIECE_PHASES = tuple(PIECE_PHASES[piece] for piece in PIECES)
+# Pieces whose presence always leaves mating material on the board
+_MATING_SLOTS = tuple(offset + piece_type for offset in (WHITE_OFFSET, BLACK_OFFSET)
+                      for piece_type in (PAWN, ROOK, QUEEN))
+
+
+class PieceBoards(Mapping):
+    """
+    Live read-write view of Position.boards keyed by ColorChessPiece, for callers that work with
+    the enums. Engine code indexes Position.boards by slot instead.
+    """
+    __slots__ = ('_boards',)
+
+    def __init__(self, boards: list[int]):
+        self._boards = boards
+
+    def __getitem__(self, piece: ColorChessPiece) -> int:
+        return self._boards[piece.index]
+
+    def __setitem__(self, piece: ColorChessPiece, board: int) -> None:
+        self._boards[piece.index] = board
+
+    def __iter__(self) -> Iterator[ColorChessPiece]:
+        return iter(PIECE_ORDER)
+
+    def __len__(self) -> int:
+        return len(PIECE_ORDER)
+
+
+class UndoRecord(NamedTuple):
+    """Everything make_move overwrites that cannot be recomputed from the move itself."""
+    origin_square: int
+    target_square: int
+    piece: ColorChessPiece
+    captured_piece: ColorChessPiece | None
+    castling_rights: int
+    en_passant_square: int
+    fifty_move_rule: int
+    hash: int
+    hash_history: list[int] | None  # the window an irreversible move replaced, else None
+
+
+class Position:
+    """
+    Mutable counterpart of BoardState for search and validation. Moves are applied in place
+    with make_move and reverted with unmake_move, so walking a tree allocates no board copies.
+    Bitboards are plain ints; en_passant_square is a bitboard like in BoardState.
+
+    boards is a list of 15 bitboards indexed by slot (ColorChessPiece.index, or the PAWN..KING
+    offsets plus a color's offset), with the three occupancy boards kept in step by every piece
+    placed or removed. piece_boards is the same storage keyed by ColorChessPiece. mailbox is
+    the square-centric copy, the piece on each square or None, so piece_on is a single index.
+
+    hash is the Zobrist key of the position, updated incrementally. hash_history holds the keys
+    of the earlier positions that can still repeat, oldest first, and backs repetition
+    detection: only those since the last capture or pawn move, so never more than
+    fifty_move_rule of them. A capture or pawn move starts a new window.
+
+    mg_score and eg_score are the material plus piece-square totals, white minus black, for the
+    middlegame and the endgame, and phase measures the remaining non-pawn material. All three are
+    kept up to date by every piece placed or removed, so evaluation reads them in O(1).
+    """
+    __slots__ = ('boards', 'piece_boards', 'mailbox', 'is_whites_turn', 'en_passant_square', 'fifty_move_rule',
+                 'move_number', 'castling_rights', 'hash', 'hash_history', 'mg_score',
+                 'eg_score', 'phase', '_undo_stack')
+
+    def __init__(self,
+                 piece_boards: Mapping[ColorChessPiece, int],
+                 is_whites_turn: bool,
+                 en_passant_square: int,
+                 fifty_move_rule: int,
+                 move_number: int,
+                 castling_rights: int,
+                 hash_history: list[int] = None
+                 ):
+        self.boards = [piece_boards[piece] for piece in PIECE_ORDER]
+        self.piece_boards = PieceBoards(self.boards)
+        self.mailbox: list[ColorChessPiece | None] = [None] * 64
+        for piece, board in zip(PIECES, self.boards):
+            for square in iter_squares(board):
+                self.mailbox[square] = piece
+        self.is_whites_turn = is_whites_turn
+        self.en_passant_square = en_passant_square
+        self.fifty_move_rule = fifty_move_rule
+        self.move_number = move_number
+        self.castling_rights = castling_rights
+        self.hash = compute_hash(self.piece_boards, is_whites_turn, castling_rights,
+                                 en_passant_square)
+        self.hash_history = list(hash_history[-fifty_move_rule:]) if (
+            hash_history and fifty_move_rule) else []
+        self.mg_score, self.eg_score, self.phase = compute_scores(piece_boards)
+        self._undo_stack: list[UndoRecord] = []
+
+    @classmethod
+    def from_board_state(cls,
+                         board_state: BoardState,
+                         hash_history: list[int] = None
+                         ) -> "Position":
+        return cls(
+            piece_boards={piece: bitboard.board
+                          for piece, bitboard in board_state.piece_locations.items()},
+            is_whites_turn=board_state.is_whites_turn,
+            en_passant_square=board_state.en_passant_square.board,
+            fifty_move_rule=board_state.fifty_move_rule,
+            move_number=board_state.move_number,
+            castling_rights=board_state.castling_rights,
+            hash_history=hash_history,
+        )
+
+    @classmethod
+    def from_fen(cls,
+                 fen: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+                 hash_history: list[int] = None
+                 ) -> "Position":
+        return cls.from_board_state(board_from_fen(fen), hash_history)
+
+    def to_board_state(self) -> BoardState:
+        """Export an immutable snapshot of the current position."""
+        return BoardState(
+            piece_locations=MappingProxyType({
+                piece: BitBoard(board, piece) for piece, board in self.piece_boards.items()
+            }),
+            is_whites_turn=self.is_whites_turn,
+            en_passant_square=BitBoard(self.en_passant_square),
+            fifty_move_rule=self.fifty_move_rule,
+            move_number=self.move_number,
+            castling_rights=self.castling_rights,
+            mailbox=tuple(self.mailbox),
+        )
+
+    @property
+    def color_to_move(self) -> Color:
+        return Color.WHITE if self.is_whites_turn else Color.BLACK
+
+    @property
+    def ply(self) -> int:
+        """Number of moves made on this Position that can still be unmade."""
+        return len(self._undo_stack)
+
+    def repetition_count(self) -> int:
+        """
+        Times the current position has occurred, including now. Only positions since the last
+        capture or pawn move can repeat, so the scan is bounded by the fifty-move counter.
+        """
+        history = self.hash_history
+        count = 1
+        for plies_back in range(2, min(self.fifty_move_rule, len(history)) + 1, 2):
+            if history[-plies_back] == self.hash:
+                count += 1
+        return count
+
+    def is_threefold_repetition(self) -> bool:
+        return self.repetition_count() >= 3
+
+    def is_insufficient_material(self) -> bool:
+        """
+        Neither side can ever checkmate: bare kings, a single bishop or knight against a bare
+        king, or any number of bishops that all stand on squares of one color.
+        """
+        boards = self.boards
+        if any(boards[slot] for slot in _MATING_SLOTS):
+            return False
+        knights = boards[KNIGHT] | boards[BLACK_OFFSET + KNIGHT]
+        bishops = boards[BISHOP] | boards[BLACK_OFFSET + BISHOP]
+        if (knights | bishops).bit_count() <= 1:
+            return True
+        return not knights and (not bishops & LIGHT_SQUARES or not bishops & ~LIGHT_SQUARES)
+
+    def piece_on(self, square: int) -> ColorChessPiece | None:
+        return self.mailbox[square]
+
+    def king_square(self, color: Color) -> int:
+        return self.boards[COLOR_OFFSETS[color] + KING].bit_length() - 1
+
+    def is_square_attacked(self, square: int, by_color: Color) -> bool:
+        """Return True if any piece of by_color attacks square."""
+        boards = self.boards
+        offset = COLOR_OFFSETS[by_color]
+        if PAWN_ATTACKS[by_color.opposite()][square] & boards[offset + PAWN]:
+            return True
+        if KNIGHT_ATTACKS[square] & boards[offset + KNIGHT]:
+            return True
+        if KING_ATTACKS[square] & boards[offset + KING]:
+            return True
+        occupancy = boards[ALL_PIECES]
+        queens = boards[offset + QUEEN]
+        if bishop_attacks(square, occupancy) & (boards[offset + BISHOP] | queens):
+            return True
+        return bool(rook_attacks(square, occupancy) & (boards[offset + ROOK] | queens))
+
+    def is_in_check(self, color: Color = None) -> bool:
+        """Return True if color's king (default: the side to move) is attacked."""
+        color = color or self.color_to_move
+        king = self.boards[COLOR_OFFSETS[color] + KING]
+        return bool(king) and self.is_square_attacked(king.bit_length() - 1, color.opposite())
+
+    def make_move(self,
+                  origin_square: int,
+                  target_square: int,
+                  promotion: ColorChessPiece = None
+                  ) -> None:
+        """
+        Apply a pseudo-legal move in place. Castling, en passant and promotion are inferred from
+        the move; pawns reaching the last rank become queens unless promotion says otherwise.
+        """
+        piece = self.piece_on(origin_square)
+        if piece is None:
+            raise ValueError(f"No piece on square {origin_square} to move.")
+        color = piece.color
+        captured_piece = self.piece_on(target_square)
+        target_bit = 1 << target_square
+
+        is_irreversible = captured_piece is not None or piece.piece_type == ChessPieceType.PAWN
+        self._undo_stack.append(UndoRecord(
+            origin_square, target_square, piece, captured_piece, self.castling_rights,
+            self.en_passant_square, self.fifty_move_rule, self.hash,
+            self.hash_history if is_irreversible else None))
+        if is_irreversible:
+            # No earlier position can come back once a pawn has moved or material has gone
+            self.hash_history = []
+        else:
+            self.hash_history.append(self.hash)
+        self.hash ^= CASTLING_KEYS[self.castling_rights] ^ get_en_passant_key(
+            self.en_passant_square, self.boards, self.is_whites_turn)
+
+        fifty_move_rule = self.fifty_move_rule + 1
+        en_passant_square = 0
+        placed_piece = piece
+
+        if captured_piece:
+            self._remove_piece(captured_piece, target_square)
+            fifty_move_rule = 0
+
+        if piece.piece_type == ChessPieceType.PAWN:
+            fifty_move_rule = 0
+            if target_bit == self.en_passant_square:
+                captured_square = target_square - 8 if color == Color.WHITE else target_square + 8
+                self._remove_piece(PIECES_BY_COLOR[color.opposite()][ChessPieceType.PAWN],
+                                   captured_square)
+            elif abs(target_square - origin_square) == 16:
+                en_passant_square = 1 << ((origin_square + target_square) // 2)
+            elif target_bit & PROMOTION_RANKS[color]:
+                placed_piece = promotion or PIECES_BY_COLOR[color][ChessPieceType.QUEEN]
+        elif piece.piece_type == ChessPieceType.KING and abs(target_square - origin_square) == 2:
+            rook, rook_target, rook_origin = get_castling_rook_squares(target_square)
+            self._remove_piece(rook, rook_origin)
+            self._put_piece(rook, rook_target)
+
+        self._remove_piece(piece, origin_square)
+        self._put_piece(placed_piece, target_square)
+
+        self.castling_rights &= (CASTLING_RIGHTS_MASKS[origin_square] &
+                                 CASTLING_RIGHTS_MASKS[target_square])
+        self.en_passant_square = en_passant_square
+        self.fifty_move_rule = fifty_move_rule
+        if color == Color.WHITE:
+            self.move_number += 1
+        self.is_whites_turn = not self.is_whites_turn
+        self.hash ^= (BLACK_TO_MOVE_KEY ^ CASTLING_KEYS[self.castling_rights] ^
+                      get_en_passant_key(en_passant_square, self.boards, self.is_whites_turn))
+
+    def unmake_move(self) -> None:
+        """Revert the most recent make_move."""
+        undo = self._undo_stack.pop()
+        origin_square, target_square, piece = undo.origin_square, undo.target_square, undo.piece
+        color = piece.color
+
+        self.is_whites_turn = not self.is_whites_turn
+        if color == Color.WHITE:
+            self.move_number -= 1
+
+        self._remove_piece(self.piece_on(target_square), target_square)
+        self._put_piece(piece, origin_square)
+
+        if piece.piece_type == ChessPieceType.KING and abs(target_square - origin_square) == 2:
+            rook, rook_target, rook_origin = get_castling_rook_squares(target_square)
+            self._remove_piece(rook, rook_target)
+            self._put_piece(rook, rook_origin)
+
+        if undo.captured_piece:
+            self._put_piece(undo.captured_piece, target_square)
+        elif piece.piece_type == ChessPieceType.PAWN and 1 << target_square == undo.en_passant_square:
+            captured_square = target_square - 8 if color == Color.WHITE else target_square + 8
+            self._put_piece(PIECES_BY_COLOR[color.opposite()][ChessPieceType.PAWN], captured_square)
+
+        self.castling_rights = undo.castling_rights
+        self.en_passant_square = undo.en_passant_square
+        self.fifty_move_rule = undo.fifty_move_rule
+        self.hash = undo.hash
+        if undo.hash_history is None:
+            self.hash_history.pop()
+        else:
+            self.hash_history = undo.hash_history
+
+    def _put_piece(self, piece: ColorChessPiece, square: int) -> None:
+        slot = piece.index
+        bit = 1 << square
+        boards = self.boards
+        boards[slot] |= bit
+        boards[_GROUP_SLOTS[slot]] |= bit
+        boards[ALL_PIECES] |= bit
+        self.mailbox[square] = piece
+        self.hash ^= _PIECE_KEYS[slot][square]
+        self.mg_score += _MG_TABLES[slot][square]
+        self.eg_score += _EG_TABLES[slot][square]
+        self.phase += _PIECE_PHASES[slot]
+
+    def _remove_piece(self, piece: ColorChessPiece, square: int) -> None:
+        slot = piece.index
+        bit = 1 << square
+        boards = self.boards
+        boards[slot] ^= bit
+        boards[_GROUP_SLOTS[slot]] ^= bit
+        boards[ALL_PIECES] ^= bit
+        self.mailbox[square] = None
+        self.hash ^= _PIECE_KEYS[slot][square]
+        self.mg_score -= _MG_TABLES[slot][square]
+        self.eg_score -= _EG_TABLES[slot][square]
+        self.phase -= _PIECE_PHASES[slot]
@@ -0,0 +1,122 @@
+import threading
+from array import array
+from collections import OrderedDict
+from typing import NamedTuple
+
+from chess_insights.engine.legal_moves import generate_legal_codes, has_legal_move
+from chess_insights.engine.moves import SQUARE_MASK, TARGET_SHIFT
+from chess_insights.game.position import Position
+from chess_insights.util.enum_game_status import GameStatus
+
+
+class PositionInfo:
+    """
+    What a position alone decides. status is CHECKMATE, STALEMATE, DRAW_INSUFFICIENT_MATERIAL or
+    ONGOING; the fifty-move rule and repetitions depend on how the position was reached, so
+    callers apply those on top. legal_moves and targets stay None until PositionCache.legal_moves
+    or PositionCache.targets first needs them: the status only has to know that a move exists.
+    """
+    __slots__ = ("is_check", "status", "legal_moves", "targets")
+
+    def __init__(self, is_check: bool, status: GameStatus):
+        self.is_check = is_check
+        self.status = status
+        self.legal_moves: array | None = None  # packed, array('H')
+        self.targets: dict[int, int] | None = None  # origin -> legal targets, side to move only
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    max_entries: int
+
+
+class PositionCache:
+    """
+    Bounded LRU cache of PositionInfo keyed by Zobrist hash, so the move validation, PGN
+    writing and status checks of one request work out a position's legal moves once between
+    them. The hash covers side to move, castling rights and en passant, everything legality
+    depends on. Lookups are thread-safe: the Flask request threads share POSITION_CACHE.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        if max_entries < 1:
+            raise ValueError("The position cache needs room for at least one entry.")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, PositionInfo] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, position: Position) -> PositionInfo:
+        key = position.hash
+        entries = self._entries
+        with self._lock:
+            info = entries.get(key)
+            if info is not None:
+                self.hits += 1
+                entries.move_to_end(key)
+                return info
+            self.misses += 1
+
+        # Analysed outside the lock so other threads are not held up; if two threads miss on
+        # the same position at once, both results are equal and the later one is kept
+        info = _analyze(position)
+        with self._lock:
+            entries[key] = info
+            if len(entries) > self.max_entries:
+                entries.popitem(last=False)
+        return info
+
+    def legal_moves(self, position: Position) -> array:
+        """The packed legal moves of position, generated on the first request only."""
+        info = self.lookup(position)
+        if info.legal_moves is None:
+            _add_moves(info, position)
+        return info.legal_moves
+
+    def targets(self, position: Position) -> dict[int, int]:
+        """Legal targets bitboard by origin square for the side to move; see legal_moves."""
+        info = self.lookup(position)
+        if info.targets is None:
+            _add_moves(info, position)
+        return info.targets
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, len(self._entries), self.max_entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+def _analyze(position: Position) -> PositionInfo:
+    is_check = position.is_in_check()
+    if position.is_insufficient_material():
+        status = GameStatus.DRAW_INSUFFICIENT_MATERIAL
+    elif not has_legal_move(position):
+        status = GameStatus.CHECKMATE if is_check else GameStatus.STALEMATE
+    else:
+        status = GameStatus.ONGOING
+    return PositionInfo(is_check, status)
+
+
+def _add_moves(info: PositionInfo, position: Position) -> None:
+    # Two threads may both fill an entry; they compute equal values, so either may win
+    legal_moves = generate_legal_codes(position)
+    targets = {}
+    for code in legal_moves:
+        origin = code & SQUARE_MASK
+        targets[origin] = targets.get(origin, 0) | 1 << (code >> TARGET_SHIFT & SQUARE_MASK)
+    info.targets = targets
+    info.legal_moves = legal_moves
+
+
+# Shared by ChessBoard, Engine and the PGN writer
+POSITION_CACHE = PositionCache()
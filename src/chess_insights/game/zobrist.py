@@ -0,0 +1,57 @@
+import random
+
+from chess_insights.engine.attack_tables import PAWN_ATTACKS
+from chess_insights.util.enum_chess_piece_type import PIECE_ORDER, ChessPieceType, Color, \
+    ColorChessPiece
+
+# Fixed seed so keys are identical across processes and anything persisted with them stays valid
+_random = random.Random(0x0C4E55)
+
+PIECE_KEYS: dict[ColorChessPiece, tuple[int, ...]] = {
+    piece: tuple(_random.getrandbits(64) for _ in range(64))
+    for piece in ColorChessPiece if piece.piece_type != ChessPieceType.ANY
+}
+BLACK_TO_MOVE_KEY: int = _random.getrandbits(64)
+CASTLING_KEYS: tuple[int, ...] = (0,) + tuple(_random.getrandbits(64) for _ in range(15))
+EN_PASSANT_KEYS: tuple[int, ...] = tuple(_random.getrandbits(64) for _ in range(8))
+
+_WHITE_PAWN_SLOT = ColorChessPiece.WHITE_PAWN.index
+_BLACK_PAWN_SLOT = ColorChessPiece.BLACK_PAWN.index
+
+
+def get_en_passant_key(en_passant_square: int,
+                       boards: list[int],
+                       is_whites_turn: bool
+                       ) -> int:
+    """
+    Key for the en passant bitboard, or 0 when no pawn of the side to move can take en passant,
+    so positions that only differ by an unusable en passant square hash the same. boards is
+    indexed by ColorChessPiece.index, like Position.boards.
+    """
+    if not en_passant_square:
+        return 0
+    square = en_passant_square.bit_length() - 1
+    if is_whites_turn:
+        pawns = boards[_WHITE_PAWN_SLOT] & PAWN_ATTACKS[Color.BLACK][square]
+    else:
+        pawns = boards[_BLACK_PAWN_SLOT] & PAWN_ATTACKS[Color.WHITE][square]
+    return EN_PASSANT_KEYS[square & 7] if pawns else 0
+
+
+def compute_hash(piece_boards: dict[ColorChessPiece, int],
+                 is_whites_turn: bool,
+                 castling_rights: int,
+                 en_passant_square: int
+                 ) -> int:
+    """Compute a Zobrist key from scratch; positions keep theirs up to date incrementally."""
+    key = 0
+    for piece, square_keys in PIECE_KEYS.items():
+        board = piece_boards[piece]
+        while board:
+            key ^= square_keys[(board & -board).bit_length() - 1]
+            board &= board - 1
+    if not is_whites_turn:
+        key ^= BLACK_TO_MOVE_KEY
+    key ^= CASTLING_KEYS[castling_rights]
+    return key ^ get_en_passant_key(en_passant_square,
+                                    [piece_boards[piece] for piece in PIECE_ORDER], is_whites_turn)
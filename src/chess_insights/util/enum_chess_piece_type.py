@@ -39,9 +39,8 @@ class Color(Enum):
     def get_color_piece_by_type(self, piece_type: ChessPieceType) -> "ColorChessPiece":
         """Retrieves the specific ColorChessPiece for the given color and type."""
         try:
-            return next(piece for piece in ColorChessPiece if
-                        piece.piece_type == piece_type and piece.color == self)
-        except StopIteration:
+            return _PIECES_BY_COLOR_AND_TYPE[self, piece_type]
+        except KeyError:
             raise ValueError(f"No {piece_type.name} found for color {self.name}")
 
 
@@ -64,26 +63,39 @@ class ColorChessPiece(Enum):
     BLACK_QUEEN = (ChessPieceType.QUEEN, Color.BLACK, 'q')
     BLACK_KING = (ChessPieceType.KING, Color.BLACK, 'k')
 
-    @property
-    def piece_type(self):
-        return self.value[0]
-
-    @property
-    def color(self):
-        return self.value[1]
-
-    @property
-    def fen(self):
-        return self.value[2]
+    # Plain attributes rather than properties over value, since they are read in every loop of
+    # move generation; index is assigned below
+    def __init__(self, piece_type: ChessPieceType, color: Color, fen: str):
+        self.piece_type = piece_type
+        self.color = color
+        self.fen = fen
+
+
+# Small-int piece codes. ColorChessPiece.index is the slot of a piece in array-indexed boards
+# such as Position.boards: the white pieces from pawn to king, the black ones, then the white,
+# black and all-pieces groups.
+PIECE_ORDER: tuple[ColorChessPiece, ...] = (
+    tuple(piece for piece in ColorChessPiece if piece.piece_type != ChessPieceType.ANY) +
+    (ColorChessPiece.WHITE_PIECES, ColorChessPiece.BLACK_PIECES, ColorChessPiece.ALL_PIECES)
+)
+for _index, _piece in enumerate(PIECE_ORDER):
+    _piece.index = _index
+
+_PIECES_BY_COLOR_AND_TYPE = {(piece.color, piece.piece_type): piece for piece in ColorChessPiece}
+_PIECES_BY_FEN = {piece.fen: piece for piece in reversed(ColorChessPiece)}
+_PIECES_OF_COLOR = {
+    color: tuple(piece for piece in ColorChessPiece
+                 if piece.color == color and piece.piece_type != ChessPieceType.ANY)
+    for color in Color
+}
 
 
 def get_chess_piece_by_fen(fen_char: str) -> ColorChessPiece:
-    for piece in ColorChessPiece:
-        if piece.fen == fen_char:
-            return piece
-    raise ValueError(f"No piece found for FEN character {fen_char}")
+    try:
+        return _PIECES_BY_FEN[fen_char]
+    except KeyError:
+        raise ValueError(f"No piece found for FEN character {fen_char}")
 
 
 def get_pieces_by_color(color: Color) -> list[ColorChessPiece]:
-    return [piece for piece in ColorChessPiece
-            if piece.color == color and piece.piece_type != ChessPieceType.ANY]
+    return list(_PIECES_OF_COLOR[color])
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class EngineLevel(Enum):
+    RANDOM = 'random'
+    SEARCH = 'search'
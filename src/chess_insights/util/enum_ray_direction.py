@@ -1,5 +1,6 @@
 from enum import Enum
 
+from chess_insights.engine.geometry import DIRECTION
 from chess_insights.util.enum_chess_piece_type import ColorChessPiece
 
 
@@ -17,24 +18,11 @@ class Direction(Enum):
 
     @staticmethod
     def from_squares(origin_square: int, target_square: int) -> Enum:
-        if 63 < origin_square < 0 or 63 < target_square < 0:
+        """Direction from origin_square towards target_square; C for the same square and for
+        squares that share no rank, file or diagonal."""
+        if not (0 <= origin_square < 64 and 0 <= target_square < 64):
             raise ValueError('Square must be between 0 and 63')
-
-        square_difference = target_square - origin_square
-        if square_difference == 0:
-            return Direction.C
-        if square_difference % 8 == 0:
-            return Direction.N if square_difference > 0 else Direction.S
-        elif square_difference % 9 == 0:
-            return Direction.NE if square_difference > 0 else Direction.SW
-        elif square_difference % 7 == 0:
-            return Direction.NW if square_difference > 0 else Direction.SE
-        elif square_difference > 0:
-            return Direction.E if ((1 << 8) - 1 << (origin_square // 8) * 8) & (
-                    1 << target_square) != 0 else Direction.C
-        elif square_difference < 0:
-            return Direction.W if ((1 << 8) - 1 << (origin_square // 8) * 8) & (
-                    1 << target_square) != 0 else Direction.C
+        return _DIRECTIONS_BY_STEP[DIRECTION[origin_square][target_square]]
 
     @staticmethod
     def get_directions(piece: ColorChessPiece) -> list:
@@ -46,3 +34,6 @@ class Direction(Enum):
             return [Direction.NE, Direction.NW, Direction.N, Direction.E]
         else:
             raise ValueError(f"Invalid piece type: {piece}")
+
+
+_DIRECTIONS_BY_STEP = {direction.value[1]: direction for direction in Direction}
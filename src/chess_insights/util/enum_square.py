@@ -1,5 +1,7 @@
 from enum import Enum
 
+from chess_insights.engine.geometry import CHEBYSHEV_DISTANCE
+
 
 class Square(Enum):
     a1 = 0
@@ -78,10 +80,11 @@ class Square(Enum):
 def chebyshev_distance(origin_square: int, target_square: int) -> int:
     if target_square < 0 or origin_square < 0 or target_square > 63 or origin_square > 63:
         return -1
-    origin_algebraic_notation = Square(origin_square).name
-    target_algebraic_notation = Square(target_square).name
-    origin_rank = ord(origin_algebraic_notation[0])
-    target_rank = ord(target_algebraic_notation[0])
-    origin_file = ord(origin_algebraic_notation[1])
-    target_file = ord(target_algebraic_notation[1])
-    return max(abs(origin_rank - target_rank), abs(origin_file - target_file))
\ No newline at end of file
+    return CHEBYSHEV_DISTANCE[origin_square][target_square]
+
+
+def squares_to_board(*squares: Square) -> int:
+    board = 0
+    for square in squares:
+        board |= 1 << square.value
+    return board
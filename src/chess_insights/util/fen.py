@@ -1,6 +1,6 @@
 from types import MappingProxyType
 
-from chess_insights.engine.bitboard import BitBoard
+from chess_insights.engine.bitboard import BitBoard, squares
 from chess_insights.game.board_state import BoardState
 from chess_insights.util.enum_chess_piece_type import ColorChessPiece, get_chess_piece_by_fen, \
     ChessPieceType
@@ -31,6 +31,7 @@ def board_from_fen(
     if en_passant_square != '-':
         en_passant_square_board.set_bit(Square[en_passant_square].value)
 
+    mailbox = [None] * 64
     current_square = 56
     for char in position:
         if char == '/':
@@ -40,6 +41,7 @@ def board_from_fen(
         else:
             piece = get_chess_piece_by_fen(char)
             piece_locations[piece].set_bit(current_square)
+            mailbox[current_square] = piece
             current_square += 1
 
     # Update the white pieces, black pieces, and all pieces bitboards
@@ -62,7 +64,8 @@ def board_from_fen(
         en_passant_square=en_passant_square_board,
         fifty_move_rule=int(fifty_move_rule),
         move_number=int(move_number) - 1 if is_whites_turn else int(move_number),
-        castling_rights=castling_rights_int
+        castling_rights=castling_rights_int,
+        mailbox=tuple(mailbox)
     )
 
 
@@ -71,6 +74,7 @@ def fen_from_board(board_state: BoardState) -> str:
     Generate a FEN string from a BoardState object.
     """
     position = []
+    mailbox = board_state.mailbox or _mailbox_from_bitboards(board_state)
 
     for rank in range(8):
         empty_squares = 0
@@ -78,18 +82,14 @@ def fen_from_board(board_state: BoardState) -> str:
             square_index = 56 - rank * 8 + file  # Top-left (a8) is 56, bottom-right (h1) is 0
 
             # Identify the piece at the current square
-            piece = next(
-                (color_piece.fen for color_piece, bitboard in board_state.piece_locations.items()
-                 if color_piece.piece_type != ChessPieceType.ANY and bitboard.board & (1 << square_index)),
-                None
-            )
+            piece = mailbox[square_index]
 
             if piece:
                 # Add empty squares before a piece
                 if empty_squares > 0:
                     position.append(str(empty_squares))
                     empty_squares = 0
-                position.append(piece)
+                position.append(piece.fen)
             else:
                 empty_squares += 1
 
@@ -115,6 +115,14 @@ def fen_from_board(board_state: BoardState) -> str:
     return f"{''.join(position)} {turn} {castling_rights} {en_passant_square} {board_state.fifty_move_rule} {board_state.move_number + 1 if turn =='w' else board_state.move_number}"
 
 
+def _mailbox_from_bitboards(board_state: BoardState) -> list[ColorChessPiece | None]:
+    mailbox = [None] * 64
+    for piece, bitboard in board_state.piece_locations.items():
+        if piece.piece_type != ChessPieceType.ANY:
+            for square in squares(bitboard.board):
+                mailbox[square] = piece
+    return mailbox
+
 
 def fen_to_castling_rights(fen: str) -> int:
     castling_rights = 0
@@ -123,22 +131,22 @@ def fen_to_castling_rights(fen: str) -> int:
     if 'Q' in fen:
         castling_rights |= 0b0010
     if 'k' in fen:
-        castling_rights |= 0b1000
-    if 'q' in fen:
         castling_rights |= 0b0100
+    if 'q' in fen:
+        castling_rights |= 0b1000
     return castling_rights
 
 
 def castling_rights_to_fen(castling_rights: int) -> str:
     fen_castling = []
 
-    if castling_rights & 0b0100:
+    if castling_rights & 0b0001:
         fen_castling.append('K')
-    if castling_rights & 0b1000:
+    if castling_rights & 0b0010:
         fen_castling.append('Q')
-    if castling_rights & 0b0001:
+    if castling_rights & 0b0100:
         fen_castling.append('k')
-    if castling_rights & 0b0010:
+    if castling_rights & 0b1000:
         fen_castling.append('q')
 
     # If no castling rights are available, return "-"
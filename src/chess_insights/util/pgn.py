@@ -1,7 +1,16 @@
+import re
+from typing import Iterator, NamedTuple
+
+from chess_insights.engine.geometry import CHEBYSHEV_DISTANCE
+from chess_insights.engine.legal_moves import KING_START_SQUARES
+from chess_insights.engine.moves import KIND_SHIFT, PROMOTIONS_BY_CODE, SQUARE_MASK, \
+    TARGET_SHIFT, pack_move
 from chess_insights.game.board_state import BoardState
+from chess_insights.game.position import Position
+from chess_insights.game.position_cache import POSITION_CACHE
 from chess_insights.util.enum_game_status import GameStatus
 from .enum_chess_piece_type import ChessPieceType, Color, ColorChessPiece
-from .enum_square import Square, chebyshev_distance
+from .enum_square import Square
 
 
 def convert_move_pgn(origin_square: int,
@@ -11,16 +20,19 @@ def convert_move_pgn(origin_square: int,
                      piece: ColorChessPiece,
                      is_capture: bool,
                      status: GameStatus,
+                     promotion: ColorChessPiece = None
                      ) -> str:
     pgn = f"{new_board_state.move_number}. " if not new_board_state.is_whites_turn else " "
-    if piece.piece_type == ChessPieceType.KING and chebyshev_distance(origin_square,
-                                                                      target_square) == 2:
+    if (piece.piece_type == ChessPieceType.KING and
+            CHEBYSHEV_DISTANCE[origin_square][target_square] == 2):
         pgn += "0-0" if Square(target_square).name.startswith('g') else "0-0-0"
     else:
         move_notation = f"{piece.fen.capitalize() if piece.fen.capitalize() != 'P' else ''}{'x' if is_capture else ''}{Square(target_square).name}"
         if piece.piece_type == ChessPieceType.PAWN and is_capture:
             move_notation = f"{Square(origin_square).name[0]}x{Square(target_square).name}"
         pgn += move_notation
+        if promotion is not None:
+            pgn += f"={promotion.fen.upper()}"
 
     if status in {GameStatus.DRAW_50_MOVE, GameStatus.STALEMATE, GameStatus.DRAW_REPETITION,
                   GameStatus.DRAW_INSUFFICIENT_MATERIAL}:
@@ -31,3 +43,85 @@ def convert_move_pgn(origin_square: int,
         pgn += "+"
 
     return pgn + " "
+
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+PIECE_LETTERS = {"N": ChessPieceType.KNIGHT, "B": ChessPieceType.BISHOP, "R": ChessPieceType.ROOK,
+                 "Q": ChessPieceType.QUEEN, "K": ChessPieceType.KING}
+
+_TOKENS = re.compile(r"""
+    (?P<tag>\[\s*(?P<name>\w+)\s+"(?P<value>(?:[^"\\]|\\.)*)"\s*\])
+    | (?P<comment>\{[^}]*\}|;[^\n]*)
+    | (?P<open>\() | (?P<close>\))
+    | (?P<nag>\$\d+)
+    | (?P<result>1-0|0-1|1/2-1/2|\*)
+    | (?P<number>\d+\.+)
+    | (?P<san>[^\s(){};\[\]$]+)
+""", re.VERBOSE)
+_SAN = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+
+
+class PgnGame(NamedTuple):
+    tags: dict[str, str]
+    moves: list[str]  # SAN of the main line
+    result: str
+
+
+def read_pgn_games(text: str) -> Iterator[PgnGame]:
+    """Split PGN text into games, keeping the tags and the main line; comments, NAGs and
+    variations are dropped."""
+    tags, moves, variation_depth = {}, [], 0
+    for token in _TOKENS.finditer(text):
+        kind = token.lastgroup
+        if kind == "tag":
+            if moves:
+                yield PgnGame(tags, moves, "*")
+                tags, moves = {}, []
+            tags[token["name"]] = re.sub(r"\\(.)", r"\1", token["value"])
+        elif kind == "open":
+            variation_depth += 1
+        elif kind == "close":
+            variation_depth = max(0, variation_depth - 1)
+        elif variation_depth:
+            continue
+        elif kind == "result":
+            yield PgnGame(tags, moves, token["result"])
+            tags, moves = {}, []
+        elif kind == "san":
+            moves.append(token["san"])
+    if moves:
+        yield PgnGame(tags, moves, "*")
+
+
+def parse_san(position: Position, san: str) -> int:
+    """Find the legal move written as san (castling as O-O or 0-0) and return it packed.
+    Raises ValueError for moves that are illegal, malformed or ambiguous."""
+    text = san.rstrip("+#!?")
+    legal_moves = POSITION_CACHE.legal_moves(position)
+    if text.replace("0", "O") in ("O-O", "O-O-O"):
+        king = KING_START_SQUARES[position.color_to_move]
+        target = king + 2 if text.replace("0", "O") == "O-O" else king - 2
+        if (position.piece_on(king) is not None and
+                position.piece_on(king).piece_type == ChessPieceType.KING and
+                pack_move(king, target) in legal_moves):
+            return pack_move(king, target)
+        raise ValueError(f"Illegal castling move {san}.")
+
+    match = _SAN.match(text)
+    if match is None:
+        raise ValueError(f"{san} is not a SAN move.")
+    letter, from_file, from_rank, target_name, promotion_letter = match.groups()
+    piece_type = PIECE_LETTERS[letter] if letter else ChessPieceType.PAWN
+    target = Square[target_name].value
+    promotion_type = PIECE_LETTERS[promotion_letter] if promotion_letter else None
+    candidates = [
+        code for code in legal_moves
+        if code >> TARGET_SHIFT & SQUARE_MASK == target and
+        position.piece_on(code & SQUARE_MASK).piece_type == piece_type and
+        (from_file is None or Square(code & SQUARE_MASK).name[0] == from_file) and
+        (from_rank is None or Square(code & SQUARE_MASK).name[1] == from_rank) and
+        PROMOTIONS_BY_CODE.get(code >> KIND_SHIFT) == promotion_type
+    ]
+    if len(candidates) != 1:
+        raise ValueError(f"{san} is {'ambiguous' if candidates else 'illegal'} here.")
+    return candidates[0]
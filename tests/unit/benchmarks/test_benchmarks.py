@@ -0,0 +1,91 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from chess_insights.benchmarks.cases import build_cases
+from chess_insights.benchmarks.runner import main, run_benchmarks
+from chess_insights.benchmarks.timing import BenchmarkResult, calibrate, compare, load_baseline, \
+    measure, save_baseline
+from chess_insights.game.position_cache import POSITION_CACHE
+
+
+def result(name: str, median_ns: float) -> BenchmarkResult:
+    return BenchmarkResult(name, median_ns, 1.0, 1e9 / median_ns, 5, 100)
+
+
+class TestTiming(unittest.TestCase):
+
+    def test_measure_statistics(self):
+        measured = measure("sum", lambda: sum(range(100)), rounds=5, min_round_ms=0.5)
+        self.assertEqual(measured.rounds, 5)
+        self.assertGreater(measured.median_ns, 0)
+        self.assertGreaterEqual(measured.iqr_ns, 0)
+        self.assertAlmostEqual(measured.ops_per_second, 1e9 / measured.median_ns)
+        with self.assertRaises(ValueError):
+            measure("sum", lambda: None, rounds=1)
+
+    def test_calibrate_fills_round(self):
+        self.assertGreater(calibrate(lambda: None, 1_000_000), 1)
+
+    def test_compare_flags_slowdowns_above_threshold(self):
+        baseline = {"fast": {"median_ns": 100.0}, "slow": {"median_ns": 100.0}}
+        comparisons = compare([result("fast", 105.0), result("slow", 125.0),
+                               result("new", 10.0)], baseline, threshold=0.10)
+        self.assertEqual([comparison.name for comparison in comparisons], ["fast", "slow"])
+        self.assertFalse(comparisons[0].regressed)
+        self.assertTrue(comparisons[1].regressed)
+        self.assertAlmostEqual(comparisons[1].change, 0.25)
+
+    def test_baseline_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            save_baseline([result("fen", 200.0)], path)
+            self.assertEqual(load_baseline(path)["fen"]["median_ns"], 200.0)
+            with open(path, "w") as file:
+                json.dump({"results": []}, file)
+            with self.assertRaises(ValueError):
+                load_baseline(path)
+
+
+class TestRunner(unittest.TestCase):
+
+    def test_every_case_runs(self):
+        cases = build_cases()
+        for name in ("bitboard.serialize_board", "bitboard.mirror",
+                     "move_generators.generate_attacks_by_color", "legal_moves.generate_legal_codes",
+                     "chess_board.check_game_status", "fen.board_from_fen", "fen.fen_from_board"):
+            self.assertIn(name, cases)
+        for case in cases.values():
+            case()
+
+    def test_status_case_misses_the_cache(self):
+        cases = build_cases()
+        for _ in range(2):
+            cases["chess_board.check_game_status"]()
+            self.assertEqual((POSITION_CACHE.hits, POSITION_CACHE.misses), (0, 1))
+        cases["position_cache.lookup[hit]"]()
+        self.assertEqual((POSITION_CACHE.hits, POSITION_CACHE.misses), (1, 1))
+
+    def test_legal_moves_case_generates_every_move(self):
+        self.assertEqual(len(build_cases()["legal_moves.generate_legal_codes"]()), 48)
+
+    def test_run_benchmarks_filters(self):
+        results = run_benchmarks(["fen."], rounds=2, min_round_ms=0.1)
+        self.assertEqual([result.name for result in results],
+                         ["fen.board_from_fen", "fen.fen_from_board"])
+        with self.assertRaises(ValueError):
+            run_benchmarks(["unknown"])
+
+    def test_cli_exits_with_one_on_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            save_baseline([result("fen.fen_from_board", 1e-3)], path)
+            with redirect_stdout(io.StringIO()) as output:
+                code = main(["--filter", "fen_from_board", "--rounds", "2", "--min-round-ms",
+                             "0.1", "--compare", path, "--json"])
+            self.assertEqual(code, 1)
+            report = json.loads(output.getvalue())
+            self.assertTrue(report["comparisons"][0]["regressed"])
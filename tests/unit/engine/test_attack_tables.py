@@ -0,0 +1,101 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from chess_insights.engine.attack_tables import KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, \
+    bishop_attacks_set, king_attacks_set, knight_attacks_set, pawn_attacks_set, rook_attacks_set
+from chess_insights.engine.legal_moves import generate_attack_map
+from chess_insights.engine.magic_bitboards import bishop_attacks, rook_attacks
+from chess_insights.game.position import ALL_PIECES, Position
+from chess_insights.util.enum_chess_piece_type import Color
+from chess_insights.util.enum_square import Square, squares_to_board
+
+
+def sum_boards(boards) -> int:
+    union = 0
+    for board in boards:
+        union |= board
+    return union
+
+
+class TestAttackTables(unittest.TestCase):
+
+    @parameterized.expand([
+        (Square.a1, squares_to_board(Square.b3, Square.c2)),
+        (Square.h8, squares_to_board(Square.g6, Square.f7)),
+        (Square.e4, squares_to_board(Square.d6, Square.f6, Square.c5, Square.g5,
+                                     Square.c3, Square.g3, Square.d2, Square.f2)),
+    ])
+    def test_knight_attacks(self, square, expected):
+        self.assertEqual(KNIGHT_ATTACKS[square.value], expected)
+
+    @parameterized.expand([
+        (Square.a1, squares_to_board(Square.a2, Square.b2, Square.b1)),
+        (Square.h5, squares_to_board(Square.h6, Square.g6, Square.g5, Square.g4, Square.h4)),
+    ])
+    def test_king_attacks(self, square, expected):
+        self.assertEqual(KING_ATTACKS[square.value], expected)
+
+    @parameterized.expand([
+        (Color.WHITE, Square.a2, squares_to_board(Square.b3)),
+        (Color.WHITE, Square.e4, squares_to_board(Square.d5, Square.f5)),
+        (Color.BLACK, Square.h7, squares_to_board(Square.g6)),
+        (Color.BLACK, Square.e4, squares_to_board(Square.d3, Square.f3)),
+    ])
+    def test_pawn_attacks(self, color, square, expected):
+        self.assertEqual(PAWN_ATTACKS[color][square.value], expected)
+
+    def test_tables_stay_on_board(self):
+        for table in (KNIGHT_ATTACKS, KING_ATTACKS, *PAWN_ATTACKS.values()):
+            self.assertEqual(len(table), 64)
+            self.assertTrue(all(0 <= attacks < 1 << 64 for attacks in table))
+
+    def test_set_wise_matches_table_union(self):
+        pieces = squares_to_board(Square.a1, Square.d4, Square.g7, Square.h8, Square.b6)
+        squares = [square for square in range(64) if pieces & (1 << square)]
+        self.assertEqual(knight_attacks_set(pieces),
+                         sum_boards(KNIGHT_ATTACKS[square] for square in squares))
+        self.assertEqual(king_attacks_set(pieces),
+                         sum_boards(KING_ATTACKS[square] for square in squares))
+        for color in (Color.WHITE, Color.BLACK):
+            self.assertEqual(pawn_attacks_set(pieces, color),
+                             sum_boards(PAWN_ATTACKS[color][square] for square in squares))
+
+    def test_slider_sets_match_magic_lookups(self):
+        rng = random.Random(25)
+        for _ in range(200):
+            occupancy = rng.getrandbits(64) & rng.getrandbits(64)
+            sliders = occupancy & rng.getrandbits(64)
+            squares = [square for square in range(64) if sliders & (1 << square)]
+            self.assertEqual(bishop_attacks_set(sliders, occupancy),
+                             sum_boards(bishop_attacks(square, occupancy) for square in squares))
+            self.assertEqual(rook_attacks_set(sliders, occupancy),
+                             sum_boards(rook_attacks(square, occupancy) for square in squares))
+
+    def test_slider_sets_stop_at_the_edges(self):
+        self.assertEqual(rook_attacks_set(squares_to_board(Square.h1), 0),
+                         rook_attacks(Square.h1.value, 0))
+        self.assertEqual(bishop_attacks_set(squares_to_board(Square.a8, Square.h8), 0),
+                         bishop_attacks(Square.a8.value, 0) | bishop_attacks(Square.h8.value, 0))
+
+    @parameterized.expand([
+        ("per-piece lookups", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"),
+        ("set-wise fills", "QQQ1k3/QQQ5/8/8/8/8/5qqq/3K1qqq w - - 0 1"),
+    ])
+    def test_attack_map_matches_square_checks(self, _, fen):
+        position = Position.from_fen(fen)
+        for color in (Color.WHITE, Color.BLACK):
+            expected = sum_boards(1 << square for square in range(64)
+                                  if position.is_square_attacked(square, color))
+            self.assertEqual(
+                generate_attack_map(position.boards, color, position.boards[ALL_PIECES]),
+                expected)
+
+    def test_pawn_attacks_invalid_color(self):
+        with self.assertRaises(ValueError):
+            pawn_attacks_set(1, Color.ANY)
+
+
+if __name__ == "__main__":
+    unittest.main()
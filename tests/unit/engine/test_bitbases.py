@@ -0,0 +1,118 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from parameterized import parameterized
+
+from chess_insights.engine.bitbases import HEADER, Bitbases, Outcome, canonical_signature, \
+    main, parse_signature, swap_colors, _dependencies
+from chess_insights.engine.search import KNOWN_WIN_SCORE, MATE_BOUND, MATE_SCORE, SearchLimits, \
+    Searcher
+from chess_insights.game.position import Position
+from chess_insights.util.enum_square import Square
+
+
+class TestSignatures(unittest.TestCase):
+
+    @parameterized.expand([
+        ("KQK", ("KQ", "K")),
+        ("KRKP", ("KR", "KP")),
+        ("KK", ("K", "K")),
+    ])
+    def test_parse_signature(self, signature, expected):
+        self.assertEqual(parse_signature(signature), expected)
+
+    @parameterized.expand([("QKK",), ("KQ",), ("KXK",)])
+    def test_parse_signature_rejects(self, signature):
+        with self.assertRaises(ValueError):
+            parse_signature(signature)
+
+    def test_canonical_signature_puts_stronger_side_first(self):
+        self.assertEqual(canonical_signature("KQ", "K"), ("KQK", False))
+        self.assertEqual(canonical_signature("K", "KQ"), ("KQK", True))
+        self.assertEqual(canonical_signature("KP", "KR"), ("KRKP", True))
+
+    def test_dependencies(self):
+        self.assertEqual(_dependencies("KQK"), set())
+        self.assertEqual(_dependencies("KPK"), {"KQK", "KRK"})
+        self.assertEqual(_dependencies("KRKP"), 
+                         {"KRK", "KPK", "KQK", "KQKR", "KRKR", "KRKB", "KRKN"})
+
+    def test_swap_colors_mirrors_the_board(self):
+        position = Position.from_fen("8/8/8/8/8/8/1q6/K6k b - - 0 1")
+        swapped = Position.from_fen("k6K/1Q6/8/8/8/8/8/8 w - - 0 1")
+        self.assertEqual(swap_colors(position.piece_boards), swapped.piece_boards)
+
+
+class TestBitbases(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.bitbases = Bitbases(cls.directory.name)
+        cls.bitbases.generate("KQK")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.bitbases.close()
+        cls.directory.cleanup()
+
+    @parameterized.expand([
+        ("white to move wins", "8/8/8/8/8/8/1Q6/K6k w - - 0 1", Outcome.WIN),
+        ("black is mated", "6k1/6Q1/6K1/8/8/8/8/8 b - - 0 1", Outcome.LOSS),
+        ("black to move loses", "8/8/8/4k3/8/8/1Q6/K7 b - - 0 1", Outcome.LOSS),
+        ("stalemate", "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", Outcome.DRAW),
+        ("queen is taken", "6Qk/8/6K1/8/8/8/8/8 b - - 0 1", Outcome.DRAW),
+        ("colors swapped", "8/8/8/4K3/8/8/1q6/k7 w - - 0 1", Outcome.LOSS),
+        ("bare kings", "8/8/8/4K3/8/8/8/k7 w - - 0 1", Outcome.DRAW),
+    ])
+    def test_probe(self, _, fen, expected):
+        self.assertEqual(self.bitbases.probe(Position.from_fen(fen)), expected)
+
+    def test_probe_declines_other_material_and_castling(self):
+        self.assertIsNone(self.bitbases.probe(Position.from_fen("8/8/8/4K3/8/8/1R6/k7 w - - 0 1")))
+        self.assertIsNone(self.bitbases.probe(Position.from_fen("4k3/8/8/8/8/8/8/R3K3 w Q - 0 1")))
+
+    def test_reopened_directory_finds_tables(self):
+        with Bitbases(self.directory.name) as bitbases:
+            self.assertEqual(bitbases.available, {"KQK"})
+            self.assertEqual(bitbases.max_pieces, 3)
+            self.assertEqual(bitbases.probe(Position.from_fen("8/8/8/8/8/8/1Q6/K6k w - - 0 1")),
+                             Outcome.WIN)
+
+    def test_corrupt_header_is_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "KRK.bb"), "wb") as file:
+                file.write(HEADER.pack(b"CIBB", 1, 3, b"KQK"))
+            with Bitbases(directory) as bitbases:
+                with self.assertRaises(ValueError):
+                    bitbases.table("KRK")
+
+    def test_search_scores_known_wins(self):
+        # Taking the rook reaches a KQK win
+        position = Position.from_fen("8/8/8/4k3/8/8/1Q5r/K7 w - - 0 1")
+        result = Searcher(position, bitbases=self.bitbases).search(
+            SearchLimits(time_limit_ms=None, max_depth=2))
+        self.assertEqual(result.move, (Square.b2.value, Square.h2.value, None))
+        self.assertGreater(result.score, KNOWN_WIN_SCORE)
+        self.assertLess(result.score, MATE_BOUND)
+        position.make_move(*result.move)
+        self.assertEqual(self.bitbases.probe(position), Outcome.LOSS)
+
+    def test_search_still_mates_in_covered_endings(self):
+        position = Position.from_fen("6k1/8/6K1/8/8/8/8/Q7 w - - 0 1")
+        result = Searcher(position, bitbases=self.bitbases).search(
+            SearchLimits(time_limit_ms=None, max_depth=4))
+        # Qa8# and Qg7# both mate; a table probe would score every queen move the same
+        self.assertIn(result.move, [(Square.a1.value, Square.a8.value, None),
+                                    (Square.a1.value, Square.g7.value, None)])
+        self.assertEqual(result.score, MATE_SCORE - 1)
+
+    def test_main_reports_existing_tables(self):
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main(["KKQ", "-d", self.directory.name]), 0)
+        self.assertTrue(output.getvalue().startswith("KQK: "))
+        with redirect_stdout(io.StringIO()), self.assertRaises(SystemExit):
+            main(["QK", "-d", self.directory.name])
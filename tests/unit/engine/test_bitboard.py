@@ -1,5 +1,7 @@
+import random
 import unittest
-from chess_insights.engine.bitboard import BitBoard, reverse_bits
+from chess_insights.engine.bitboard import BitBoard, flip_horizontal, flip_vertical, \
+    highest_square, iter_squares, lowest_square, pop_count, rotate_180, squares
 from chess_insights.util.enum_chess_piece_type import ColorChessPiece
 
 
@@ -69,12 +71,6 @@ class TestBitBoard(unittest.TestCase):
         mirrored_board = self.bitboard.mirror()
         self.assertEqual(mirrored_board.board, 0x80c0a09000000000)
 
-    def test_reverse_bits(self):
-        # Test reverse_bits function on a single byte
-        self.assertEqual(reverse_bits(0b10101010), 0b01010101)
-        self.assertEqual(reverse_bits(0b11110000), 0b00001111)
-        self.assertEqual(reverse_bits(0b00000001), 0b10000000)
-
     def test_invalid_board_initialization(self):
         # Test initializing with a negative or too large bitboard
         with self.assertRaises(ValueError):
@@ -86,5 +82,30 @@ class TestBitBoard(unittest.TestCase):
         assert BitBoard.serialize_board(BitBoard(72057594037928065, None)) == [0, 7, 56]
 
 
+class TestKernel(unittest.TestCase):
+
+    def test_scanning(self):
+        board = 72057594037928065
+        self.assertEqual(pop_count(board), 3)
+        self.assertEqual(lowest_square(board), 0)
+        self.assertEqual(highest_square(board), 56)
+        self.assertEqual(squares(board), [0, 7, 56])
+        self.assertEqual(list(iter_squares(board)), [0, 7, 56])
+        self.assertEqual(lowest_square(0), -1)
+        self.assertEqual(squares(0), [])
+
+    def test_flips_match_byte_operations(self):
+        rng = random.Random(7)
+        for _ in range(100):
+            board = rng.getrandbits(64)
+            as_bytes = board.to_bytes(8, "little")
+            self.assertEqual(flip_vertical(board), int.from_bytes(as_bytes, "big"))
+            self.assertEqual(flip_horizontal(board),
+                             int.from_bytes(bytes(int(format(byte, "08b")[::-1], 2) for byte in as_bytes),
+                                            "little"))
+            self.assertEqual(rotate_180(board), int(format(board, "064b")[::-1], 2))
+            self.assertEqual(flip_vertical(flip_vertical(board)), board)
+
+
 if __name__ == "__main__":
     unittest.main()
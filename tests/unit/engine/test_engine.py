@@ -1,8 +1,14 @@
 import pytest
-from chess_insights.engine.move_generators import generate_all_moves
+from chess_insights.engine.legal_moves import generate_legal_moves
 from chess_insights.game.chess_board import ChessBoard
 from chess_insights.engine.engine import Engine
+from chess_insights.engine.lazy_smp import LazySMP
+from chess_insights.engine.move_ordering import MoveOrdering
+from chess_insights.engine.opening_book import OpeningBook, build_book, write_book
+from chess_insights.util.enum_chess_piece_type import ColorChessPiece
+from chess_insights.util.enum_engine_level import EngineLevel
 from chess_insights.util.enum_square import Square
+from chess_insights.util.fen import board_from_fen
 
 
 @pytest.fixture
@@ -13,12 +19,8 @@ def engine():
 
 def test_engine_move(engine):
     """Test if the engine selects a valid move."""
-    # Generate all possible moves from the current board state
-    candidate_moves = generate_all_moves(engine.board_state)
-
-    # Flatten the list of valid moves
-    valid_moves = [(origin, target) for targets, _, origin in candidate_moves for target in
-                   engine._validate_moves(targets, _, origin)]
+    # Generate all legal moves from the current board state
+    valid_moves = generate_legal_moves(engine.position)
 
     # Ensure that there are valid moves available
     assert len(valid_moves) > 0, "No valid moves were generated!"
@@ -26,9 +28,72 @@ def test_engine_move(engine):
     # Get a move from the engine
     selected_move = engine.generate_move()
 
-    # Ensure the move is a tuple of (origin, target)
+    # Ensure the move is a tuple of (origin, target, promotion)
     assert isinstance(selected_move, tuple), f"Move should be a tuple, got {type(selected_move)}"
-    assert len(selected_move) == 2, "Move should contain two elements (origin, target)"
+    assert len(selected_move) == 3, "Move should contain three elements (origin, target, promotion)"
 
     # Ensure the move is in the list of valid moves
     assert selected_move in valid_moves, f"Engine selected an invalid move: {selected_move}"
+
+
+@pytest.mark.parametrize("level", [EngineLevel.RANDOM, EngineLevel.SEARCH])
+def test_engine_levels_return_legal_moves(level):
+    """Both engine levels pick a legal (origin, target, promotion) move."""
+    engine = Engine(level=level, move_time_ms=50)
+    origin, target, _ = engine.generate_move()
+    assert target in engine.get_moves(origin)
+
+
+def test_search_engine_takes_free_queen():
+    """The search level captures an undefended queen."""
+    engine = Engine(board_from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1"), move_time_ms=100)
+    assert engine.generate_move() == (Square.d1.value, Square.d5.value, None)
+    assert engine.last_search.depth >= 1
+
+
+def test_search_engine_with_lazy_smp():
+    """With Lazy SMP the engine still finds the capture."""
+    with LazySMP(workers=2, size_mb=1) as smp:
+        engine = Engine(board_from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1"), move_time_ms=100,
+                        lazy_smp=smp)
+        assert engine.generate_move() == (Square.d1.value, Square.d5.value, None)
+
+
+def test_search_engine_plays_book_moves(tmp_path):
+    """A book position is answered from the book without searching."""
+    path = str(tmp_path / "book.bin")
+    write_book(build_book(["1. d4 d5 1-0"]), path)
+    with OpeningBook(path) as book:
+        engine = Engine(opening_book=book)
+        assert engine.generate_move() == (Square.d2.value, Square.d4.value, None)
+        assert engine.last_search is None
+        engine = Engine(board_from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1"), move_time_ms=100,
+                        opening_book=book)
+        assert engine.generate_move() == (Square.d1.value, Square.d5.value, None)
+        assert engine.last_search is not None
+
+
+def test_move_ordering_carries_over_searches():
+    """Engines built per request share killers and history through one MoveOrdering."""
+    ordering = MoveOrdering()
+    Engine(move_time_ms=None, max_nodes=5000, move_ordering=ordering).generate_move()
+    history = list(ordering.history)
+    assert any(history)
+    engine = Engine(move_time_ms=None, max_nodes=5000, move_ordering=ordering)
+    assert engine.move_ordering is ordering
+    engine.generate_move()
+    # Aged by the second search, not started afresh
+    assert list(ordering.history) != history
+    assert any(ordering.history)
+
+
+def test_engine_underpromotion_reaches_the_board():
+    """The promotion piece the search picked is the one played on the board."""
+    engine = Engine(board_from_fen("6br/5Ppk/6pp/8/8/8/8/K7 w - - 0 1"), move_time_ms=None,
+                    max_nodes=20000)
+    move = engine.generate_move()
+    assert move == (Square.f7.value, Square.f8.value, ColorChessPiece.WHITE_KNIGHT)
+    board = ChessBoard(board_state=engine.board_state)
+    board.move_piece(*move)
+    assert board.get_piece_on_square(Square.f8.value) == ColorChessPiece.WHITE_KNIGHT
+    assert board.pgn == "1. f8=N# 1-0 "
@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from chess_insights.engine.evaluation import evaluate
+from chess_insights.engine.legal_moves import generate_legal_moves
+from chess_insights.engine.piece_square_tables import MAX_PHASE, compute_scores
+from chess_insights.game.position import Position
+
+
+def scores(position: Position) -> tuple[int, int, int]:
+    return position.mg_score, position.eg_score, position.phase
+
+
+class TestEvaluation(unittest.TestCase):
+
+    def test_start_position_is_balanced(self):
+        position = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        self.assertEqual(evaluate(position), 0)
+        self.assertEqual(position.phase, MAX_PHASE)
+
+    @parameterized.expand([
+        ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+         "r3k2r/pppbbppp/2n2q1P/1P2p3/3pn3/BN2PNP1/P1PPQPB1/R3K2R b KQkq - 0 1"),
+        ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+         "8/4p1p1/8/1r3P1K/kp5R/3P4/2P5/8 b - - 0 1"),
+    ])
+    def test_color_flip_is_symmetric(self, fen, flipped_fen):
+        self.assertEqual(evaluate(Position.from_fen(fen)), evaluate(Position.from_fen(flipped_fen)))
+
+    def test_incremental_scores_match_full_computation(self):
+        rng = random.Random(7)
+        position = Position.from_fen(
+            "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1")
+        start = scores(position)
+        for _ in range(40):
+            moves = generate_legal_moves(position)
+            if not moves:
+                break
+            position.make_move(*rng.choice(moves))
+            self.assertEqual(scores(position), compute_scores(position.piece_boards))
+        while position.ply:
+            position.unmake_move()
+        self.assertEqual(scores(position), start)
+
+    def test_phase_tapers_king_placement(self):
+        # With only kings and pawns left the centralised king is worth more than a sheltered one
+        central = Position.from_fen("8/5ppp/8/4k3/8/8/PPP5/1K6 w - - 0 1")
+        self.assertEqual(central.phase, 0)
+        self.assertLess(evaluate(central), 0)
+        middlegame = Position.from_fen("r2qk3/pppppppp/8/8/8/8/PPPPPPPP/1K1Q3R w - - 0 1")
+        castled = Position.from_fen("r2qk3/pppppppp/8/8/8/8/PPPPPPPP/3QK2R w - - 0 1")
+        self.assertGreater(evaluate(middlegame), evaluate(castled))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from parameterized import parameterized
+
+from chess_insights.engine.geometry import CHEBYSHEV_DISTANCE, DIRECTION, LINE_THROUGH, \
+    MANHATTAN_DISTANCE, NE, NW, RAYS, SQUARES_BETWEEN, E, N, S, W
+from chess_insights.engine.magic_bitboards import bishop_attacks, rook_attacks
+from chess_insights.util.enum_square import Square, squares_to_board
+
+
+class TestGeometry(unittest.TestCase):
+
+    def test_rays(self):
+        self.assertEqual(RAYS[N][Square.a1.value], 0x0101010101010100)
+        self.assertEqual(RAYS[W][Square.a1.value], 0)
+        self.assertEqual(RAYS[NE][Square.f6.value], squares_to_board(Square.g7, Square.h8))
+        for square in range(64):
+            self.assertEqual(rook_attacks(square, 0),
+                             RAYS[N][square] | RAYS[S][square] | RAYS[E][square] |
+                             RAYS[W][square])
+
+    @parameterized.expand([
+        (Square.a1, Square.h8, NE),
+        (Square.c3, Square.a5, NW),
+        (Square.e4, Square.e1, S),
+        (Square.a1, Square.h1, E),
+        (Square.h1, Square.a2, 0),
+        (Square.a1, Square.b3, 0),
+        (Square.d4, Square.d4, 0),
+    ])
+    def test_direction(self, origin, target, expected):
+        self.assertEqual(DIRECTION[origin.value][target.value], expected)
+
+    def test_line_tables(self):
+        self.assertEqual(SQUARES_BETWEEN[Square.a1.value][Square.d4.value],
+                         squares_to_board(Square.b2, Square.c3))
+        self.assertEqual(SQUARES_BETWEEN[Square.a1.value][Square.b3.value], 0)
+        self.assertEqual(SQUARES_BETWEEN[Square.a1.value][Square.b2.value], 0)
+        self.assertEqual(LINE_THROUGH[Square.c1.value][Square.e1.value], 0xFF)
+        self.assertEqual(LINE_THROUGH[Square.h1.value][Square.a2.value], 0)
+        for origin in range(64):
+            for target in range(64):
+                if DIRECTION[origin][target]:
+                    lookup = rook_attacks if DIRECTION[origin][target] in (N, S, E, W) \
+                        else bishop_attacks
+                    self.assertEqual(SQUARES_BETWEEN[origin][target],
+                                     lookup(origin, 1 << target) & lookup(target, 1 << origin))
+
+    def test_distances(self):
+        self.assertEqual(CHEBYSHEV_DISTANCE[Square.a1.value][Square.h8.value], 7)
+        self.assertEqual(CHEBYSHEV_DISTANCE[Square.e1.value][Square.g1.value], 2)
+        self.assertEqual(MANHATTAN_DISTANCE[Square.a1.value][Square.h8.value], 14)
+        self.assertEqual(MANHATTAN_DISTANCE[Square.h1.value][Square.a2.value], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from chess_insights.engine.lazy_smp import LazySMP
+from chess_insights.engine.search import SearchLimits
+from chess_insights.game.position import Position
+from chess_insights.util.enum_square import Square
+
+
+class TestLazySMP(unittest.TestCase):
+
+    def test_helpers_share_the_table(self):
+        with LazySMP(workers=3, size_mb=1) as smp:
+            position = Position.from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")
+            result = smp.search(position, SearchLimits(time_limit_ms=None, max_depth=3))
+            self.assertEqual(result.move[:2], (Square.d1.value, Square.d5.value))
+            self.assertEqual(result.depth, 3)
+            self.assertEqual(position.ply, 0)
+            # The helpers' entries are visible to the main process
+            self.assertGreater(result.nodes, 0)
+            self.assertIsNotNone(smp.transposition_table.probe(position.hash))
+
+    def test_black_to_move(self):
+        with LazySMP(workers=2, size_mb=1) as smp:
+            position = Position.from_fen("r5k1/8/8/8/8/8/5PPP/6K1 b - - 0 1")
+            result = smp.search(position, SearchLimits(time_limit_ms=None, max_depth=3))
+            self.assertEqual(result.move[:2], (Square.a8.value, Square.a1.value))
+
+    def test_single_worker_runs_in_process(self):
+        with LazySMP(workers=1, size_mb=1) as smp:
+            self.assertIsNone(smp.executor)
+            result = smp.search(Position.from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1"),
+                                SearchLimits(time_limit_ms=None, max_depth=2))
+            self.assertEqual(result.depth, 2)
+        self.assertIsNone(smp.transposition_table)
+        with self.assertRaises(ValueError):
+            LazySMP(workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+
+from parameterized import parameterized
+
+from chess_insights.engine.legal_moves import generate_legal_moves, generate_legal_targets, \
+    get_legal_targets, has_legal_move
+from chess_insights.game.position import Position
+from chess_insights.util.enum_chess_piece_type import Color, ColorChessPiece
+from chess_insights.util.enum_square import Square, squares_to_board
+
+
+def count_nodes(position: Position, depth: int) -> int:
+    moves = generate_legal_moves(position)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        position.make_move(*move)
+        nodes += count_nodes(position, depth - 1)
+        position.unmake_move()
+    return nodes
+
+
+class TestLegalMoves(unittest.TestCase):
+
+    @parameterized.expand([
+        ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 400),
+        ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", 2039),
+        ("position_3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 191),
+        ("position_4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", 264),
+        ("position_5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 1486),
+    ])
+    def test_reference_node_counts(self, _, fen, expected):
+        self.assertEqual(count_nodes(Position.from_fen(fen), 2), expected)
+
+    def test_pinned_rook_moves_along_pin(self):
+        position = Position.from_fen("4r1k1/8/8/8/8/8/4R3/4K3 w - - 0 1")
+        self.assertEqual(get_legal_targets(position, Square.e2.value),
+                         squares_to_board(Square.e3, Square.e4, Square.e5, Square.e6,
+                                          Square.e7, Square.e8))
+
+    def test_pinned_knight_cannot_move(self):
+        position = Position.from_fen("4r1k1/8/8/8/8/8/4N3/4K3 w - - 0 1")
+        self.assertEqual(get_legal_targets(position, Square.e2.value), 0)
+
+    def test_check_must_be_blocked_or_captured(self):
+        position = Position.from_fen("4r1k1/8/8/8/8/8/R7/4K3 w - - 0 1")
+        self.assertEqual(get_legal_targets(position, Square.a2.value),
+                         squares_to_board(Square.e2))
+
+    def test_double_check_only_king_moves(self):
+        position = Position.from_fen("4k3/8/8/8/8/5n2/8/R3K2r w - - 0 1")
+        pieces = {piece for _, _, piece in generate_legal_targets(position)}
+        self.assertEqual(pieces, {ColorChessPiece.WHITE_KING})
+
+    def test_en_passant_discovered_check_is_illegal(self):
+        position = Position.from_fen("8/8/8/KPp4r/8/8/8/7k w - c6 0 2")
+        self.assertFalse(get_legal_targets(position, Square.b5.value) & (1 << Square.c6.value))
+
+    def test_en_passant_can_capture_checking_pawn(self):
+        position = Position.from_fen("8/8/8/2k5/3Pp3/8/8/4K3 b - d3 0 1")
+        self.assertTrue(get_legal_targets(position, Square.e4.value) & (1 << Square.d3.value))
+
+    @parameterized.expand([
+        ("free", "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1",
+         squares_to_board(Square.c1, Square.g1)),
+        ("attacked_crossing_square", "r3k2r/8/8/8/8/8/5r2/R3K2R w KQkq - 0 1",
+         squares_to_board(Square.c1)),
+        ("attacked_b_file_only", "r3k2r/8/8/8/8/8/1r6/R3K2R w KQkq - 0 1",
+         squares_to_board(Square.c1, Square.g1)),
+        ("in_check", "r3k2r/8/8/8/8/8/4r3/R3K2R w KQkq - 0 1", 0),
+        ("no_rights", "r3k2r/8/8/8/8/8/8/R3K2R w kq - 0 1", 0),
+    ])
+    def test_castling(self, _, fen, expected):
+        position = Position.from_fen(fen)
+        castles = get_legal_targets(position, Square.e1.value) & squares_to_board(Square.c1,
+                                                                                   Square.g1)
+        self.assertEqual(castles, expected)
+
+    def test_promotions_include_underpromotions(self):
+        position = Position.from_fen("7k/P7/8/8/8/8/8/K7 w - - 0 1")
+        promotions = {promotion for origin, _, promotion in generate_legal_moves(position)
+                      if origin == Square.a7.value}
+        self.assertEqual(promotions, {ColorChessPiece.WHITE_QUEEN, ColorChessPiece.WHITE_ROOK,
+                                      ColorChessPiece.WHITE_BISHOP, ColorChessPiece.WHITE_KNIGHT})
+
+    def test_targets_for_side_not_to_move(self):
+        position = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        self.assertEqual(
+            get_legal_targets(position, Square.b8.value),
+            squares_to_board(Square.a6, Square.c6))
+        self.assertEqual(len(generate_legal_targets(position, Color.BLACK)), 10)
+
+    @parameterized.expand([
+        ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", True),
+        ("king can move", "6k1/5Q2/6K1/8/8/8/8/8 b - - 0 1", True),
+        ("mated", "6k1/6Q1/6K1/8/8/8/8/8 b - - 0 1", False),
+        ("stalemate", "7k/5Q2/8/8/8/8/8/7K b - - 0 1", False),
+        ("only a pawn can move", "7k/5Q2/8/8/8/p7/8/7K b - - 0 1", True),
+    ])
+    def test_has_legal_move(self, _, fen, expected):
+        position = Position.from_fen(fen)
+        self.assertEqual(has_legal_move(position), expected)
+        self.assertEqual(has_legal_move(position), bool(generate_legal_moves(position)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import random
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from chess_insights.engine.magic_bitboards import BISHOP_DIRECTIONS, BISHOP_MASKS, BISHOP_TABLE, \
+    ROOK_DIRECTIONS, ROOK_MASKS, ROOK_TABLE, bishop_attacks, generate_ray_attacks, load_tables, \
+    load_or_build_tables, queen_attacks, rook_attacks, save_tables
+from chess_insights.util.enum_square import Square
+
+
+class TestMagicBitboards(unittest.TestCase):
+
+    def test_lookups_match_ray_walk(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            square = rng.randrange(64)
+            occupancy = rng.getrandbits(64) & rng.getrandbits(64)
+            self.assertEqual(rook_attacks(square, occupancy),
+                             generate_ray_attacks(square, occupancy, ROOK_DIRECTIONS))
+            self.assertEqual(bishop_attacks(square, occupancy),
+                             generate_ray_attacks(square, occupancy, BISHOP_DIRECTIONS))
+
+    def test_queen_is_rook_and_bishop(self):
+        occupancy = 0x0000_1020_0400_8100
+        self.assertEqual(queen_attacks(Square.d4.value, occupancy),
+                         rook_attacks(Square.d4.value, occupancy) |
+                         bishop_attacks(Square.d4.value, occupancy))
+
+    @parameterized.expand([
+        (Square.a1, ROOK_MASKS, 0x000101010101017E),
+        (Square.e4, ROOK_MASKS, 0x001010106E101000),
+        (Square.a1, BISHOP_MASKS, 0x0040201008040200),
+        (Square.e4, BISHOP_MASKS, 0x0002442800284400),
+    ])
+    def test_relevant_masks_exclude_edges(self, square, masks, expected):
+        self.assertEqual(masks[square.value], expected)
+
+    def test_empty_board_rook_attacks(self):
+        self.assertEqual(rook_attacks(Square.a1.value, 0), 0x01010101010101FE)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "magic.bin")
+            save_tables(path, ROOK_TABLE, BISHOP_TABLE)
+            rook_table, bishop_table = load_tables(path)
+        self.assertEqual(rook_table, ROOK_TABLE)
+        self.assertEqual(bishop_table, BISHOP_TABLE)
+
+    def test_load_rejects_foreign_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "magic.bin")
+            with open(path, 'wb') as file:
+                file.write(b"not a table file")
+            with self.assertRaises(ValueError):
+                load_tables(path)
+
+    def test_load_or_build_persists_tables(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "magic.bin")
+            rook_table, bishop_table = load_or_build_tables(path)
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(load_tables(path), (rook_table, bishop_table))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from chess_insights.engine.legal_moves import generate_legal_codes
+from chess_insights.engine.move_ordering import HISTORY_LIMIT, MoveOrdering, mvv_lva
+from chess_insights.engine.moves import encode_move
+from chess_insights.game.position import Position
+from chess_insights.util.enum_chess_piece_type import ChessPieceType, ColorChessPiece
+from chess_insights.util.enum_square import Square
+
+
+def move_of(origin: Square, target: Square, promotion: ColorChessPiece = None) -> int:
+    return encode_move((origin.value, target.value, promotion))
+
+
+class TestMoveOrdering(unittest.TestCase):
+
+    def setUp(self):
+        # The knight can take the queen and the rook can take the pawn
+        self.position = Position.from_fen("4k3/8/8/3q4/8/2N5/3p4/K2R4 w - - 0 1")
+        self.ordering = MoveOrdering()
+
+    def ordered(self, tt_move: int = 0, ply: int = 0) -> list:
+        moves = list(generate_legal_codes(self.position))
+        return list(self.ordering.ordered_moves(self.position, moves, tt_move, ply))
+
+    def test_captures_by_mvv_lva(self):
+        moves = self.ordered()
+        self.assertEqual(moves[:2], [move_of(Square.c3, Square.d5), move_of(Square.d1, Square.d2)])
+        self.assertGreater(mvv_lva(ChessPieceType.KNIGHT, ChessPieceType.QUEEN),
+                           mvv_lva(ChessPieceType.ROOK, ChessPieceType.QUEEN))
+        self.assertGreater(mvv_lva(ChessPieceType.QUEEN, ChessPieceType.ROOK),
+                           mvv_lva(ChessPieceType.PAWN, ChessPieceType.KNIGHT))
+
+    def test_underpromotions_come_last(self):
+        self.position = Position.from_fen("4k3/1P6/8/8/8/8/8/K7 w - - 0 1")
+        moves = self.ordered()
+        self.assertEqual(moves[0], move_of(Square.b7, Square.b8, ColorChessPiece.WHITE_QUEEN))
+        self.assertEqual(set(moves[-3:]),
+                         {move_of(Square.b7, Square.b8, piece) for piece in (
+                             ColorChessPiece.WHITE_ROOK, ColorChessPiece.WHITE_BISHOP,
+                             ColorChessPiece.WHITE_KNIGHT)})
+
+    def test_hash_move_comes_first(self):
+        quiet = move_of(Square.c3, Square.a4)
+        self.assertEqual(self.ordered(tt_move=quiet)[0], quiet)
+
+    def test_killer_precedes_other_quiets(self):
+        killer = move_of(Square.c3, Square.b1)
+        self.ordering.update_quiet_cutoff(killer, True, depth=1, ply=3)
+        moves = self.ordered(ply=3)
+        captures = [move for move in moves if self.position.piece_on(move >> 6 & 0x3F)]
+        self.assertEqual(moves[len(captures)], killer)
+        self.assertTrue(self.ordering.is_killer(killer, 3))
+        self.assertFalse(self.ordering.is_killer(killer, 2))
+
+    def test_history_orders_quiets(self):
+        quiet = move_of(Square.c3, Square.e4)
+        self.ordering.update_quiet_cutoff(quiet, True, depth=4, ply=5)
+        moves = self.ordered(ply=0)
+        captures = [move for move in moves if self.position.piece_on(move >> 6 & 0x3F)]
+        self.assertEqual(moves[len(captures)], quiet)
+        self.assertEqual(self.ordering.history_score(True, Square.c3.value, Square.e4.value), 16)
+        self.assertEqual(self.ordering.history_score(False, Square.c3.value, Square.e4.value), 0)
+
+    def test_age_halves_history_and_clears_killers(self):
+        quiet = move_of(Square.c3, Square.e4)
+        self.ordering.update_quiet_cutoff(quiet, True, depth=4, ply=0)
+        self.ordering.age()
+        self.assertEqual(self.ordering.history_score(True, Square.c3.value, Square.e4.value), 8)
+        self.assertFalse(self.ordering.is_killer(quiet, 0))
+
+    def test_history_is_bounded(self):
+        quiet = move_of(Square.c3, Square.e4)
+        for _ in range(HISTORY_LIMIT // 10000 + 1):
+            self.ordering.update_quiet_cutoff(quiet, True, depth=100, ply=0)
+        self.assertLess(self.ordering.history_score(True, Square.c3.value, Square.e4.value),
+                        HISTORY_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from parameterized import parameterized
+
+from chess_insights.engine.legal_moves import generate_legal_codes
+from chess_insights.engine.move_ordering import MoveOrdering
+from chess_insights.engine.moves import encode_move
+from chess_insights.engine.move_picker import MovePicker, Stage
+from chess_insights.game.position import Position
+from chess_insights.util.enum_chess_piece_type import ColorChessPiece
+from chess_insights.util.enum_square import Square
+
+
+class TestMovePicker(unittest.TestCase):
+
+    @parameterized.expand([
+        ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"),
+        ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"),
+        ("position_4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"),
+        ("en_passant", "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"),
+    ])
+    def test_yields_every_legal_move_once(self, _, fen):
+        position = Position.from_fen(fen)
+        ordering = MoveOrdering()
+        legal_moves = generate_legal_codes(position)
+        ordering.update_quiet_cutoff(legal_moves[-1], position.is_whites_turn, 2, 0)
+        picked = list(MovePicker(position, ordering, legal_moves[0]))
+        self.assertEqual(len(picked), len(legal_moves))
+        self.assertEqual(set(picked), set(legal_moves))
+
+    def test_stage_order(self):
+        # Rook takes a defended pawn (bad), knight takes the queen (good)
+        position = Position.from_fen("4k3/8/8/3q4/3p4/4N3/8/K2R4 w - - 0 1")
+        ordering = MoveOrdering()
+        killer = encode_move((Square.a1.value, Square.b1.value, None))
+        ordering.update_quiet_cutoff(killer, True, 1, 0)
+        hash_move = encode_move((Square.d1.value, Square.e1.value, None))
+        picker = MovePicker(position, ordering, hash_move)
+        moves = iter(picker)
+
+        self.assertEqual(next(moves), hash_move)
+        self.assertEqual(picker.stage, Stage.HASH_MOVE)
+        self.assertEqual(next(moves), encode_move((Square.e3.value, Square.d5.value, None)))
+        self.assertEqual(picker.stage, Stage.GOOD_CAPTURES)
+        self.assertEqual(next(moves), killer)
+        self.assertEqual(picker.stage, Stage.KILLERS)
+        rest = list(moves)
+        self.assertEqual(rest[-1], encode_move((Square.d1.value, Square.d4.value, None)))
+        self.assertEqual(picker.stage, Stage.BAD_CAPTURES)
+
+    def test_illegal_hash_move_is_skipped(self):
+        position = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        picker = MovePicker(position, MoveOrdering(),
+                            encode_move((Square.e2.value, Square.e5.value, None)))
+        self.assertEqual(len(list(picker)), 20)
+
+    def test_promotions(self):
+        position = Position.from_fen("1n5k/P7/8/8/8/8/8/K7 w - - 0 1")
+        picker = MovePicker(position, MoveOrdering())
+        moves = list(picker)
+        self.assertEqual(moves[:2], [
+            encode_move((Square.a7.value, Square.b8.value, ColorChessPiece.WHITE_QUEEN)),
+            encode_move((Square.a7.value, Square.a8.value, ColorChessPiece.WHITE_QUEEN))])
+        self.assertEqual(len([move for move in moves if move >> 12]), 8)
+        self.assertFalse(picker.is_quiet(moves[0]))
+
+    def test_no_moves(self):
+        self.assertFalse(MovePicker(Position.from_fen("7k/5Q2/8/8/8/8/8/7K b - - 0 1"),
+                                    MoveOrdering()).has_moves())
+
+
+if __name__ == "__main__":
+    unittest.main()
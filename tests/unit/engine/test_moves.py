@@ -0,0 +1,53 @@
+import unittest
+
+from chess_insights.engine.legal_moves import fill_legal_moves, generate_legal_codes, \
+    generate_legal_moves
+from chess_insights.engine.moves import MAX_MOVES, decode_move, encode_move, make_move, \
+    move_to_string, new_move_buffer, pack_move
+from chess_insights.game.position import Position
+from chess_insights.util.enum_chess_piece_type import ColorChessPiece
+from chess_insights.util.enum_square import Square
+
+POSITION_4 = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 {} kq - 0 1"
+
+
+class TestMoves(unittest.TestCase):
+
+    def test_encode_move(self):
+        self.assertEqual(encode_move((Square.e2.value, Square.e4.value, None)),
+                         Square.e2.value | Square.e4.value << 6)
+        self.assertEqual(encode_move((Square.a7.value, Square.a8.value,
+                                      ColorChessPiece.WHITE_QUEEN)) >> 12, 1)
+        self.assertEqual(encode_move((Square.a7.value, Square.a8.value,
+                                      ColorChessPiece.WHITE_KNIGHT)) >> 12, 4)
+        self.assertEqual(pack_move(Square.a7.value, Square.a8.value, 4),
+                         Square.a7.value | Square.a8.value << 6 | 4 << 12)
+
+    def test_decode_move_inverts_encode_move(self):
+        for side in "wb":
+            position = Position.from_fen(POSITION_4.format(side))
+            for move in generate_legal_moves(position):
+                self.assertEqual(decode_move(position, encode_move(move)), move)
+        self.assertEqual(decode_move(Position.from_fen(POSITION_4.format("w")),
+                                     8 | 0 << 6 | 4 << 12)[2], ColorChessPiece.WHITE_KNIGHT)
+
+    def test_fill_legal_moves_reuses_buffer(self):
+        buffer = new_move_buffer()
+        self.assertEqual(len(buffer), MAX_MOVES)
+        for side in "wb":
+            position = Position.from_fen(POSITION_4.format(side))
+            count = fill_legal_moves(position, buffer)
+            self.assertEqual(list(buffer[:count]),
+                             [encode_move(move) for move in generate_legal_moves(position)])
+            self.assertEqual(generate_legal_codes(position), buffer[:count])
+
+    def test_make_move_and_notation(self):
+        position = Position.from_fen("7k/P7/8/8/8/8/8/K7 w - - 0 1")
+        code = pack_move(Square.a7.value, Square.a8.value, 3)
+        self.assertEqual(move_to_string(code), "a7a8b")
+        make_move(position, code)
+        self.assertEqual(position.piece_on(Square.a8.value), ColorChessPiece.WHITE_BISHOP)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from chess_insights.engine.moves import encode_move
+from chess_insights.engine.opening_book import ENTRY, BookEntry, OpeningBook, build_book, main, \
+    write_book
+from chess_insights.game.position import Position
+from chess_insights.util.enum_square import Square
+
+GAMES = """[Event "A"]
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Event "B"]
+1. e4 c5 2. Nf3 0-1
+
+[Event "C"]
+1. d4 d5 1/2-1/2
+
+[Event "D"]
+1. e4 e5 2. Qh5 Zz9 3. Bc4 *
+"""
+
+
+def move_code(origin: Square, target: Square) -> int:
+    return encode_move((origin.value, target.value, None))
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "book.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build_weights_moves_by_result(self):
+        entries = build_book([GAMES])
+        start = Position.from_fen()
+        root = [entry for entry in entries if entry.key == start.hash]
+        # e4: win + loss + unknown; d4: draw
+        self.assertEqual([(entry.move, entry.weight) for entry in root],
+                         [(move_code(Square.e2, Square.e4), 3),
+                          (move_code(Square.d2, Square.d4), 1)])
+        self.assertEqual(entries, sorted(entries, key=lambda entry: (entry.key, -entry.weight)))
+        # Game D stops at its malformed move; 2... Nc6 and 2. Nf3 in the Sicilian only lost
+        self.assertEqual(len(entries), 7)
+
+    def test_max_plies(self):
+        self.assertEqual(len({entry.key for entry in build_book([GAMES], max_plies=1)}), 1)
+
+    def test_lookup_from_mapped_file(self):
+        write_book(build_book([GAMES]), self.path)
+        self.assertEqual(os.path.getsize(self.path) % ENTRY.size, 0)
+        with OpeningBook(self.path) as book:
+            position = Position.from_fen()
+            self.assertEqual(book.choose_move(position), (Square.e2.value, Square.e4.value, None))
+            position.make_move(Square.e2.value, Square.e4.value)
+            self.assertEqual(book.choose_move(position), (Square.c7.value, Square.c5.value, None))
+            moves = {book.choose_move(Position.from_fen(), random.Random(seed))
+                     for seed in range(20)}
+            self.assertEqual(moves, {(Square.e2.value, Square.e4.value, None),
+                                     (Square.d2.value, Square.d4.value, None)})
+            self.assertIsNone(book.choose_move(Position.from_fen(
+                "4k3/8/8/8/8/8/8/4K3 w - - 0 1")))
+
+    def test_illegal_book_moves_are_skipped(self):
+        start = Position.from_fen()
+        write_book([BookEntry(start.hash, move_code(Square.e2, Square.e5), 9),
+                    BookEntry(start.hash, move_code(Square.g1, Square.f3), 1)], self.path)
+        with OpeningBook(self.path) as book:
+            self.assertEqual(len(book.entries(start.hash)), 2)
+            self.assertEqual(book.choose_move(start), (Square.g1.value, Square.f3.value, None))
+
+    def test_empty_and_invalid_files(self):
+        write_book([], self.path)
+        with OpeningBook(self.path) as book:
+            self.assertEqual(len(book), 0)
+            self.assertIsNone(book.choose_move(Position.from_fen()))
+        with open(self.path, "wb") as file:
+            file.write(b"\x00" * 15)
+        with self.assertRaises(ValueError):
+            OpeningBook(self.path)
+
+    def test_cli_builds_book(self):
+        pgn_path = os.path.join(self.directory.name, "games.pgn")
+        with open(pgn_path, "w") as file:
+            file.write(GAMES)
+        with open(os.devnull, "w") as devnull, mock.patch("sys.stdout", devnull):
+            self.assertEqual(main([pgn_path, "-o", self.path, "--max-plies", "2"]), 0)
+        with OpeningBook(self.path) as book:
+            self.assertEqual(len(book), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from chess_insights.engine.legal_moves import generate_legal_moves
+from chess_insights.engine.moves import encode_move
+from chess_insights.engine.parallel import legal_moves_batch
+from chess_insights.engine.perft import REFERENCE_POSITIONS
+from chess_insights.game.position import Position
+
+FENS = [reference.fen for reference in REFERENCE_POSITIONS]
+
+
+class TestParallel(unittest.TestCase):
+
+    def test_legal_moves_batch_keeps_order(self):
+        expected = [[encode_move(move) for move in generate_legal_moves(Position.from_fen(fen))]
+                    for fen in FENS]
+        self.assertEqual([list(moves) for moves in legal_moves_batch(FENS, workers=1)], expected)
+        self.assertEqual([list(moves) for moves in legal_moves_batch(FENS * 3, workers=2)],
+                         expected * 3)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            batch = legal_moves_batch(FENS, workers=2, executor=executor)
+        self.assertEqual([len(moves) for moves in batch], [20, 48, 14, 6, 44, 46])
+        self.assertEqual(legal_moves_batch([], workers=2), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
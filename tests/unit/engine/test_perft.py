@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from chess_insights.engine.perft import REFERENCE_POSITIONS, _split_tasks, divide, main, \
+    parallel_divide, perft, run_suite
+from chess_insights.game.position import Position
+
+
+class TestPerft(unittest.TestCase):
+
+    @parameterized.expand([(reference.name, reference.fen, reference.node_counts)
+                           for reference in REFERENCE_POSITIONS])
+    def test_reference_counts(self, _, fen, node_counts):
+        position = Position.from_fen(fen)
+        for depth in (1, 2):
+            self.assertEqual(perft(position, depth), node_counts[depth - 1])
+        self.assertEqual(position.ply, 0)
+
+    def test_divide_sums_to_perft(self):
+        position = Position.from_fen(REFERENCE_POSITIONS[3].fen)
+        split = divide(position, 2)
+        self.assertEqual(sum(split.values()), 264)
+        self.assertEqual(len(split), 6)
+        self.assertIn("b2a1q", divide(Position.from_fen(
+            "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 0 1"), 1))
+
+    def test_run_suite(self):
+        results = run_suite(2, ["start", "position_3"])
+        self.assertEqual([result["name"] for result in results], ["start", "position_3"])
+        self.assertTrue(all(result["passed"] for result in results))
+        with self.assertRaises(ValueError):
+            run_suite(1, ["unknown"])
+
+    def test_cli_writes_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "perft.json")
+            with open(os.devnull, "w") as devnull, mock.patch("sys.stdout", devnull):
+                exit_code = main(["--depth", "2", "--position", "kiwipete", "--divide",
+                                  "--json", path])
+            with open(path) as file:
+                report = json.load(file)
+        self.assertEqual(exit_code, 0)
+        result = report["results"][0]
+        self.assertEqual((result["nodes"], result["expected"]), (2039, 2039))
+        self.assertEqual(len(result["divide"]), 48)
+        self.assertIn("nodes_per_second", result)
+
+    def test_parallel_divide_matches_divide(self):
+        fen = REFERENCE_POSITIONS[1].fen
+        expected = divide(Position.from_fen(fen), 2)
+        self.assertEqual(parallel_divide(fen, 2, workers=2), expected)
+        self.assertEqual(parallel_divide(fen, 2, workers=1), expected)
+        self.assertEqual(parallel_divide("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1", 2, workers=2), {})
+
+    def test_split_tasks_extends_prefixes_until_enough(self):
+        position = Position.from_fen(REFERENCE_POSITIONS[0].fen)
+        self.assertEqual(len(_split_tasks(position, 3, 8)), 20)
+        tasks = _split_tasks(position, 3, 64)
+        self.assertEqual(len(tasks), 400)
+        self.assertTrue(all(len(prefix) == 2 and depth == 1 for prefix, depth in tasks))
+        self.assertEqual(len(_split_tasks(position, 2, 1000)), 20)
+        self.assertEqual(position.ply, 0)
+
+    def test_parallel_suite(self):
+        results = run_suite(3, ["position_3"], workers=2)
+        self.assertTrue(results[0]["passed"])
+        self.assertEqual(results[0]["workers"], 2)
+        self.assertNotIn("divide", results[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import itertools
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from chess_insights.engine.search import MATE_SCORE, SearchLimits, Searcher, score_from_tt, \
+    score_to_tt
+from chess_insights.game.position import Position
+from chess_insights.util.enum_chess_piece_type import ColorChessPiece
+from chess_insights.util.enum_square import Square
+
+
+class TestSearch(unittest.TestCase):
+
+    @parameterized.expand([
+        ("back_rank_mate", "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1", Square.a1, Square.a8),
+        ("free_queen", "4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1", Square.d1, Square.d5),
+        ("black_mate", "r5k1/8/8/8/8/8/5PPP/6K1 b - - 0 1", Square.a8, Square.a1),
+    ])
+    def test_finds_best_move(self, _, fen, origin, target):
+        result = Searcher(Position.from_fen(fen)).search(SearchLimits(time_limit_ms=None,
+                                                                      max_depth=3))
+        self.assertEqual(result.move[:2], (origin.value, target.value))
+
+    def test_search_can_start_deeper(self):
+        result = Searcher(Position.from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")).search(
+            SearchLimits(time_limit_ms=None, max_depth=3), start_depth=3)
+        self.assertEqual((result.move[:2], result.depth), ((Square.d1.value, Square.d5.value), 3))
+
+    def test_quiescence_sees_recapture(self):
+        # At depth 1 Qxd5 wins a pawn unless the recapture exd5 is searched
+        position = Position.from_fen("4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1")
+        result = Searcher(position).search(SearchLimits(time_limit_ms=None, max_depth=1))
+        self.assertNotEqual(result.move[:2], (Square.d1.value, Square.d5.value))
+
+    def test_quiescence_detects_mate_in_check(self):
+        position = Position.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")
+        searcher = Searcher(position)
+        position.make_move(Square.a1.value, Square.a8.value)
+        self.assertEqual(searcher._quiescence(-MATE_SCORE, MATE_SCORE, 1), -MATE_SCORE + 1)
+
+    def test_mate_score(self):
+        result = Searcher(Position.from_fen("6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1")).search(
+            SearchLimits(time_limit_ms=None, max_depth=3))
+        self.assertEqual(result.score, MATE_SCORE - 1)
+
+    def test_underpromotion_at_the_root(self):
+        # f8=N is the only mate; f8=Q does not even give check
+        result = Searcher(Position.from_fen("6br/5Ppk/6pp/8/8/8/8/K7 w - - 0 1")).search(
+            SearchLimits(time_limit_ms=None, max_depth=3))
+        self.assertEqual(result.move, (Square.f7.value, Square.f8.value,
+                                       ColorChessPiece.WHITE_KNIGHT))
+        self.assertEqual(result.score, MATE_SCORE - 1)
+
+    def test_node_budget_is_respected(self):
+        position = Position.from_fen(
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        result = Searcher(position).search(SearchLimits(time_limit_ms=None, max_nodes=500))
+        self.assertIsNotNone(result.move)
+        self.assertLess(result.nodes, 500 + 64)
+        self.assertEqual(position.ply, 0)
+
+    def test_deadline_is_respected(self):
+        position = Position.from_fen(
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        # Every reading of the clock advances it by 50 microseconds, so the deadline falls at the
+        # same node on any machine, with or without coverage tracing; it cuts an iteration short
+        clock = itertools.count(step=0.00005)
+        with mock.patch("chess_insights.engine.search.time") as fake_time:
+            fake_time.perf_counter.side_effect = lambda: next(clock)
+            result = Searcher(position).search(SearchLimits(time_limit_ms=50))
+        self.assertGreaterEqual(result.elapsed_ms, 50)
+        self.assertLess(result.elapsed_ms, 51)
+        self.assertIsNotNone(result.move)
+        self.assertEqual(position.ply, 0)
+
+    def test_no_legal_moves(self):
+        result = Searcher(Position.from_fen("7k/5Q2/8/8/8/8/8/7K b - - 0 1")).search()
+        self.assertIsNone(result.move)
+
+    def test_repetition_scores_as_draw(self):
+        # Behind on material, black repeats checks (Qh4+ Kg1 Qe1+ Kh2) instead of playing on
+        position = Position.from_fen("6k1/R7/1R6/8/PPP5/8/6PK/4q3 b - - 0 1")
+        result = Searcher(position).search(SearchLimits(time_limit_ms=None, max_depth=4))
+        self.assertEqual(result.score, 0)
+
+    def test_mate_scores_are_stored_relative_to_node(self):
+        self.assertEqual(score_to_tt(MATE_SCORE - 5, 3), MATE_SCORE - 2)
+        self.assertEqual(score_from_tt(score_to_tt(-MATE_SCORE + 5, 3), 3), -MATE_SCORE + 5)
+        self.assertEqual(score_to_tt(150, 3), 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
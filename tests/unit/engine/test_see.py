@@ -0,0 +1,48 @@
+import unittest
+
+from parameterized import parameterized
+
+from chess_insights.engine.moves import encode_move
+from chess_insights.engine.see import attackers_to, static_exchange_evaluation
+from chess_insights.game.position import Position
+from chess_insights.util.enum_chess_piece_type import ColorChessPiece
+from chess_insights.util.enum_square import Square
+
+
+class TestStaticExchangeEvaluation(unittest.TestCase):
+
+    @parameterized.expand([
+        ("undefended_knight", "4k3/8/8/3n4/4P3/8/8/4K3 w - - 0 1", Square.e4, Square.d5, 320),
+        ("defended_pawn", "4k3/8/4p3/3p4/8/8/8/3RK3 w - - 0 1", Square.d1, Square.d5, -400),
+        ("equal_trade", "4k3/8/4p3/3n4/8/2N5/8/4K3 w - - 0 1", Square.c3, Square.d5, 0),
+        ("xray_battery", "3rk3/8/8/3p4/8/8/3R4/3RK3 w - - 0 1", Square.d2, Square.d5, 100),
+        ("xray_defender", "3rk3/3r4/8/3p4/8/8/8/3RK3 w - - 0 1", Square.d1, Square.d5, -400),
+        ("queen_behind_bishop", "4k3/6p1/5r2/8/8/2B5/1Q6/4K3 w - - 0 1", Square.c3, Square.f6,
+         500 - 330 + 100),
+        ("en_passant", "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", Square.e5, Square.d6, 100),
+        ("king_cannot_take_defended", "3rk3/8/8/7b/8/8/8/3NK3 b - - 0 1", Square.d8, Square.d1,
+         320),
+    ])
+    def test_static_exchange_evaluation(self, _, fen, origin, target, expected):
+        position = Position.from_fen(fen)
+        self.assertEqual(static_exchange_evaluation(
+            position, encode_move((origin.value, target.value, None))), expected)
+
+    def test_promotion_capture(self):
+        position = Position.from_fen("1r2k3/P7/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertEqual(static_exchange_evaluation(
+            position, encode_move((Square.a7.value, Square.b8.value, ColorChessPiece.WHITE_QUEEN))),
+            1300)
+
+    def test_attackers_to(self):
+        position = Position.from_fen("4k3/8/4p3/3p4/8/8/3R4/3RK3 w - - 0 1")
+        occupancy = position.piece_boards[ColorChessPiece.ALL_PIECES]
+        expected = 1 << Square.e6.value | 1 << Square.d2.value
+        self.assertEqual(attackers_to(position.boards, Square.d5.value, occupancy), expected)
+        occupancy ^= 1 << Square.d2.value
+        self.assertEqual(attackers_to(position.boards, Square.d5.value, occupancy) & occupancy,
+                         1 << Square.e6.value | 1 << Square.d1.value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from array import array
+
+from chess_insights.engine.transposition_table import BUCKET_BYTES, Bound, ReplacementPolicy, \
+    SharedTranspositionTable, TranspositionTable
+
+
+def make_table(policy: ReplacementPolicy = ReplacementPolicy.DEPTH_PREFERRED
+               ) -> TranspositionTable:
+    # A single bucket, so every key competes for the same two slots
+    return TranspositionTable(size_mb=BUCKET_BYTES / (1024 * 1024), policy=policy)
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_size_is_preallocated(self):
+        table = TranspositionTable(size_mb=1)
+        self.assertEqual(table.size_bytes, 1024 * 1024)
+        self.assertEqual(len(table.table) * table.table.itemsize, 1024 * 1024)
+
+    def test_store_and_probe(self):
+        table = make_table()
+        key = 0xDEADBEEFCAFEBABE
+        table.store(key, move=1234, score=-250, depth=7, bound=Bound.LOWER)
+        entry = table.probe(key)
+        self.assertEqual((entry.move, entry.score, entry.depth, entry.bound),
+                         (1234, -250, 7, Bound.LOWER))
+        self.assertIsNone(table.probe(key ^ 1))
+        self.assertEqual((table.probes, table.hits), (2, 1))
+        self.assertEqual(table.hit_rate(), 0.5)
+
+    def test_same_position_keeps_move_when_none_given(self):
+        table = make_table()
+        table.store(5, move=77, score=10, depth=3, bound=Bound.EXACT)
+        table.store(5, move=0, score=20, depth=4, bound=Bound.UPPER)
+        entry = table.probe(5)
+        self.assertEqual((entry.move, entry.score, entry.depth), (77, 20, 4))
+        self.assertEqual(table.filled, 1)
+
+    def test_depth_preferred_evicts_shallowest(self):
+        table = make_table()
+        table.store(1, move=1, score=0, depth=8, bound=Bound.EXACT)
+        table.store(2, move=2, score=0, depth=2, bound=Bound.EXACT)
+        table.store(3, move=3, score=0, depth=5, bound=Bound.EXACT)
+        self.assertIsNotNone(table.probe(1))
+        self.assertIsNone(table.probe(2))
+        self.assertIsNotNone(table.probe(3))
+        self.assertEqual(table.collisions, 1)
+        self.assertEqual(table.fill_rate(), 1.0)
+
+    def test_depth_preferred_evicts_stale_generation_first(self):
+        table = make_table()
+        table.store(1, move=1, score=0, depth=8, bound=Bound.EXACT)
+        table.new_search()
+        table.store(2, move=2, score=0, depth=2, bound=Bound.EXACT)
+        table.store(3, move=3, score=0, depth=1, bound=Bound.EXACT)
+        self.assertIsNone(table.probe(1))
+        self.assertEqual(table.probe(3).generation, 1)
+        self.assertEqual(table.collisions, 0)
+
+    def test_always_replace_keeps_newest(self):
+        table = make_table(ReplacementPolicy.ALWAYS_REPLACE)
+        table.store(1, move=1, score=0, depth=8, bound=Bound.EXACT)
+        table.store(2, move=2, score=0, depth=9, bound=Bound.EXACT)
+        table.store(3, move=3, score=0, depth=1, bound=Bound.EXACT)
+        self.assertIsNone(table.probe(1))
+        self.assertIsNotNone(table.probe(2))
+        self.assertIsNotNone(table.probe(3))
+
+    def test_torn_entry_is_rejected(self):
+        table = make_table()
+        table.store(42, move=9, score=1, depth=1, bound=Bound.EXACT)
+        table.table[1] ^= 1 << 20
+        self.assertIsNone(table.probe(42))
+
+    def test_clear(self):
+        table = make_table()
+        table.store(42, move=9, score=1, depth=1, bound=Bound.EXACT)
+        table.new_search()
+        table.clear()
+        self.assertIsNone(table.probe(42))
+        self.assertEqual((table.filled, table.generation), (0, 0))
+
+    def test_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            TranspositionTable(size_mb=0)
+        with self.assertRaises(ValueError):
+            TranspositionTable(table=array('Q', [0] * 3))
+
+    def test_shared_table_is_seen_by_attached_tables(self):
+        owner = SharedTranspositionTable(size_mb=1)
+        attached = SharedTranspositionTable(name=owner.name)
+        try:
+            self.assertEqual(attached.capacity, owner.capacity)
+            owner.new_search()
+            attached.new_search()  # only the owner advances the generation
+            self.assertEqual((owner.generation, attached.generation), (1, 1))
+            owner.store(42, move=99, score=-5, depth=3, bound=Bound.EXACT)
+            entry = attached.probe(42)
+            self.assertEqual((entry.move, entry.score, entry.generation), (99, -5, 1))
+            attached.store(43, move=7, score=1, depth=1, bound=Bound.UPPER)
+            self.assertEqual(owner.probe(43).move, 7)
+        finally:
+            attached.close()
+            owner.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -195,6 +195,17 @@ class TestChessBoard(unittest.TestCase):
         self.assertEqual(new_board.get_piece_on_square(Square.e8.value),
                          ColorChessPiece.WHITE_QUEEN)
 
+    def test_pawn_underpromotion(self):
+        """Ensure pawns become the piece asked for, and nothing a pawn cannot become."""
+        board = ChessBoard("8/4P3/8/8/8/8/8/k6K w - - 0 1")
+        with self.assertRaises(ValueError):
+            board.move_piece(Square.e7.value, Square.e8.value, ColorChessPiece.WHITE_KING)
+        with self.assertRaises(ValueError):
+            board.move_piece(Square.e7.value, Square.e8.value, ColorChessPiece.BLACK_ROOK)
+        board.move_piece(Square.e7.value, Square.e8.value, ColorChessPiece.WHITE_ROOK)
+        self.assertEqual(board.get_piece_on_square(Square.e8.value), ColorChessPiece.WHITE_ROOK)
+        self.assertEqual(board.pgn, "1. e8=R ")
+
     def test_en_passant_failure(self):
         """Ensure en passant cannot be performed when conditions are not met."""
         self.chess_board = ChessBoard("rnbqkbnr/pppp1ppp/8/4pP2/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 3")
@@ -218,6 +229,32 @@ class TestChessBoard(unittest.TestCase):
         self.assertEqual(new_board.check_game_status(new_board.board_state),
                          GameStatus.DRAW_50_MOVE)
 
+    def test_insufficient_material_draw(self):
+        board = ChessBoard("4k3/8/8/8/8/8/8/2B1K3 b - - 0 1")
+        self.assertEqual(board.check_game_status(board.board_state),
+                         GameStatus.DRAW_INSUFFICIENT_MATERIAL)
+
+    def test_checkmate_takes_precedence_over_fifty_move_rule(self):
+        board = ChessBoard("6k1/6Q1/6K1/8/8/8/8/8 b - - 50 80")
+        self.assertEqual(board.check_game_status(board.board_state), GameStatus.CHECKMATE)
+
+    def test_threefold_repetition_draw(self):
+        """Ensure shuffling knights back to the start position three times is a draw."""
+        shuffle = [(Square.g1, Square.f3), (Square.g8, Square.f6),
+                   (Square.f3, Square.g1), (Square.f6, Square.g8)]
+        for origin, target in shuffle:
+            self.chess_board.move_piece(origin.value, target.value)
+        board_state = self.chess_board.board_state
+        self.assertEqual(self.chess_board.check_game_status(board_state,
+                                                            self.chess_board.position.hash_history),
+                         GameStatus.ONGOING)
+        for origin, target in shuffle:
+            self.chess_board.move_piece(origin.value, target.value)
+        self.assertEqual(self.chess_board.check_game_status(self.chess_board.board_state,
+                                                            self.chess_board.position.hash_history),
+                         GameStatus.DRAW_REPETITION)
+        self.assertTrue(self.chess_board.pgn.rstrip().endswith("1/2-1/2"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,37 +1,10 @@
 import unittest
 
-from chess_insights.game.chess_board import ChessBoard
-from chess_insights.util.enum_chess_piece_type import Color, ChessPieceType
-from chess_insights.engine.bitboard import BitBoard
-from chess_insights.game.pawn import pawn_promotion, pawn_movement, \
-    is_pawn_starting_rank, handle_en_passant, handle_en_passant_capture
+from chess_insights.util.enum_chess_piece_type import Color
+from chess_insights.game.pawn import pawn_movement, is_pawn_starting_rank
 
 
 class TestPawn(unittest.TestCase):
-    def setUp(self):
-        self.chess_board = ChessBoard()
-        self.new_piece_locations = {}
-
-    def test_pawn_double_move_sets_en_passant(self):
-        origin_square = 8  # e2 (index 8 in bitboard)
-        target_square = 24  # e4 (index 24 in bitboard)
-        piece_type = Color.WHITE.get_color_piece_by_type(ChessPieceType.PAWN)
-        en_passant_square = handle_en_passant(origin_square, target_square, piece_type.color)
-        self.assertEqual(en_passant_square, 1 << 16)  # e3 should be en passant target
-
-    def test_pawn_promotion(self):
-        target_square = 56
-        color = Color.WHITE
-        piece_locations = {
-            color.get_color_piece_by_type(ChessPieceType.PAWN): BitBoard(1 << target_square),
-            color.get_color_piece_by_type(ChessPieceType.QUEEN): BitBoard(0)
-        }
-        pawn_promotion(target_square, piece_locations, color)
-        self.assertEqual(piece_locations[color.get_color_piece_by_type(ChessPieceType.PAWN)].board,
-                         0)
-        self.assertNotEqual(
-            piece_locations[color.get_color_piece_by_type(ChessPieceType.QUEEN)].board, 0)
-
     def test_pawn_movement_white(self):
         square = 8  # e2
         move1, move2 = pawn_movement(Color.WHITE, square)
@@ -0,0 +1,190 @@
+import unittest
+
+from parameterized import parameterized
+
+from chess_insights.game.position import ALL_PIECES, BLACK_OFFSET, LIGHT_SQUARES, QUEEN, Position
+from chess_insights.util.enum_chess_piece_type import Color, ColorChessPiece
+from chess_insights.util.enum_square import Square, squares_to_board
+from chess_insights.util.fen import fen_from_board
+
+
+def snapshot(position: Position) -> tuple:
+    return (dict(position.piece_boards), position.is_whites_turn, position.en_passant_square,
+            position.fifty_move_rule, position.move_number, position.castling_rights,
+            position.hash, tuple(position.mailbox))
+
+
+class TestPosition(unittest.TestCase):
+
+    def test_board_state_round_trip(self):
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        position = Position.from_fen(fen)
+        self.assertEqual(fen_from_board(position.to_board_state()), fen)
+
+    @parameterized.expand([
+        ("quiet", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+         Square.g1, Square.f3, None),
+        ("double_push", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+         Square.e2, Square.e4, None),
+        ("capture", "rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2",
+         Square.e4, Square.d5, None),
+        ("en_passant", "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+         Square.e5, Square.f6, None),
+        ("castle_kingside", "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1",
+         Square.e1, Square.g1, None),
+        ("castle_queenside", "r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1",
+         Square.e8, Square.c8, None),
+        ("promotion", "1n5k/P7/8/8/8/8/8/K7 w - - 0 1",
+         Square.a7, Square.a8, None),
+        ("capture_promotion", "1n5k/P7/8/8/8/8/8/K7 w - - 0 1",
+         Square.a7, Square.b8, ColorChessPiece.WHITE_KNIGHT),
+        ("rook_capture", "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1",
+         Square.a1, Square.a8, None),
+    ])
+    def test_unmake_restores_position(self, _, fen, origin, target, promotion):
+        position = Position.from_fen(fen)
+        before = snapshot(position)
+        position.make_move(origin.value, target.value, promotion)
+        self.assertNotEqual(snapshot(position), before)
+        self.assertEqual(position.mailbox,
+                         Position.from_fen(fen_from_board(position.to_board_state())).mailbox)
+        position.unmake_move()
+        self.assertEqual(snapshot(position), before)
+        self.assertEqual(position.ply, 0)
+
+    def test_en_passant_removes_captured_pawn(self):
+        position = Position.from_fen("rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3")
+        position.make_move(Square.e5.value, Square.f6.value)
+        self.assertEqual(position.piece_on(Square.f6.value), ColorChessPiece.WHITE_PAWN)
+        self.assertIsNone(position.piece_on(Square.f5.value))
+        self.assertEqual(position.fifty_move_rule, 0)
+
+    def test_castling_moves_rook_and_clears_rights(self):
+        position = Position.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        position.make_move(Square.e1.value, Square.c1.value)
+        self.assertEqual(position.piece_on(Square.d1.value), ColorChessPiece.WHITE_ROOK)
+        self.assertIsNone(position.piece_on(Square.a1.value))
+        self.assertEqual(position.castling_rights, 0b1100)
+
+    def test_capturing_rook_clears_opponent_right(self):
+        position = Position.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        position.make_move(Square.h1.value, Square.h8.value)
+        self.assertEqual(position.castling_rights, 0b1010)
+
+    def test_double_push_sets_en_passant_square(self):
+        position = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        position.make_move(Square.d2.value, Square.d4.value)
+        self.assertEqual(position.en_passant_square, 1 << Square.d3.value)
+        position.make_move(Square.g8.value, Square.f6.value)
+        self.assertEqual(position.en_passant_square, 0)
+        self.assertEqual(position.fifty_move_rule, 1)
+
+    def test_underpromotion(self):
+        position = Position.from_fen("7k/P7/8/8/8/8/8/K7 w - - 0 1")
+        position.make_move(Square.a7.value, Square.a8.value, ColorChessPiece.WHITE_ROOK)
+        self.assertEqual(position.piece_on(Square.a8.value), ColorChessPiece.WHITE_ROOK)
+        self.assertEqual(position.piece_boards[ColorChessPiece.WHITE_PAWN], 0)
+
+    def test_occupancy_tracks_moves(self):
+        position = Position.from_fen("rnbqkbnr/ppp1pppp/8/3p4/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2")
+        position.make_move(Square.e4.value, Square.d5.value)
+        boards = position.piece_boards
+        self.assertEqual(boards[ColorChessPiece.ALL_PIECES],
+                         boards[ColorChessPiece.WHITE_PIECES] | boards[ColorChessPiece.BLACK_PIECES])
+        self.assertEqual(bin(boards[ColorChessPiece.ALL_PIECES]).count('1'), 31)
+
+    def test_piece_boards_is_a_view_of_boards(self):
+        position = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        self.assertEqual(len(position.boards), 15)
+        for piece in ColorChessPiece:
+            self.assertEqual(position.piece_boards[piece], position.boards[piece.index])
+        self.assertEqual(position.boards[BLACK_OFFSET + QUEEN], 1 << Square.d8.value)
+        self.assertEqual(position.boards[ALL_PIECES], 0xFFFF00000000FFFF)
+        position.make_move(Square.e2.value, Square.e4.value)
+        self.assertEqual(position.piece_boards[ColorChessPiece.WHITE_PAWN],
+                         0xFF00 ^ 1 << Square.e2.value | 1 << Square.e4.value)
+        self.assertEqual(set(position.piece_boards), set(ColorChessPiece))
+
+    @parameterized.expand([
+        ("r3k2r/8/8/8/8/4Q3/8/R3K2R b KQkq - 0 1", True),
+        ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", False),
+        ("4k3/8/8/8/8/8/3p4/4K3 w - - 0 1", True),
+        ("4k3/8/8/8/8/5n2/8/4K3 w - - 0 1", True),
+    ])
+    def test_is_in_check(self, fen, expected):
+        self.assertEqual(Position.from_fen(fen).is_in_check(), expected)
+
+    def test_is_square_attacked(self):
+        position = Position.from_fen("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")
+        self.assertTrue(position.is_square_attacked(Square.a8.value, Color.WHITE))
+        self.assertFalse(position.is_square_attacked(Square.b8.value, Color.WHITE))
+        self.assertTrue(position.is_square_attacked(Square.d7.value, Color.BLACK))
+
+    def test_repetition_count(self):
+        position = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        shuffle = ((Square.g1, Square.f3), (Square.g8, Square.f6),
+                   (Square.f3, Square.g1), (Square.f6, Square.g8))
+        for _ in range(2):
+            for origin, target in shuffle:
+                position.make_move(origin.value, target.value)
+        self.assertEqual(position.repetition_count(), 3)
+        self.assertTrue(position.is_threefold_repetition())
+        position.unmake_move()
+        self.assertFalse(position.is_threefold_repetition())
+
+    def test_repetition_ignores_history_before_pawn_move(self):
+        position = Position.from_fen("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1")
+        position.hash_history = [position.hash] * 4
+        position.make_move(Square.e2.value, Square.e3.value)
+        self.assertEqual(position.repetition_count(), 1)
+
+    def test_hash_history_is_bounded_by_the_fifty_move_counter(self):
+        position = Position.from_fen("4k3/8/8/8/8/8/4P3/4K3 w - - 3 1",
+                                     hash_history=[1, 2, 3, 4, 5])
+        self.assertEqual(position.hash_history, [3, 4, 5])
+        start = position.hash
+        position.make_move(Square.e1.value, Square.d1.value)
+        self.assertEqual(position.hash_history, [3, 4, 5, start])
+        after_king_move = position.hash
+        position.make_move(Square.e8.value, Square.d8.value)
+        position.make_move(Square.e2.value, Square.e4.value)
+        self.assertEqual(position.hash_history, [])
+        position.make_move(Square.d8.value, Square.e8.value)
+        self.assertEqual(len(position.hash_history), position.fifty_move_rule)
+        position.unmake_move()
+        position.unmake_move()
+        self.assertEqual(position.hash_history, [3, 4, 5, start, after_king_move])
+        self.assertEqual(Position.from_fen("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1",
+                                           hash_history=[1, 2]).hash_history, [])
+
+    @parameterized.expand([
+        ("bare kings", "4k3/8/8/8/8/8/8/4K3 w - - 0 1", True),
+        ("lone bishop", "4k3/8/8/8/8/8/8/2B1K3 w - - 0 1", True),
+        ("lone knight", "4k3/8/8/8/8/8/8/1n2K3 w - - 0 1", True),
+        ("bishops on one color", "4k3/8/8/8/8/b7/8/2B1K3 w - - 0 1", True),
+        ("bishops on both colors", "4k3/8/8/8/8/8/b7/2B1K3 w - - 0 1", False),
+        ("knight and bishop", "4k3/8/8/8/8/8/8/1NB1K3 w - - 0 1", False),
+        ("two knights", "4k3/8/8/8/8/8/8/1N2K1n1 w - - 0 1", False),
+        ("pawn", "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1", False),
+        ("rook", "4k3/8/8/8/8/8/8/R3K3 w - - 0 1", False),
+    ])
+    def test_is_insufficient_material(self, _, fen, expected):
+        self.assertEqual(Position.from_fen(fen).is_insufficient_material(), expected)
+
+    def test_light_squares(self):
+        for square in Square:
+            file, rank = square.value % 8, square.value // 8
+            self.assertEqual(bool(LIGHT_SQUARES & (1 << square.value)), (file + rank) % 2 == 1,
+                             square.name)
+        self.assertFalse(LIGHT_SQUARES & squares_to_board(Square.a1, Square.h8))
+        self.assertEqual(LIGHT_SQUARES & squares_to_board(Square.h1, Square.a8),
+                         squares_to_board(Square.h1, Square.a8))
+
+    def test_make_move_from_empty_square(self):
+        position = Position.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+        with self.assertRaises(ValueError):
+            position.make_move(Square.a1.value, Square.a2.value)
+
+
+if __name__ == "__main__":
+    unittest.main()
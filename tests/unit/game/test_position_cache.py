@@ -0,0 +1,93 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from chess_insights.game.chess_board import ChessBoard
+from chess_insights.game.position import Position
+from chess_insights.game.position_cache import POSITION_CACHE, PositionCache
+from chess_insights.util.enum_game_status import GameStatus
+from chess_insights.util.enum_square import Square
+
+
+class TestPositionCache(unittest.TestCase):
+
+    def test_lookup_counts_hits_and_misses(self):
+        cache = PositionCache()
+        position = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        info = cache.lookup(position)
+        self.assertFalse(info.is_check)
+        self.assertEqual(info.status, GameStatus.ONGOING)
+        self.assertIs(cache.lookup(position), info)
+        self.assertEqual(cache.stats(), (1, 1, 1, 4096))
+
+    def test_moves_are_generated_on_first_request(self):
+        cache = PositionCache()
+        position = Position.from_fen()
+        info = cache.lookup(position)
+        # The status only needed to know that some move exists
+        self.assertIsNone(info.legal_moves)
+        self.assertEqual(len(cache.legal_moves(position)), 20)
+        self.assertEqual(cache.targets(position)[Square.g1.value],
+                         1 << Square.f3.value | 1 << Square.h3.value)
+        self.assertIs(cache.legal_moves(position), info.legal_moves)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = PositionCache(max_entries=2)
+        first = Position.from_fen("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")
+        second = Position.from_fen("4k3/8/8/8/8/8/8/R3K3 b - - 0 1")
+        third = Position.from_fen("4k3/8/8/8/8/8/8/4K2R w - - 0 1")
+        cache.lookup(first)
+        cache.lookup(second)
+        cache.lookup(first)
+        cache.lookup(third)
+        self.assertEqual(len(cache), 2)
+        cache.lookup(first)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        cache.lookup(second)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+        with self.assertRaises(ValueError):
+            PositionCache(max_entries=0)
+
+    def test_concurrent_lookups_share_a_small_cache(self):
+        cache = PositionCache(max_entries=2)
+        positions = [Position.from_fen(f"4k3/8/8/8/8/8/8/{file}3K3 w - - 0 1")
+                     for file in ("R", "Q", "B", "N")]
+
+        def look_up_all(_):
+            for _ in range(50):
+                for position in positions:
+                    cache.lookup(position)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(look_up_all, range(4)))
+        hits, misses, size, _ = cache.stats()
+        self.assertEqual(hits + misses, 4 * 50 * len(positions))
+        self.assertEqual(size, 2)
+
+    def test_status_leaves_out_history_dependent_draws(self):
+        cache = PositionCache()
+        mated = cache.lookup(Position.from_fen("6k1/6Q1/6K1/8/8/8/8/8 b - - 0 1"))
+        self.assertTrue(mated.is_check)
+        self.assertEqual(mated.status, GameStatus.CHECKMATE)
+        self.assertEqual(cache.lookup(Position.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1")).status,
+                         GameStatus.DRAW_INSUFFICIENT_MATERIAL)
+        # The fifty-move counter is not part of the key, so it cannot be part of the entry
+        fifty = Position.from_fen("4k3/8/8/8/8/8/8/R3K3 w - - 50 80")
+        self.assertEqual(cache.lookup(fifty).status, GameStatus.ONGOING)
+        board = ChessBoard("4k3/8/8/8/8/8/8/R3K3 w - - 50 80")
+        self.assertEqual(board.check_game_status(board.board_state), GameStatus.DRAW_50_MOVE)
+
+    def test_move_reuses_the_new_position(self):
+        POSITION_CACHE.clear()
+        board = ChessBoard()
+        board.move_piece(Square.e2.value, Square.e4.value)
+        # Validating the move analyzes the start position, and writing the PGN the new one, for
+        # its check flag and then, from the cache, its status
+        self.assertEqual((POSITION_CACHE.hits, POSITION_CACHE.misses), (1, 2))
+        self.assertEqual(board.check_game_status(board.board_state, board.position.hash_history),
+                         GameStatus.ONGOING)
+        self.assertEqual((POSITION_CACHE.hits, POSITION_CACHE.misses), (2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
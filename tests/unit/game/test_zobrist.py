@@ -0,0 +1,46 @@
+import unittest
+
+from parameterized import parameterized
+
+from chess_insights.game.position import Position
+from chess_insights.game.zobrist import compute_hash
+from chess_insights.util.enum_square import Square
+
+
+class TestZobrist(unittest.TestCase):
+
+    def test_incremental_hash_matches_full_hash(self):
+        position = Position.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        for origin, target in ((Square.e1, Square.g1), (Square.b4, Square.c3),
+                               (Square.d2, Square.c3), (Square.e8, Square.c8)):
+            position.make_move(origin.value, target.value)
+            self.assertEqual(position.hash,
+                             compute_hash(position.piece_boards, position.is_whites_turn,
+                                          position.castling_rights, position.en_passant_square))
+
+    def test_transpositions_hash_equal(self):
+        first = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        second = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        for origin, target in ((Square.g1, Square.f3), (Square.g8, Square.f6),
+                               (Square.b1, Square.c3)):
+            first.make_move(origin.value, target.value)
+        for origin, target in ((Square.b1, Square.c3), (Square.g8, Square.f6),
+                               (Square.g1, Square.f3)):
+            second.make_move(origin.value, target.value)
+        self.assertEqual(first.hash, second.hash)
+
+    @parameterized.expand([
+        ("side_to_move", "4k3/8/8/8/8/8/8/4K3 w - - 0 1", "4k3/8/8/8/8/8/8/4K3 b - - 0 1"),
+        ("castling", "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "r3k2r/8/8/8/8/8/8/R3K2R w KQ - 0 1"),
+        ("en_passant", "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "4k3/8/8/3pP3/8/8/8/4K3 w - - 0 1"),
+    ])
+    def test_state_changes_hash(self, _, fen, other_fen):
+        self.assertNotEqual(Position.from_fen(fen).hash, Position.from_fen(other_fen).hash)
+
+    def test_unusable_en_passant_square_is_ignored(self):
+        self.assertEqual(Position.from_fen("4k3/8/8/3p4/8/8/8/4K3 w - d6 0 1").hash,
+                         Position.from_fen("4k3/8/8/3p4/8/8/8/4K3 w - - 0 1").hash)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from chess_insights.util.enum_chess_piece_type import PIECE_ORDER, ChessPieceType, Color, \
+    ColorChessPiece, get_chess_piece_by_fen, get_pieces_by_color
+
+
+class TestColorChessPiece(unittest.TestCase):
+
+    def test_piece_order_matches_index(self):
+        self.assertEqual(set(PIECE_ORDER), set(ColorChessPiece))
+        self.assertEqual([piece.index for piece in PIECE_ORDER], list(range(15)))
+        self.assertEqual(ColorChessPiece.WHITE_PAWN.index, 0)
+        self.assertEqual(ColorChessPiece.BLACK_KING.index, 11)
+        self.assertEqual(ColorChessPiece.ALL_PIECES.index, 14)
+
+    def test_attributes(self):
+        piece = ColorChessPiece.BLACK_KNIGHT
+        self.assertEqual((piece.piece_type, piece.color, piece.fen),
+                         (ChessPieceType.KNIGHT, Color.BLACK, 'n'))
+
+    def test_get_chess_piece_by_fen(self):
+        self.assertEqual(get_chess_piece_by_fen('Q'), ColorChessPiece.WHITE_QUEEN)
+        self.assertEqual(get_chess_piece_by_fen('k'), ColorChessPiece.BLACK_KING)
+        with self.assertRaises(ValueError):
+            get_chess_piece_by_fen('x')
+
+    def test_get_color_piece_by_type(self):
+        self.assertEqual(Color.BLACK.get_color_piece_by_type(ChessPieceType.ROOK),
+                         ColorChessPiece.BLACK_ROOK)
+        with self.assertRaises(ValueError):
+            Color.ANY.get_color_piece_by_type(ChessPieceType.PAWN)
+
+    def test_get_pieces_by_color(self):
+        pieces = get_pieces_by_color(Color.WHITE)
+        self.assertEqual(len(pieces), 6)
+        self.assertTrue(all(piece.color == Color.WHITE for piece in pieces))
+        pieces.clear()
+        self.assertEqual(len(get_pieces_by_color(Color.WHITE)), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
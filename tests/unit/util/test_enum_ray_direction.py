@@ -17,6 +17,8 @@ class TestDirection(unittest.TestCase):
             (18, 19, Direction.E),
             (18, 17, Direction.W),
             (18, 18, Direction.C),
+            (0, 7, Direction.E),
+            (7, 16, Direction.C),
         ]
     )
     def test_ray_direction(self, origin_square, target_square, expected_result):
@@ -1,5 +1,6 @@
 from chess_insights.util.fen import board_from_fen, fen_from_board
 import unittest
+from dataclasses import replace
 
 
 class TestFenMethods(unittest.TestCase):
@@ -43,6 +44,11 @@ class TestFenMethods(unittest.TestCase):
         # Assert the FENs are identical
         self.assertEqual(custom_fen, generated_fen)
 
+    def test_single_side_castling_rights(self):
+        for castling in ("K", "Q", "k", "q", "Kq", "Qk"):
+            custom_fen = f"r3k2r/8/8/8/8/8/8/R3K2R w {castling} - 0 1"
+            self.assertEqual(fen_from_board(board_from_fen(custom_fen)), custom_fen)
+
     def test_invalid_fen(self):
         # Invalid FEN string
         invalid_fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQ - 0"
@@ -68,6 +74,12 @@ class TestFenMethods(unittest.TestCase):
         # Assert the FENs are identical
         self.assertEqual(custom_fen, generated_fen)
 
+    def test_fen_from_board_without_mailbox(self):
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        board_state = board_from_fen(fen)
+        self.assertEqual(board_state.mailbox[4].fen, "K")
+        self.assertEqual(fen_from_board(replace(board_state, mailbox=None)), fen)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,13 @@
 import unittest
+
+from parameterized import parameterized
+
+from chess_insights.engine.moves import encode_move
 from chess_insights.game.chess_board import ChessBoard
+from chess_insights.game.position import Position
+from chess_insights.util.enum_chess_piece_type import ColorChessPiece
 from chess_insights.util.enum_square import Square
+from chess_insights.util.pgn import parse_san, read_pgn_games
 
 
 class TestPGN(unittest.TestCase):
@@ -9,6 +16,46 @@ class TestPGN(unittest.TestCase):
         board.move_piece(Square.d5.value, Square.f7.value)
         self.assertEqual(board.pgn, "16. Qf7# 1-0 ")
 
+    def test_read_games_keeps_main_line(self):
+        text = """[Event "Test \\"cup\\""]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 {develops} Nc6 (2... d6 3. d4) 3.Bb5 a6 $1 1-0
+
+1. d4 d5 *
+1. c4"""
+        games = list(read_pgn_games(text))
+        self.assertEqual(len(games), 3)
+        self.assertEqual(games[0].tags, {"Event": 'Test "cup"', "Result": "1-0"})
+        self.assertEqual(games[0].moves, ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6"])
+        self.assertEqual((games[0].result, games[1].result, games[2].result), ("1-0", "*", "*"))
+        self.assertEqual(games[2].moves, ["c4"])
+
+    @parameterized.expand([
+        ("pawn_push", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", "e4",
+         (Square.e2, Square.e4, None)),
+        ("file_disambiguation", "4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "Rhf1+",
+         (Square.h1, Square.f1, None)),
+        ("castling_with_zeros", "4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "0-0",
+         (Square.e1, Square.g1, None)),
+        ("long_castling", "4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1", "O-O-O",
+         (Square.e1, Square.c1, None)),
+        ("capture_promotion", "3r1k2/4P3/8/8/8/8/8/4K3 w - - 0 1", "exd8=N",
+         (Square.e7, Square.d8, ColorChessPiece.WHITE_KNIGHT)),
+        ("black_pawn_capture", "4k3/8/8/8/8/3p4/2P1P3/4K3 b - - 0 1", "dxc2",
+         (Square.d3, Square.c2, None)),
+    ])
+    def test_parse_san(self, _, fen, san, expected):
+        origin, target, promotion = expected
+        self.assertEqual(parse_san(Position.from_fen(fen), san),
+                         encode_move((origin.value, target.value, promotion)))
+
+    @parameterized.expand([("ambiguous", "Rd1"), ("illegal", "Kg4"), ("malformed", "Zz9"),
+                           ("no_castling", "O-O")])
+    def test_parse_san_rejects(self, _, san):
+        with self.assertRaises(ValueError):
+            parse_san(Position.from_fen("4k3/8/8/8/8/8/4K3/R6R w - - 0 1"), san)
+
 
 if __name__ == '__main__':
     unittest.main()